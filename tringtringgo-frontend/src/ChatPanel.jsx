@@ -3,6 +3,8 @@ import React, { useEffect, useState } from "react";
 
 const CHAT_API = "http://127.0.0.1:8000/api/chat";
 const ACC_API = "http://127.0.0.1:8000/api/accounts";
+const CHAT_WS = "ws://127.0.0.1:8000/ws/chat";
+const MESSAGE_PAGE_SIZE = 50; // server default for messages/
 
 function getCurrentUser() {
   const stored = localStorage.getItem("ttg_user");
@@ -27,6 +29,7 @@ function ChatPanel({ onClose }) {
 
   const [loadingThreads, setLoadingThreads] = useState(true);
   const [loadingMessages, setLoadingMessages] = useState(false);
+  const [hasEarlier, setHasEarlier] = useState(false);
   const [error, setError] = useState("");
 
   const authHeaders = token
@@ -61,20 +64,37 @@ function ChatPanel({ onClose }) {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [token]);
 
-  // load messages for selected thread + simple polling
+  // load messages for selected thread, then listen for pushes
   useEffect(() => {
     if (!selectedThread || !token) return;
 
+    // latest page first; afterwards only ask for messages after the last one
+    let lastId = null;
+
+    function appendNew(data) {
+      setMessages((prev) => {
+        const seen = new Set(prev.map((m) => m.id));
+        return [...prev, ...data.filter((m) => !seen.has(m.id))];
+      });
+    }
+
     async function loadMessages() {
       try {
-        setLoadingMessages(true);
+        if (lastId === null) setLoadingMessages(true);
+        const query = lastId === null ? "" : `?after_id=${lastId}`;
         const res = await fetch(
-          `${CHAT_API}/threads/${selectedThread.id}/messages/`,
+          `${CHAT_API}/threads/${selectedThread.id}/messages/${query}`,
           { headers: authHeaders }
         );
         if (!res.ok) throw new Error("Failed to load messages.");
         const data = await res.json();
-        setMessages(data);
+        if (lastId === null) {
+          setMessages(data);
+          setHasEarlier(data.length >= MESSAGE_PAGE_SIZE);
+        } else {
+          appendNew(data);
+        }
+        if (data.length) lastId = data[data.length - 1].id;
       } catch (e) {
         console.error(e);
         setError(e.message);
@@ -83,11 +103,86 @@ function ChatPanel({ onClose }) {
       }
     }
 
+    setMessages([]);
     loadMessages();
-    const interval = setInterval(loadMessages, 4000);
-    return () => clearInterval(interval);
+
+    // new messages / status changes arrive over the socket; if it can't
+    // be opened (or drops) fall back to the old 4s polling
+    let interval = null;
+    const socket = new WebSocket(
+      `${CHAT_WS}/threads/${selectedThread.id}/?token=${encodeURIComponent(token)}`
+    );
+    socket.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      if (data.type === "message") {
+        appendNew([data.message]);
+        lastId = Math.max(lastId ?? 0, data.message.id);
+      } else if (data.type === "status") {
+        setThreads((prev) =>
+          prev.map((t) =>
+            t.id === data.thread_id ? { ...t, status: data.status } : t
+          )
+        );
+        setSelectedThread((prev) =>
+          prev && prev.id === data.thread_id && prev.status !== data.status
+            ? { ...prev, status: data.status }
+            : prev
+        );
+      }
+    };
+    socket.onclose = () => {
+      if (!interval) interval = setInterval(loadMessages, 4000);
+    };
+
+    return () => {
+      socket.onclose = null;
+      socket.close();
+      if (interval) clearInterval(interval);
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [selectedThread?.id, token]);
+
+  // whatever is on screen counts as read
+  const newestId = messages.length ? messages[messages.length - 1].id : null;
+  useEffect(() => {
+    if (!selectedThread || !token || newestId === null) return;
+    fetch(`${CHAT_API}/threads/${selectedThread.id}/read/`, {
+      method: "POST",
+      headers: authHeaders,
+      body: JSON.stringify({ up_to_id: newestId }),
+    })
+      .then((res) => (res.ok ? res.json() : null))
+      .then((cursor) => {
+        if (!cursor) return;
+        setThreads((prev) =>
+          prev.map((t) =>
+            t.id === cursor.thread_id
+              ? { ...t, unread_count: cursor.unread_count }
+              : t
+          )
+        );
+      })
+      .catch((e) => console.error(e));
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [selectedThread, token]);
+  }, [selectedThread?.id, newestId, token]);
+
+  async function loadEarlier() {
+    if (!selectedThread || !messages.length) return;
+    try {
+      const res = await fetch(
+        `${CHAT_API}/threads/${selectedThread.id}/messages/` +
+          `?before_id=${messages[0].id}&limit=${MESSAGE_PAGE_SIZE}`,
+        { headers: authHeaders }
+      );
+      if (!res.ok) throw new Error("Failed to load messages.");
+      const data = await res.json();
+      setMessages((prev) => [...data, ...prev]);
+      setHasEarlier(data.length >= MESSAGE_PAGE_SIZE);
+    } catch (e) {
+      console.error(e);
+      setError(e.message);
+    }
+  }
 
   const canSend =
     selectedThread && selectedThread.status === "active" && !!token;
@@ -110,7 +205,10 @@ function ChatPanel({ onClose }) {
         throw new Error(data.detail || "Failed to send message.");
       }
       const msg = await resp.json();
-      setMessages((prev) => [...prev, msg]);
+      // the socket may have delivered it already
+      setMessages((prev) =>
+        prev.some((m) => m.id === msg.id) ? prev : [...prev, msg]
+      );
       setText("");
       setError("");
     } catch (err) {
@@ -372,6 +470,14 @@ function ChatPanel({ onClose }) {
               >
                 <div style={{ fontWeight: 600 }}>
                   {renderThreadTitle(t)}
+                  {t.unread_count > 0 && (
+                    <span
+                      className="badge rounded-pill bg-primary"
+                      style={{ marginLeft: "0.35rem", fontSize: "0.65rem" }}
+                    >
+                      {t.unread_count}
+                    </span>
+                  )}
                 </div>
                 {t.last_message && (
                   <div
@@ -445,6 +551,18 @@ function ChatPanel({ onClose }) {
                 {loadingMessages && (
                   <div className="small mb-1">Loading messages…</div>
                 )}
+                {hasEarlier && !loadingMessages && (
+                  <div className="text-center mb-1">
+                    <button
+                      type="button"
+                      className="btn btn-link btn-sm p-0"
+                      style={{ fontSize: "0.75rem" }}
+                      onClick={loadEarlier}
+                    >
+                      Load earlier messages
+                    </button>
+                  </div>
+                )}
                 {messages.length === 0 && !loadingMessages && (
                   <div className="small text-muted">
                     No messages yet. Say hi!
@@ -95,6 +95,8 @@ function CommunityFeed({ isDark }) {
   const token = parsedUser?.token || parsedUser?.username || "";
 
   const [posts, setPosts] = useState([]);
+  const [nextUrl, setNextUrl] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [areas, setAreas] = useState([]);
   const [category, setCategory] = useState("ALL");
   const [areaId, setAreaId] = useState("");
@@ -131,10 +133,12 @@ function CommunityFeed({ isDark }) {
         if (areaId) params.push(`area_id=${areaId}`);
         if (params.length) url += "?" + params.join("&");
 
+        // posts/ is cursor-paginated; further pages come from loadMore
         const resp = await fetch(url);
-        const data = await resp.json().catch(() => []);
+        const data = await resp.json().catch(() => ({}));
         if (!resp.ok) throw new Error(data.detail || "Failed to load posts");
-        setPosts(data);
+        setPosts(data.results);
+        setNextUrl(data.next);
       } catch (e) {
         console.error(e);
         setError(e.message);
@@ -145,6 +149,23 @@ function CommunityFeed({ isDark }) {
     loadPosts();
   }, [category, areaId]);
 
+  const loadMore = async () => {
+    if (!nextUrl) return;
+    try {
+      setLoadingMore(true);
+      const resp = await fetch(nextUrl);
+      const data = await resp.json().catch(() => ({}));
+      if (!resp.ok) throw new Error(data.detail || "Failed to load posts");
+      setPosts((prev) => [...prev, ...data.results]);
+      setNextUrl(data.next);
+    } catch (e) {
+      console.error(e);
+      setError(e.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Like / dislike
   const handleReact = async (postId, reaction) => {
     if (
@@ -388,6 +409,19 @@ function CommunityFeed({ isDark }) {
         ))
       )}
 
+      {!loading && nextUrl && (
+        <div className="text-center mt-2">
+          <button
+            type="button"
+            className="btn btn-outline-secondary btn-sm rounded-pill"
+            onClick={loadMore}
+            disabled={loadingMore}
+          >
+            {loadingMore ? "Loading…" : "Load more"}
+          </button>
+        </div>
+      )}
+
       {selectedPost && (
         <PostDetailModal
           post={selectedPost}
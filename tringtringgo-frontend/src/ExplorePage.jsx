@@ -1,5 +1,5 @@
 // src/pages/ExplorePage.jsx
-import React, { useEffect, useState, useMemo } from "react";
+import React, { useEffect, useRef, useState } from "react";
 
 const API_BASE = "http://127.0.0.1:8000";
 
@@ -14,11 +14,48 @@ function getAuthUser() {
   return parsed;
 }
 
+// "All places" page size; later pages are fetched on "Load more"
+const PAGE_SIZE = 24;
+
+function placesUrl(query) {
+  return `${API_BASE}/api/travel/places/?${query}`;
+}
+
+function normalizePlace(p) {
+  return {
+    ...p,
+    image:
+      typeof p.image === "string" && p.image.length > 0
+        ? p.image.startsWith("http")
+          ? p.image
+          : `${API_BASE}${p.image}`
+        : null,
+  };
+}
+
+async function fetchPlacesPage(url) {
+  const resp = await fetch(url);
+  if (!resp.ok) {
+    const body = await resp.json().catch(() => ({}));
+    throw new Error(body.detail || "Failed to load places");
+  }
+  const page = await resp.json();
+  return { results: page.results.map(normalizePlace), next: page.next };
+}
+
 function ExplorePage() {
   const [places, setPlaces] = useState([]);
+  const [nextUrl, setNextUrl] = useState(null);
+  const [topRated, setTopRated] = useState([]);
+  const [popular, setPopular] = useState([]);
+  const [areas, setAreas] = useState([]);
   const [savedIds, setSavedIds] = useState([]);
   const [loadingPlaces, setLoadingPlaces] = useState(true);
+  const [loadedOnce, setLoadedOnce] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [placesError, setPlacesError] = useState(null);
+  // bumped whenever the filters reload the list
+  const listVersion = useRef(0);
 
   const [userRole, setUserRole] = useState("TRAVELER");
   const [userMode, setUserMode] = useState("TRAVELER");
@@ -49,38 +86,90 @@ function ExplorePage() {
   /* ---------- load data ---------- */
 
   useEffect(() => {
+    async function loadAreas() {
+      try {
+        const resp = await fetch(`${API_BASE}/api/travel/areas/`);
+        if (!resp.ok) return;
+        setAreas(await resp.json());
+      } catch (e) {
+        console.error(e);
+      }
+    }
+    loadAreas();
+  }, []);
+
+  // filters are applied by places/ itself; only the first page of each
+  // section is fetched, "Load more" follows the cursor of "All places"
+  useEffect(() => {
+    let ignore = false;
+    listVersion.current += 1;
+
     async function loadPlaces() {
       try {
         setLoadingPlaces(true);
         setPlacesError(null);
 
-        const resp = await fetch(`${API_BASE}/api/travel/places/`);
-        if (!resp.ok) {
-          const body = await resp.json().catch(() => ({}));
-          throw new Error(body.detail || "Failed to load places");
-        }
-        const data = await resp.json();
+        const params = new URLSearchParams();
+        if (areaFilter) params.set("area_id", areaFilter);
+        if (typeFilter && typeFilter !== "ALL") params.set("category", typeFilter);
+        if (search) params.set("q", search);
+        const query = params.toString();
 
-        const normalized = data.map((p) => ({
-          ...p,
-          image:
-            typeof p.image === "string" && p.image.length > 0
-              ? p.image.startsWith("http")
-                ? p.image
-                : `${API_BASE}${p.image}`
-              : null,
-        }));
+        const [all, best, hot] = await Promise.all([
+          fetchPlacesPage(`${placesUrl(query)}&limit=${PAGE_SIZE}`),
+          search
+            ? null
+            : fetchPlacesPage(`${placesUrl(query)}&min_rating=4.5&limit=100`),
+          search
+            ? null
+            : fetchPlacesPage(`${placesUrl(query)}&is_popular=true&limit=10`),
+        ]);
+        if (ignore) return;
 
-        setPlaces(normalized);
+        setPlaces(all.results);
+        setNextUrl(all.next);
+        setTopRated(
+          best
+            ? best.results
+                .sort((a, b) => (b.average_rating || 0) - (a.average_rating || 0))
+                .slice(0, 10)
+            : []
+        );
+        setPopular(hot ? hot.results : []);
       } catch (e) {
         console.error(e);
-        setPlacesError(e.message);
+        if (!ignore) setPlacesError(e.message);
       } finally {
-        setLoadingPlaces(false);
+        if (!ignore) {
+          setLoadingPlaces(false);
+          setLoadedOnce(true);
+        }
       }
     }
     loadPlaces();
-  }, []);
+    return () => {
+      ignore = true;
+    };
+  }, [areaFilter, typeFilter, search]);
+
+  const loadMore = async () => {
+    if (!nextUrl || loadingMore) return;
+    const url = nextUrl;
+    const version = listVersion.current;
+    try {
+      setLoadingMore(true);
+      const page = await fetchPlacesPage(url);
+      // a filter change since the click replaced the list; drop this page
+      if (listVersion.current !== version) return;
+      setPlaces((prev) => [...prev, ...page.results]);
+      setNextUrl(page.next);
+    } catch (e) {
+      console.error(e);
+      setPlacesError(e.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   useEffect(() => {
     async function loadSaved() {
@@ -120,46 +209,8 @@ function ExplorePage() {
     localStorage.setItem("ttg_theme", theme);
   }, [theme]);
 
-  /* ---------- filtering: area -> type -> search ---------- */
-  const filteredBase = useMemo(() => {
-    let result = places;
-
-    if (areaFilter) {
-      result = result.filter((p) => p.area_name === areaFilter);
-    }
-
-    if (typeFilter && typeFilter !== "ALL") {
-      result = result.filter((p) => p.category === typeFilter);
-    }
-
-    if (!search.trim()) return result;
-
-    const q = search.trim().toLowerCase();
-    return result.filter((p) => {
-      const name = (p.name || "").toLowerCase();
-      const area = (p.area_name || "").toLowerCase();
-      return name.includes(q) || area.includes(q);
-    });
-  }, [places, areaFilter, typeFilter, search]);
-
   const hasSearch = search.trim().length > 0;
 
-  const topRated = useMemo(
-    () =>
-      [...filteredBase]
-        .filter((p) => (p.average_rating || 0) >= 4.5)
-        .sort((a, b) => (b.average_rating || 0) - (a.average_rating || 0))
-        .slice(0, 10),
-    [filteredBase]
-  );
-
-  const popular = useMemo(
-    () => filteredBase.filter((p) => p.is_popular).slice(0, 10),
-    [filteredBase]
-  );
-
-  const allPlaces = filteredBase;
-
   /* ---------- save / unsave ---------- */
   const toggleSave = async (placeId) => {
     if (
@@ -447,10 +498,23 @@ function ExplorePage() {
     );
   };
 
+  const loadMoreButton = nextUrl && (
+    <div className="text-center mt-3">
+      <button
+        type="button"
+        className="btn btn-outline-primary rounded-pill px-4"
+        onClick={loadMore}
+        disabled={loadingMore}
+      >
+        {loadingMore ? "Loading..." : "Load more"}
+      </button>
+    </div>
+  );
+
   const outerBgClass = isDark ? "bg-black bg-gradient" : "bg-body-tertiary";
   const cardBgClass = isDark ? "bg-dark text-light" : "bg-white text-dark";
 
-  if (loadingPlaces) {
+  if (loadingPlaces && !loadedOnce) {
     return (
       <div className={outerBgClass + " min-vh-100 d-flex align-items-center"}>
         <div className="container">
@@ -601,11 +665,9 @@ function ExplorePage() {
                   }}
                 >
                   <option value="">All areas</option>
-                  {Array.from(
-                    new Set(places.map((p) => p.area_name).filter(Boolean))
-                  ).map((name) => (
-                    <option key={name} value={name}>
-                      {name}
+                  {areas.map((a) => (
+                    <option key={a.id} value={a.id}>
+                      {a.name}
                     </option>
                   ))}
                 </select>
@@ -653,7 +715,7 @@ function ExplorePage() {
               {hasSearch ? (
                 <section style={{ marginTop: "1.5rem" }}>
                   <h3 className="h5 mb-3 fw-semibold">Search results</h3>
-                  {allPlaces.length === 0 ? (
+                  {places.length === 0 ? (
                     <p style={{ color: "#6b7280", fontSize: "0.95rem" }}>
                       No places match your search.
                     </p>
@@ -666,9 +728,10 @@ function ExplorePage() {
                         gap: "1rem",
                       }}
                     >
-                      {allPlaces.map(renderCard)}
+                      {places.map(renderCard)}
                     </div>
                   )}
+                  {loadMoreButton}
                 </section>
               ) : (
                 <>
@@ -714,7 +777,7 @@ function ExplorePage() {
 
                   <section style={{ marginTop: "1.5rem" }}>
                     <h3 className="h5 mb-3 fw-semibold">All places</h3>
-                    {allPlaces.length === 0 ? (
+                    {places.length === 0 ? (
                       <p style={{ color: "#6b7280", fontSize: "0.95rem" }}>
                         No places available.
                       </p>
@@ -727,9 +790,10 @@ function ExplorePage() {
                           gap: "1rem",
                         }}
                       >
-                        {allPlaces.map(renderCard)}
+                        {places.map(renderCard)}
                       </div>
                     )}
+                    {loadMoreButton}
                   </section>
                 </>
               )}
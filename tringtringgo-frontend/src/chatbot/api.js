@@ -1,10 +1,26 @@
 // src/chatbot/api.js
 import axios from "axios";
 
+// history is kept per user when logged in, else per server session, so
+// the session cookie has to travel with every request
 const api = axios.create({
   baseURL: "http://127.0.0.1:8000",
+  withCredentials: true,
 });
 
+function authHeaders() {
+  const stored = localStorage.getItem("ttg_user");
+  const parsed = stored ? JSON.parse(stored) : null;
+  const token = parsed?.token || parsed?.username || "";
+  return token ? { "X-User-Token": token } : {};
+}
+
 // logic-based chatbot endpoint
 export const chatApi = (message) =>
-  api.post("/api/chatbot/chat/", { message }).then((res) => res.data);
+  api
+    .post(
+      "/api/chatbot/chat/",
+      { message },
+      { headers: authHeaders() }
+    )
+    .then((res) => res.data);
@@ -1,5 +1,5 @@
 import { Outlet } from "react-router-dom"; // unified topbar for all pages
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
 import { Link, useLocation } from "react-router-dom";
 import ChatPanel from "./ChatPanel";
 import ChatWidget from "./chatbot/ChatWidget";
@@ -15,6 +15,19 @@ function Layout({ children }) {
 
   const isActive = (path) => location.pathname.startsWith(path);
 
+  // unread chat badge: one cheap request, refreshed when the panel closes
+  const [unreadCount, setUnreadCount] = useState(0);
+  const token = parsed?.token || parsed?.username || "";
+  useEffect(() => {
+    if (!token || isChatOpen) return;
+    fetch("http://127.0.0.1:8000/api/chat/unread/", {
+      headers: { "X-User-Token": token },
+    })
+      .then((res) => (res.ok ? res.json() : null))
+      .then((data) => data && setUnreadCount(data.unread_count))
+      .catch(() => {});
+  }, [token, isChatOpen]);
+
   function handleLogout() {
     try {
       fetch("http://127.0.0.1:8000/api/accounts/logout/", {
@@ -116,6 +129,14 @@ function Layout({ children }) {
                 onClick={() => setIsChatOpen((p) => !p)}
               >
                 Chat
+                {unreadCount > 0 && (
+                  <span
+                    className="badge rounded-pill bg-danger"
+                    style={{ marginLeft: "0.35rem" }}
+                  >
+                    {unreadCount}
+                  </span>
+                )}
               </button>
               <button
                 className="btn btn-danger btn-sm"
@@ -0,0 +1,231 @@
+# accounts/authentication.py
+"""
+X-User-Token authentication.
+
+The React app sends the username as ``X-User-Token`` on every request.
+Resolving it used to cost 2-4 queries per view (User, UserAccount and
+the role profile), so the whole identity bundle is resolved here once,
+in a single query, and cached:
+
+- a small per-process LRU with a TTL of a few seconds, because an
+  invalidation only clears it in the worker that made the change, in
+  front of
+- the shared cache (settings.CACHES: Redis/Memcached in production),
+  which ``invalidate_identity`` clears for every worker.
+
+Call ``invalidate_identity(token)`` whenever something the bundle holds
+changes (username change, account deletion, profile provisioning).
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.response import Response
+
+User = get_user_model()
+
+TOKEN_HEADER = "X-User-Token"
+
+LOCAL_CACHE_SIZE = getattr(settings, "AUTH_IDENTITY_LOCAL_CACHE_SIZE", 1024)
+LOCAL_CACHE_TTL = getattr(settings, "AUTH_IDENTITY_LOCAL_CACHE_TTL", 2)
+SHARED_CACHE_TTL = getattr(settings, "AUTH_IDENTITY_CACHE_TTL", 300)
+
+
+class Identity:
+    """
+    Everything a view needs to know about the caller.
+
+    ``user`` and ``account`` are real model instances (``account`` is None
+    for users without a UserAccount row); profiles are only referenced by
+    id so that a cached bundle never serves stale profile fields.
+    """
+
+    def __init__(
+        self,
+        user,
+        account=None,
+        traveler_profile_id=None,
+        merchant_profile_id=None,
+        admin_profile_id=None,
+        admin_area_id=None,
+    ):
+        self.user = user
+        self.account = account
+        self.role = account.role if account else None
+        self.traveler_profile_id = traveler_profile_id
+        self.merchant_profile_id = merchant_profile_id
+        self.admin_profile_id = admin_profile_id
+        self.admin_area_id = admin_area_id
+
+    @property
+    def token(self):
+        return self.user.username
+
+    def copy(self):
+        """
+        A private copy for one request. Views fill the instances' relation
+        caches (``account.merchant_profile`` ...) and may modify them, so
+        the cached bundle itself is never handed out.
+        """
+        return copy.deepcopy(self)
+
+    def __repr__(self):
+        return f"Identity({self.user.username!r}, role={self.role!r})"
+
+
+# ---------- per-process LRU ----------
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _local_get(token):
+    with _local_lock:
+        entry = _local.get(token)
+        if entry is None:
+            return None
+        expires_at, identity = entry
+        if expires_at < time.monotonic():
+            del _local[token]
+            return None
+        _local.move_to_end(token)
+        return identity
+
+
+def _local_set(token, identity):
+    with _local_lock:
+        _local[token] = (time.monotonic() + LOCAL_CACHE_TTL, identity)
+        _local.move_to_end(token)
+        while len(_local) > LOCAL_CACHE_SIZE:
+            _local.popitem(last=False)
+
+
+def _cache_key(token):
+    return f"accounts:identity:{token}"
+
+
+# ---------- resolution ----------
+
+
+def _load_identity(token):
+    """One query: User LEFT JOIN UserAccount LEFT JOIN each profile."""
+    try:
+        user = User.objects.select_related(
+            "account__traveler_profile",
+            "account__merchant_profile",
+            "account__admin_profile",
+        ).get(username=token)
+    except User.DoesNotExist:
+        return None
+
+    account = getattr(user, "account", None)
+    if account is None:
+        return Identity(user)
+
+    traveler = getattr(account, "traveler_profile", None)
+    merchant = getattr(account, "merchant_profile", None)
+    admin = getattr(account, "admin_profile", None)
+
+    # keep only user <-> account cached on the instances; profiles are
+    # re-read on demand so their fields are never served from cache
+    for name in ("traveler_profile", "merchant_profile", "admin_profile"):
+        account._state.fields_cache.pop(name, None)
+
+    return Identity(
+        user,
+        account,
+        traveler_profile_id=traveler.id if traveler else None,
+        merchant_profile_id=merchant.id if merchant else None,
+        admin_profile_id=admin.id if admin else None,
+        admin_area_id=admin.area_id if admin else None,
+    )
+
+
+def resolve_identity(token):
+    """Return a copy of the cached Identity for ``token``, or None if unknown."""
+    if not token:
+        return None
+
+    identity = _local_get(token)
+    if identity is not None:
+        return identity.copy()
+
+    identity = cache.get(_cache_key(token))
+    if identity is None:
+        identity = _load_identity(token)
+        if identity is None:
+            return None
+        cache.set(_cache_key(token), identity, SHARED_CACHE_TTL)
+
+    _local_set(token, identity)
+    return identity.copy()
+
+
+def invalidate_identity(token):
+    """Drop ``token`` from both cache tiers."""
+    if not token:
+        return
+    with _local_lock:
+        _local.pop(token, None)
+    cache.delete(_cache_key(token))
+
+
+def clear_identity_cache():
+    """Forget every cached identity in this process (used by tests)."""
+    with _local_lock:
+        _local.clear()
+
+
+# ---------- DRF integration ----------
+
+
+class UserTokenAuthentication(BaseAuthentication):
+    """
+    Authenticate ``X-User-Token`` requests.
+
+    Sets ``request.user`` to the Django user and ``request.auth`` to the
+    Identity bundle. Unknown tokens are treated as anonymous (not an
+    error) so public endpoints keep working with a stale token; views
+    that require login report it through ``identity_from_request``.
+    """
+
+    def authenticate(self, request):
+        token = request.headers.get(TOKEN_HEADER)
+        identity = resolve_identity(token)
+        if identity is None:
+            return None
+        return (identity.user, identity)
+
+    def authenticate_header(self, request):
+        return TOKEN_HEADER
+
+
+def get_identity(request):
+    """Identity for this request, or None if not token-authenticated."""
+    auth = getattr(request, "auth", None)
+    return auth if isinstance(auth, Identity) else None
+
+
+def identity_from_request(request):
+    """
+    Return ``(identity, error_response)`` for views that require login.
+    """
+    identity = get_identity(request)
+    if identity is not None:
+        return identity, None
+
+    if not request.headers.get(TOKEN_HEADER):
+        return None, Response(
+            {"detail": "Not logged in."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    return None, Response(
+        {"detail": "Invalid user token."},
+        status=status.HTTP_401_UNAUTHORIZED,
+    )
@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.authentication import invalidate_identity
+from accounts.models import UserAccount, TravelerProfile
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill missing UserAccount / TravelerProfile rows so the "
+        "request path never has to create them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be created.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            missing_accounts = list(
+                User.objects.filter(account__isnull=True).values_list("id", "username")
+            )
+            if not options["dry_run"]:
+                UserAccount.objects.bulk_create(
+                    [UserAccount(user_id=user_id, role="TRAVELER") for user_id, _ in missing_accounts],
+                    batch_size=500,
+                )
+
+            # includes the accounts created just above
+            missing_profiles = list(
+                UserAccount.objects.filter(traveler_profile__isnull=True).values_list(
+                    "id", "user__username"
+                )
+            )
+            if not options["dry_run"]:
+                TravelerProfile.objects.bulk_create(
+                    [
+                        TravelerProfile(user_account_id=account_id, years_in_area=0)
+                        for account_id, _ in missing_profiles
+                    ],
+                    batch_size=500,
+                )
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"Would create {len(missing_accounts)} accounts and "
+                f"{len(missing_profiles) + len(missing_accounts)} traveler profiles."
+            )
+            return
+
+        # bulk_create skips post_save, so drop the cached identities by hand
+        for username in {u for _, u in missing_accounts} | {u for _, u in missing_profiles}:
+            invalidate_identity(username)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(missing_accounts)} accounts and "
+                f"{len(missing_profiles)} traveler profiles."
+            )
+        )
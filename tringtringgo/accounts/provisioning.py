@@ -0,0 +1,35 @@
+# accounts/provisioning.py
+"""
+One-time creation of the rows every logged-in user needs.
+
+A user must have a UserAccount and a TravelerProfile (merchants and
+admins use traveler features too: Explore, save, rate). These rows are
+created here at signup / login time, or in bulk by
+``manage.py provision_accounts``, so request handlers can stay read-only.
+"""
+from django.db import transaction
+
+from .models import UserAccount, TravelerProfile
+
+
+def ensure_traveler_profile(account):
+    """Return the TravelerProfile for ``account``, creating it if missing."""
+    profile, _ = TravelerProfile.objects.get_or_create(
+        user_account=account,
+        defaults={"years_in_area": 0},
+    )
+    return profile
+
+
+@transaction.atomic
+def provision_account(user, role="TRAVELER"):
+    """
+    Make sure ``user`` has a UserAccount and a TravelerProfile.
+    Idempotent; ``role`` only applies when the account is created.
+    """
+    account, _ = UserAccount.objects.get_or_create(
+        user=user,
+        defaults={"role": role},
+    )
+    ensure_traveler_profile(account)
+    return account
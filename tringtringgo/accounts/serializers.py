@@ -22,6 +22,7 @@ from .models import (
     MerchantProfile,
     AdminProfile,
 )
+from .provisioning import ensure_traveler_profile
 from travel.models import Area, Place
 
 User = get_user_model()
@@ -155,6 +156,10 @@ class SignupSerializer(serializers.Serializer):
                     {"area_id": "This area already has an admin."}
                 )
 
+        # merchants/admins use traveler features too (Explore, save, rate)
+        if role != "TRAVELER":
+            ensure_traveler_profile(user_account)
+
         return user_account
 
 
@@ -0,0 +1,72 @@
+# accounts/signals.py
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_identity
+from .models import (
+    AdminProfile,
+    MerchantProfile,
+    MerchantVerificationRequest,
+    TravelerProfile,
+    UserAccount,
+)
+
+User = get_user_model()
+
+
+# ---------- keep cached X-User-Token identities fresh ----------
+
+
+def _invalidate_account(account):
+    try:
+        username = account.user.username
+    except ObjectDoesNotExist:
+        # cascade from a User delete; that delete invalidates on its own
+        return
+    invalidate_identity(username)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_identity(sender, instance, **kwargs):
+    invalidate_identity(instance.username)
+
+
+@receiver(post_save, sender=UserAccount)
+@receiver(post_delete, sender=UserAccount)
+def invalidate_account_identity(sender, instance, **kwargs):
+    _invalidate_account(instance)
+
+
+@receiver(post_save, sender=TravelerProfile)
+def invalidate_new_profile_identity(sender, instance, created, **kwargs):
+    # the bundle only holds profile ids, so plain edits don't matter
+    if created:
+        invalidate_profile_identity(sender, instance)
+
+
+# merchant verification state is read through the account on every
+# dashboard request; drop the bundle whenever it can have changed
+@receiver(post_save, sender=MerchantProfile)
+@receiver(post_delete, sender=TravelerProfile)
+@receiver(post_delete, sender=MerchantProfile)
+@receiver(post_save, sender=AdminProfile)
+@receiver(post_delete, sender=AdminProfile)
+def invalidate_profile_identity(sender, instance, **kwargs):
+    try:
+        account = instance.user_account
+    except ObjectDoesNotExist:
+        return
+    _invalidate_account(account)
+
+
+@receiver(post_save, sender=MerchantVerificationRequest)
+@receiver(post_delete, sender=MerchantVerificationRequest)
+def invalidate_verification_identity(sender, instance, **kwargs):
+    try:
+        merchant = instance.merchant
+    except ObjectDoesNotExist:
+        return
+    invalidate_profile_identity(MerchantProfile, merchant)
@@ -35,6 +35,8 @@ from django.contrib.auth.models import User
 from rest_framework import generics, permissions
 from django.contrib.auth import get_user_model
 from .serializers import UserSearchSerializer
+from .authentication import identity_from_request, invalidate_identity
+from .provisioning import provision_account, ensure_traveler_profile
 
 User = get_user_model()
 
@@ -91,12 +93,7 @@ class GoogleLoginAPIView(APIView):
             defaults={"email": email or "", "first_name": name},
         )
 
-        user_account, _ = UserAccount.objects.get_or_create(
-            user=user,
-            defaults={"role": "TRAVELER"},
-        )
-
-        TravelerProfile.objects.get_or_create(user_account=user_account)
+        user_account = provision_account(user)
 
         # log google login
         LoginLog.objects.create(user=user, method="GOOGLE")
@@ -122,10 +119,7 @@ class LoginAPIView(APIView):
         user = serializer.validated_data["user"]
         login(request, user)
 
-        user_account, _ = UserAccount.objects.get_or_create(
-            user=user,
-            defaults={"role": "TRAVELER"},
-        )
+        user_account = provision_account(user)
 
         LoginLog.objects.create(user=user, method="PASSWORD")
 
@@ -146,26 +140,29 @@ class LoginAPIView(APIView):
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def traveler_dashboard(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return Response({"detail": "Not logged in."}, status=status.HTTP_401_UNAUTHORIZED)
+    identity, error = identity_from_request(request)
+    if error:
+        return error
 
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return Response({"detail": "Invalid user token."}, status=status.HTTP_401_UNAUTHORIZED)
+    user = identity.user
+    account = identity.account
+    if account is None:
+        return Response(
+            {"detail": "User account not found."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
 
-    account, _ = UserAccount.objects.get_or_create(
-        user=user,
-        defaults={"role": "TRAVELER"},
+    # IMPORTANT: do NOT block merchants here. Read-only: the profile is
+    # provisioned at signup/login, a missing one just shows as "Not set".
+    profile = (
+        TravelerProfile.objects.select_related("area")
+        .filter(id=identity.traveler_profile_id)
+        .first()
     )
-
-    # IMPORTANT: do NOT block merchants here; just ensure traveler profile exists
-    profile = get_or_create_traveler_profile(account)
-
-    area = profile.area.name if profile.area else "Not set"
-    years_in_area = profile.years_in_area
-    profile_complete = bool(profile.area and profile.years_in_area > 0)
+    profile_area = profile.area if profile else None
+    area = profile_area.name if profile_area else "Not set"
+    years_in_area = profile.years_in_area if profile else 0
+    profile_complete = bool(profile_area and years_in_area > 0)
 
     suggestion = (
         "Add your area and years in area to get better local suggestions."
@@ -201,25 +198,9 @@ def traveler_dashboard(request):
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def merchant_dashboard(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return Response(
-            {"detail": "Not logged in."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
-
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return Response(
-            {"detail": "Invalid user token."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
-
-    account, _ = UserAccount.objects.get_or_create(
-        user=user,
-        defaults={"role": "MERCHANT"},
-    )
+    account, error = _get_account_from_token(request)
+    if error:
+        return error
 
     if account.role != "MERCHANT":
         return Response(
@@ -279,24 +260,10 @@ def merchant_dashboard(request):
 @api_view(["PUT"])
 @permission_classes([AllowAny])
 def merchant_update_profile(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return Response(
-            {"detail": "Not logged in."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
-
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return Response(
-            {"detail": "Invalid user token."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
+    account, error = _get_account_from_token(request)
+    if error:
+        return error
 
-    account, _ = UserAccount.objects.get_or_create(
-        user=user, defaults={"role": "MERCHANT"}
-    )
     if account.role != "MERCHANT":
         return Response(
             {"detail": "Merchant access only"},
@@ -473,16 +440,10 @@ def merchant_update_profile(request):
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def merchant_request_verification(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return Response({"detail": "Not logged in."}, status=status.HTTP_401_UNAUTHORIZED)
-
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return Response({"detail": "Invalid user token."}, status=status.HTTP_401_UNAUTHORIZED)
+    account, error = _get_account_from_token(request)
+    if error:
+        return error
 
-    account = UserAccount.objects.get(user=user)
     if account.role != "MERCHANT":
         return Response({"detail": "Merchant access only"}, status=status.HTTP_403_FORBIDDEN)
 
@@ -522,24 +483,13 @@ def merchant_request_verification(request):
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def admin_dashboard(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return Response(
-            {"detail": "Not logged in."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
-
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return Response(
-            {"detail": "Invalid user token."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
+    identity, error = identity_from_request(request)
+    if error:
+        return error
 
-    try:
-        account = UserAccount.objects.get(user=user)
-    except UserAccount.DoesNotExist:
+    user = identity.user
+    account = identity.account
+    if account is None:
         return Response(
             {"detail": "User account not found."},
             status=status.HTTP_401_UNAUTHORIZED,
@@ -587,25 +537,19 @@ def admin_dashboard(request):
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def admin_verification_requests(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return Response({"detail": "Not logged in."}, status=status.HTTP_401_UNAUTHORIZED)
-
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return Response({"detail": "Invalid user token."}, status=status.HTTP_401_UNAUTHORIZED)
+    identity, error = identity_from_request(request)
+    if error:
+        return error
 
-    account = UserAccount.objects.get(user=user)
-    if account.role != "ADMIN":
+    if identity.role != "ADMIN":
         return Response({"detail": "Admin access only"}, status=status.HTTP_403_FORBIDDEN)
 
-    admin_profile = account.admin_profile
-    area = admin_profile.area
+    account = identity.account
+    area_id = identity.admin_area_id
 
     qs = MerchantVerificationRequest.objects.filter(
-        merchant__business_area=area
-    ).select_related("merchant", "merchant__user_account")
+        merchant__business_area_id=area_id
+    ).select_related("merchant")
 
     data = [
         {
@@ -628,26 +572,20 @@ def admin_verification_requests(request):
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def admin_handle_verification(request, request_id):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return Response({"detail": "Not logged in."}, status=status.HTTP_401_UNAUTHORIZED)
-
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return Response({"detail": "Invalid user token."}, status=status.HTTP_401_UNAUTHORIZED)
+    identity, error = identity_from_request(request)
+    if error:
+        return error
 
-    account = UserAccount.objects.get(user=user)
-    if account.role != "ADMIN":
+    if identity.role != "ADMIN":
         return Response({"detail": "Admin access only"}, status=status.HTTP_403_FORBIDDEN)
 
-    admin_profile = account.admin_profile
-    area = admin_profile.area
+    account = identity.account
+    area_id = identity.admin_area_id
 
     try:
         req_obj = MerchantVerificationRequest.objects.select_related(
             "merchant", "merchant__business_area"
-        ).get(id=request_id, merchant__business_area=area)
+        ).get(id=request_id, merchant__business_area_id=area_id)
     except MerchantVerificationRequest.DoesNotExist:
         return Response(
             {"detail": "Request not found for your area."},
@@ -711,28 +649,16 @@ def me_view(request):
 @api_view(["PUT"])
 @permission_classes([AllowAny])
 def traveler_update_profile(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return Response(
-            {"detail": "Not logged in."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
-
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return Response(
-            {"detail": "Invalid user token."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
+    identity, error = identity_from_request(request)
+    if error:
+        return error
 
-    account, _ = UserAccount.objects.get_or_create(
-        user=user,
-        defaults={"role": "TRAVELER"},
-    )
+    account = identity.account
+    if account is None:
+        account = provision_account(identity.user)
 
     # IMPORTANT: do NOT block merchants here
-    profile = get_or_create_traveler_profile(account)
+    profile = ensure_traveler_profile(account)
 
     area_id = request.data.get("area_id")
     years_in_area = request.data.get("years_in_area", profile.years_in_area)
@@ -769,26 +695,13 @@ def traveler_update_profile(request):
     )
 
 
-# Helper to get or create TravelerProfile
-def get_or_create_traveler_profile(account):
-    """
-    Ensure this UserAccount has a TravelerProfile.
-    Useful when a MERCHANT also wants traveler features (Explore, save, rate).
-    """
-    profile, _ = TravelerProfile.objects.get_or_create(
-        user_account=account,
-        defaults={"years_in_area": 0},
-    )
-    return profile
-
-
 class UserSearchView(generics.ListAPIView):
     serializer_class = UserSearchSerializer
 
     def get_queryset(self):
         # Optional: require X-User-Token
-        token = self.request.headers.get("X-User-Token")
-        if not token:
+        identity, error = identity_from_request(self.request)
+        if error:
             return User.objects.none()
 
         q = self.request.query_params.get("q", "").strip()
@@ -800,21 +713,14 @@ class UserSearchView(generics.ListAPIView):
 
 # ----- helper: get account from token -----
 def _get_account_from_token(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return None, Response({"detail": "Not logged in."}, status=status.HTTP_401_UNAUTHORIZED)
-
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return None, Response({"detail": "Invalid user token."}, status=status.HTTP_401_UNAUTHORIZED)
+    identity, error = identity_from_request(request)
+    if error:
+        return None, error
 
-    try:
-        account = UserAccount.objects.get(user=user)
-    except UserAccount.DoesNotExist:
+    if identity.account is None:
         return None, Response({"detail": "User account not found."}, status=status.HTTP_404_NOT_FOUND)
 
-    return account, None
+    return identity.account, None
 
 
 # ----- user settings: GET / PUT -----
@@ -826,13 +732,17 @@ def user_settings_view(request):
     if error:
         return error
 
-    settings_obj, _ = UserSettings.objects.get_or_create(user_account=account)
-
     if request.method == "GET":
+        # read-only: unsaved defaults until the first PUT
+        settings_obj = (
+            UserSettings.objects.filter(user_account=account).first()
+            or UserSettings(user_account=account)
+        )
         ser = UserSettingsSerializer(settings_obj)
         return Response(ser.data, status=status.HTTP_200_OK)
 
     # PUT
+    settings_obj, _ = UserSettings.objects.get_or_create(user_account=account)
     ser = UserSettingsSerializer(settings_obj, data=request.data, partial=True)
     if not ser.is_valid():
         return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -845,19 +755,13 @@ def user_settings_view(request):
 @api_view(["PUT"])
 @permission_classes([AllowAny])
 def update_profile_view(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return Response({"detail": "Not logged in."}, status=status.HTTP_401_UNAUTHORIZED)
-
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return Response({"detail": "Invalid user token."}, status=status.HTTP_401_UNAUTHORIZED)
+    account, error = _get_account_from_token(request)
+    if error:
+        return error
 
-    try:
-        account = UserAccount.objects.get(user=user)
-    except UserAccount.DoesNotExist:
-        return Response({"detail": "User account not found."}, status=status.HTTP_404_NOT_FOUND)
+    # fresh row: the cached identity must not be what we save back
+    user = User.objects.get(pk=account.user_id)
+    old_token = user.username
 
     data = request.data
     new_username = data.get("username")
@@ -886,6 +790,7 @@ def update_profile_view(request):
         user.set_password(new_password)
 
     user.save()
+    invalidate_identity(old_token)
 
     # token is username in your app
     return Response(
@@ -912,6 +817,7 @@ def delete_account_view(request):
     user = account.user
     account.delete()
     user.delete()
+    invalidate_identity(user.username)
     return Response({"detail": "Account deleted."}, status=status.HTTP_204_NO_CONTENT)
 
 
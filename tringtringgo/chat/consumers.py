@@ -0,0 +1,53 @@
+# chat/consumers.py
+from urllib.parse import parse_qs
+
+from asgiref.sync import async_to_sync
+from channels.generic.websocket import JsonWebsocketConsumer
+
+from accounts.authentication import resolve_identity
+from .models import ChatThread
+from .realtime import thread_group
+
+
+class ChatThreadConsumer(JsonWebsocketConsumer):
+    """
+    ws/chat/threads/<thread_id>/?token=<X-User-Token>
+
+    Read-only push channel: new messages and status changes of one
+    thread. Messages are still sent with POST .../messages/, which
+    validates them and then broadcasts through chat.realtime.
+    Browsers can't set headers on a WebSocket, hence the token in the
+    query string.
+    """
+
+    def connect(self):
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        token = (query.get("token") or [""])[0]
+        identity = resolve_identity(token) if token else None
+        thread_id = self.scope["url_route"]["kwargs"]["thread_id"]
+
+        if identity is None or not ChatThread.objects.filter(
+            id=thread_id, participants=identity.user
+        ).exists():
+            self.close(code=4403)
+            return
+
+        self.group = thread_group(thread_id)
+        async_to_sync(self.channel_layer.group_add)(self.group, self.channel_name)
+        self.accept()
+
+    def disconnect(self, code):
+        if getattr(self, "group", None):
+            async_to_sync(self.channel_layer.group_discard)(self.group, self.channel_name)
+
+    def receive_json(self, content, **kwargs):
+        # nothing to do; clients only listen
+        pass
+
+    def chat_message(self, event):
+        self.send_json({"type": "message", "message": event["message"]})
+
+    def chat_status(self, event):
+        self.send_json(
+            {"type": "status", "thread_id": event["thread_id"], "status": event["status"]}
+        )
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:46
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_last_message(apps, schema_editor):
+    ChatThread = apps.get_model("chat", "ChatThread")
+    ChatMessage = apps.get_model("chat", "ChatMessage")
+
+    latest = ChatMessage.objects.filter(thread=models.OuterRef("pk")).order_by(
+        "-created_at", "-id"
+    )
+    ChatThread.objects.update(
+        last_message=models.Subquery(latest.values("id")[:1]),
+        last_activity_at=Coalesce(
+            models.Subquery(latest.values("created_at")[:1]), models.F("created_at")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_message_thread_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatthread',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='chatthread',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.chatmessage'),
+        ),
+        migrations.RunPython(fill_last_message, migrations.RunPython.noop),
+    ]
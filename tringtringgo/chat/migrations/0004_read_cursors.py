@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_read_cursors(apps, schema_editor):
+    # is_read was never maintained, so treat existing history as read
+    # rather than greeting everyone with their whole backlog as unread
+    ChatThread = apps.get_model("chat", "ChatThread")
+    ChatReadCursor = apps.get_model("chat", "ChatReadCursor")
+
+    last_message = dict(ChatThread.objects.values_list("id", "last_message_id"))
+    pairs = ChatThread.participants.through.objects.values_list("chatthread_id", "user_id")
+    ChatReadCursor.objects.bulk_create(
+        [
+            ChatReadCursor(
+                thread_id=thread_id,
+                user_id=user_id,
+                last_read_message_id=last_message.get(thread_id) or 0,
+            )
+            for thread_id, user_id in pairs.iterator()
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_thread_last_message'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatReadCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_message_id', models.PositiveBigIntegerField(default=0)),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('thread', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_cursors', to='chat.chatthread')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_read_cursors', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('thread', 'user'), name='chat_read_cursor_unique')],
+            },
+        ),
+        migrations.RunPython(create_read_cursors, migrations.RunPython.noop),
+    ]
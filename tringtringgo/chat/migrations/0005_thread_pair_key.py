@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:51
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def fill_pair_keys(apps, schema_editor):
+    """
+    Key every two-person thread by its pair. Pairs that ended up with
+    several threads (the old lookup raced) are merged into the oldest
+    one first: messages move over, read cursors keep the furthest
+    position and are recounted.
+    """
+    ChatThread = apps.get_model("chat", "ChatThread")
+    ChatMessage = apps.get_model("chat", "ChatMessage")
+    ChatReadCursor = apps.get_model("chat", "ChatReadCursor")
+    Participants = ChatThread.participants.through
+
+    members = defaultdict(list)
+    for thread_id, user_id in Participants.objects.values_list("chatthread_id", "user_id"):
+        members[thread_id].append(user_id)
+
+    by_pair = defaultdict(list)
+    for thread_id, user_ids in members.items():
+        if len(user_ids) == 2:
+            low, high = sorted(user_ids)
+            by_pair[f"{low}:{high}"].append(thread_id)
+
+    for key, thread_ids in by_pair.items():
+        threads = list(ChatThread.objects.filter(id__in=thread_ids).order_by("created_at", "id"))
+        keep, duplicates = threads[0], threads[1:]
+
+        if duplicates:
+            dup_ids = [t.id for t in duplicates]
+            ChatMessage.objects.filter(thread_id__in=dup_ids).update(thread=keep)
+            if keep.status != "active" and any(t.status == "active" for t in duplicates):
+                keep.status = "active"
+
+            for cursor in ChatReadCursor.objects.filter(thread=keep):
+                furthest = max(
+                    [cursor.last_read_message_id]
+                    + list(
+                        ChatReadCursor.objects.filter(
+                            thread_id__in=dup_ids, user_id=cursor.user_id
+                        ).values_list("last_read_message_id", flat=True)
+                    )
+                )
+                cursor.last_read_message_id = furthest
+                cursor.unread_count = (
+                    ChatMessage.objects.filter(thread=keep, id__gt=furthest)
+                    .exclude(sender_id=cursor.user_id)
+                    .count()
+                )
+                cursor.save()
+            ChatThread.objects.filter(id__in=dup_ids).delete()
+
+            latest = ChatMessage.objects.filter(thread=keep).order_by("-created_at", "-id").first()
+            if latest:
+                keep.last_message = latest
+                keep.last_activity_at = latest.created_at
+
+        keep.pair_key = key
+        keep.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0004_read_cursors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatthread',
+            name='pair_key',
+            field=models.CharField(blank=True, max_length=41, null=True, unique=True),
+        ),
+        migrations.RunPython(fill_pair_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:36
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0005_thread_pair_key'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='chatmessage',
+            name='is_read',
+        ),
+    ]
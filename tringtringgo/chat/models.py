@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 User = settings.AUTH_USER_MODEL
 
@@ -38,6 +39,33 @@ class ChatThread(models.Model):
         blank=True,
     )
 
+    # denormalized for the inbox, kept current by chat.signals on send
+    last_message = models.ForeignKey(
+        "ChatMessage",
+        related_name="+",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+    last_activity_at = models.DateTimeField(default=timezone.now)
+
+    # "<low user id>:<high user id>" for one-to-one threads, so the
+    # request endpoint finds (or creates) the pair's thread through a
+    # unique index; NULL for anything else
+    pair_key = models.CharField(max_length=41, unique=True, null=True, blank=True)
+
+    @staticmethod
+    def pair_key_for(user_id, other_user_id):
+        low, high = sorted([int(user_id), int(other_user_id)])
+        return f"{low}:{high}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # lets chat.signals push only real status changes
+        instance._saved_status = instance.__dict__.get("status")
+        return instance
+
     def __str__(self):
         return f"Thread {self.id} ({self.status})"
 
@@ -58,7 +86,41 @@ class ChatMessage(models.Model):
     )
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
-    is_read = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # message list cursors (after_id / before_id) per thread
+            models.Index(fields=["thread", "created_at"], name="chatmsg_thread_created_idx"),
+        ]
 
     def __str__(self):
         return f"Msg {self.id} in Thread {self.thread_id}"
+
+
+class ChatReadCursor(models.Model):
+    """
+    Per (thread, participant) read position: everything up to
+    last_read_message_id has been seen. unread_count is kept in step
+    by chat.signals on send and by the mark-read endpoint, so badges
+    never have to count messages.
+    """
+    thread = models.ForeignKey(
+        ChatThread,
+        related_name="read_cursors",
+        on_delete=models.CASCADE,
+    )
+    user = models.ForeignKey(
+        User,
+        related_name="chat_read_cursors",
+        on_delete=models.CASCADE,
+    )
+    last_read_message_id = models.PositiveBigIntegerField(default=0)
+    unread_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["thread", "user"], name="chat_read_cursor_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} read Thread {self.thread_id} up to {self.last_read_message_id}"
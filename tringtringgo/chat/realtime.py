@@ -0,0 +1,42 @@
+# chat/realtime.py
+"""
+Push chat events to the WebSocket consumers of a thread.
+
+Every open ChatThreadConsumer joins the group ``thread_group(id)``;
+anything sent here is relayed to those sockets as JSON:
+
+    {"type": "message", "message": {...ChatMessageSerializer...}}
+    {"type": "status", "thread_id": 1, "status": "active"}
+
+Without a channel layer configured these are no-ops, so the REST
+endpoints keep working on a plain WSGI deployment.
+"""
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+
+def thread_group(thread_id):
+    return f"chat.thread.{thread_id}"
+
+
+def _send(thread_id, event):
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    async_to_sync(layer.group_send)(thread_group(thread_id), event)
+
+
+def broadcast_message(message):
+    from .serializers import ChatMessageSerializer
+
+    _send(
+        message.thread_id,
+        {"type": "chat.message", "message": dict(ChatMessageSerializer(message).data)},
+    )
+
+
+def broadcast_status(thread):
+    _send(
+        thread.id,
+        {"type": "chat.status", "thread_id": thread.id, "status": thread.status},
+    )
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .consumers import ChatThreadConsumer
+
+websocket_urlpatterns = [
+    path("ws/chat/threads/<int:thread_id>/", ChatThreadConsumer.as_asgi()),
+]
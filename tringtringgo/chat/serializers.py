@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+
+from core.serializers import FlatSerializerMixin
 from .models import ChatThread, ChatMessage
 
 User = get_user_model()
@@ -11,19 +13,21 @@ class UserShortSerializer(serializers.ModelSerializer):
         fields = ["id", "username", "email"]
 
 
-class ChatMessageSerializer(serializers.ModelSerializer):
+class ChatMessageSerializer(FlatSerializerMixin, serializers.ModelSerializer):
     sender = UserShortSerializer(read_only=True)
 
     class Meta:
         model = ChatMessage
-        fields = ["id", "thread", "sender", "text", "created_at", "is_read"]
-        read_only_fields = ["id", "sender", "created_at", "is_read", "thread"]
+        fields = ["id", "thread", "sender", "text", "created_at"]
+        read_only_fields = ["id", "sender", "created_at", "thread"]
 
 
 class ChatThreadSerializer(serializers.ModelSerializer):
     participants = UserShortSerializer(many=True, read_only=True)
     requested_by = UserShortSerializer(read_only=True)
-    last_message = serializers.SerializerMethodField()
+    last_message = ChatMessageSerializer(read_only=True)
+    # annotated by chat.views.inbox_queryset for the requesting user
+    unread_count = serializers.IntegerField(read_only=True, default=0)
 
     class Meta:
         model = ChatThread
@@ -33,11 +37,7 @@ class ChatThreadSerializer(serializers.ModelSerializer):
             "status",
             "requested_by",
             "created_at",
+            "last_activity_at",
             "last_message",
+            "unread_count",
         ]
-
-    def get_last_message(self, obj):
-        msg = obj.messages.order_by("-created_at").first()
-        if not msg:
-            return None
-        return ChatMessageSerializer(msg).data
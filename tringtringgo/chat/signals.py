@@ -0,0 +1,76 @@
+# chat/signals.py
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from .models import ChatThread, ChatMessage, ChatReadCursor
+from .realtime import broadcast_message, broadcast_status
+
+
+# ---------- WebSocket push (see chat/realtime.py) ----------
+
+
+@receiver(post_save, sender=ChatMessage)
+def push_new_message(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: broadcast_message(instance))
+
+
+# ---------- inbox denormalization ----------
+
+
+@receiver(post_save, sender=ChatMessage)
+def touch_thread(sender, instance, created, **kwargs):
+    if not created:
+        return
+    # guarded so a slower concurrent send can't move last_message backwards
+    ChatThread.objects.filter(pk=instance.thread_id).filter(
+        Q(last_message__isnull=True) | Q(last_message_id__lt=instance.id)
+    ).update(last_message=instance, last_activity_at=instance.created_at)
+
+
+@receiver(post_save, sender=ChatThread)
+def push_status_change(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_saved_status", None)
+    instance._saved_status = instance.status
+    if created or previous == instance.status:
+        return
+    transaction.on_commit(lambda: broadcast_status(instance))
+
+
+# ---------- read cursors / unread counters ----------
+
+
+@receiver(m2m_changed, sender=ChatThread.participants.through)
+def sync_read_cursors(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # user.chat_threads.add(...) - instance is the user
+        pairs = [(thread_id, instance.pk) for thread_id in pk_set or ()]
+    else:
+        pairs = [(instance.pk, user_id) for user_id in pk_set or ()]
+
+    if action == "post_add":
+        ChatReadCursor.objects.bulk_create(
+            [ChatReadCursor(thread_id=t, user_id=u) for t, u in pairs],
+            ignore_conflicts=True,
+        )
+    elif action == "post_remove":
+        for thread_id, user_id in pairs:
+            ChatReadCursor.objects.filter(thread_id=thread_id, user_id=user_id).delete()
+    elif action == "post_clear":
+        # pk_set is None here; clear() drops every pairing of instance
+        field = "user" if reverse else "thread"
+        ChatReadCursor.objects.filter(**{field: instance}).delete()
+
+
+@receiver(post_save, sender=ChatMessage)
+def count_unread(sender, instance, created, **kwargs):
+    if not created:
+        return
+    cursors = ChatReadCursor.objects.filter(thread_id=instance.thread_id)
+    cursors.exclude(user_id=instance.sender_id).update(unread_count=F("unread_count") + 1)
+    # replying means the sender has seen the thread up to here
+    cursors.filter(user_id=instance.sender_id).update(
+        last_read_message_id=instance.id, unread_count=0
+    )
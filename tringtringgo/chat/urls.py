@@ -5,6 +5,8 @@ from .views import (
     ChatThreadRequestView,
     ChatThreadAcceptView,
     ChatMessageListCreateView,
+    ChatThreadReadView,
+    ChatUnreadCountView,
 )
 
 app_name = "chat"
@@ -14,4 +16,6 @@ urlpatterns = [
     path("threads/request/", ChatThreadRequestView.as_view(), name="thread-request"),
     path("threads/<int:pk>/accept/", ChatThreadAcceptView.as_view(), name="thread-accept"),
     path("threads/<int:thread_id>/messages/", ChatMessageListCreateView.as_view(), name="message-list-create"),
+    path("threads/<int:thread_id>/read/", ChatThreadReadView.as_view(), name="thread-read"),
+    path("unread/", ChatUnreadCountView.as_view(), name="unread-count"),
 ]
@@ -1,33 +1,74 @@
 from rest_framework import generics, status
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 
-from .models import ChatThread, ChatMessage
+from accounts.authentication import get_identity
+from .models import ChatThread, ChatMessage, ChatReadCursor
 from .serializers import ChatThreadSerializer, ChatMessageSerializer
 
 User = get_user_model()
 
+MESSAGE_PAGE_SIZE = 50
+MAX_MESSAGE_PAGE_SIZE = 200
+# largest id a 64-bit primary key column can hold
+MAX_MESSAGE_ID = 2**63 - 1
+
 
 def get_user_from_token(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return None
-    try:
-        return User.objects.get(username=token)
-    except User.DoesNotExist:
-        return None
+    identity = get_identity(request)
+    return identity.user if identity else None
+
+
+def get_thread_for(user, thread_id):
+    """
+    The thread, annotated with ``is_participant`` for ``user``: one query,
+    membership being an EXISTS on the (thread, user) unique index of the
+    participants table. 404 if the thread doesn't exist.
+    """
+    membership = ChatThread.participants.through.objects.filter(
+        chatthread_id=OuterRef("pk"), user_id=user.pk
+    )
+    return get_object_or_404(
+        ChatThread.objects.annotate(is_participant=Exists(membership)),
+        id=thread_id,
+    )
+
+
+def inbox_queryset(user):
+    """
+    Threads of ``user`` with everything ChatThreadSerializer needs, in
+    two queries: the threads (requested_by, last message and its sender
+    joined, unread count from the caller's read cursor) and one
+    participants prefetch.
+    """
+    unread = ChatReadCursor.objects.filter(thread=OuterRef("pk"), user=user).values(
+        "unread_count"
+    )[:1]
+    return (
+        ChatThread.objects.filter(participants=user)
+        .select_related("requested_by", "last_message__sender")
+        .prefetch_related("participants")
+        .annotate(unread_count=Coalesce(Subquery(unread), 0))
+        .order_by("-last_activity_at", "-id")
+    )
 
 
 class ChatThreadListView(generics.ListAPIView):
+    """The caller's inbox, most recently active thread first."""
+
     serializer_class = ChatThreadSerializer
 
     def get_queryset(self):
         user = get_user_from_token(self.request)
         if not user:
             return ChatThread.objects.none()
-        return ChatThread.objects.filter(participants=user).order_by("-created_at")
+        return inbox_queryset(user)
 
 
 class ChatThreadRequestView(APIView):
@@ -54,20 +95,24 @@ class ChatThreadRequestView(APIView):
 
         target_user = get_object_or_404(User, id=target_user_id)
 
-        thread = (
-            ChatThread.objects
-            .filter(participants=current_user)
-            .filter(participants=target_user)
-            .first()
-        )
+        # one thread per pair, enforced by the unique pair_key; a
+        # concurrent request that wins the insert just gets reused
+        pair_key = ChatThread.pair_key_for(current_user.id, target_user.id)
+        thread = ChatThread.objects.filter(pair_key=pair_key).first()
 
         if not thread:
-            thread = ChatThread.objects.create(
-                requested_by=current_user,
-                status=ChatThread.PENDING,
-            )
-            thread.participants.add(current_user, target_user)
-
+            try:
+                with transaction.atomic():
+                    thread = ChatThread.objects.create(
+                        requested_by=current_user,
+                        status=ChatThread.PENDING,
+                        pair_key=pair_key,
+                    )
+                    thread.participants.add(current_user, target_user)
+            except IntegrityError:
+                thread = ChatThread.objects.get(pair_key=pair_key)
+
+        thread = inbox_queryset(current_user).get(pk=thread.pk)
         serializer = ChatThreadSerializer(thread)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -82,9 +127,9 @@ class ChatThreadAcceptView(APIView):
             )
 
         action = request.data.get("action", "accept")
-        thread = get_object_or_404(ChatThread, id=pk)
+        thread = get_thread_for(current_user, pk)
 
-        if current_user not in thread.participants.all():
+        if not thread.is_participant:
             return Response(
                 {"detail": "You are not part of this chat."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -107,10 +152,42 @@ class ChatThreadAcceptView(APIView):
             )
         thread.save()
 
+        thread = inbox_queryset(current_user).get(pk=thread.pk)
         return Response(ChatThreadSerializer(thread).data)
 
 
+def _message_id_param(request, name):
+    value = request.query_params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        value = -1
+    if not 0 <= value <= MAX_MESSAGE_ID:
+        raise ValidationError({name: "Must be a message id."})
+    return value
+
+
+def _limit_param(request):
+    value = request.query_params.get("limit")
+    if value in (None, ""):
+        return MESSAGE_PAGE_SIZE
+    try:
+        return max(1, min(int(value), MAX_MESSAGE_PAGE_SIZE))
+    except ValueError:
+        raise ValidationError({"limit": "Must be an integer."})
+
+
 class ChatMessageListCreateView(generics.ListCreateAPIView):
+    """
+    GET returns messages oldest first, at most ?limit= of them:
+
+    (no cursor)       the latest messages of the thread
+    ?after_id=N       only messages newer than N (polling for deltas)
+    ?before_id=N      the messages just before N (scrolling back)
+    """
+
     serializer_class = ChatMessageSerializer
 
     def get_queryset(self):
@@ -118,26 +195,125 @@ class ChatMessageListCreateView(generics.ListCreateAPIView):
         if not user:
             return ChatMessage.objects.none()
 
-        thread_id = self.kwargs["thread_id"]
-        thread = get_object_or_404(ChatThread, id=thread_id)
-
-        if user not in thread.participants.all():
+        thread = self.get_thread(user)
+        if not thread.is_participant:
             return ChatMessage.objects.none()
 
-        return thread.messages.order_by("created_at")
+        return thread.messages.select_related("sender")
+
+    def get_thread(self, user):
+        # looked up once per request, shared by the list and create paths
+        if not hasattr(self, "_thread"):
+            self._thread = get_thread_for(user, self.kwargs["thread_id"])
+        return self._thread
+
+    def list(self, request, *args, **kwargs):
+        after_id = _message_id_param(request, "after_id")
+        before_id = _message_id_param(request, "before_id")
+        limit = _limit_param(request)
+
+        # flat rows (core/serializers.py): no model instances per message
+        flat = ChatMessageSerializer.flat(context=self.get_serializer_context())
+        qs = self.get_queryset()
+        if after_id is not None:
+            rows = list(flat.values(qs.filter(id__gt=after_id).order_by("created_at", "id")[:limit]))
+        else:
+            if before_id is not None:
+                qs = qs.filter(id__lt=before_id)
+            # newest `limit`, then back to chronological order
+            rows = list(flat.values(qs.order_by("-created_at", "-id")[:limit]))[::-1]
+
+        return Response(flat.to_representation(rows))
 
     def perform_create(self, serializer):
         user = get_user_from_token(self.request)
         if not user:
-            raise PermissionError("Not logged in.")
+            raise NotAuthenticated("Not logged in.")
 
-        thread_id = self.kwargs["thread_id"]
-        thread = get_object_or_404(ChatThread, id=thread_id)
-
-        if user not in thread.participants.all():
-            raise PermissionError("You are not part of this chat.")
+        thread = self.get_thread(user)
+        if not thread.is_participant:
+            raise PermissionDenied("You are not part of this chat.")
 
         serializer.save(
             thread=thread,
             sender=user,
         )
+
+
+class ChatThreadReadView(APIView):
+    """
+    Mark a thread read up to ``up_to_id`` (default: its latest message).
+    Moves the caller's read cursor; cursors never go backwards.
+    """
+
+    def post(self, request, thread_id):
+        current_user = get_user_from_token(request)
+        if not current_user:
+            return Response(
+                {"detail": "Not logged in."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        up_to_id = request.data.get("up_to_id")
+        if up_to_id is not None:
+            try:
+                up_to_id = int(up_to_id)
+            except (TypeError, ValueError):
+                up_to_id = 0
+            if not 0 < up_to_id <= MAX_MESSAGE_ID:
+                return Response(
+                    {"detail": "up_to_id must be a message id."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        with transaction.atomic():
+            cursor = (
+                ChatReadCursor.objects.select_for_update()
+                .filter(thread_id=thread_id, user=current_user)
+                .first()
+            )
+            if cursor is None:
+                return Response(
+                    {"detail": "You are not part of this chat."},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            messages = ChatMessage.objects.filter(thread_id=thread_id)
+            latest_id = messages.order_by("-id").values_list("id", flat=True).first() or 0
+            # never past the thread's last message, or later ones would
+            # arrive already read
+            up_to_id = latest_id if up_to_id is None else min(up_to_id, latest_id)
+
+            if up_to_id > cursor.last_read_message_id:
+                cursor.last_read_message_id = up_to_id
+                cursor.unread_count = (
+                    messages.filter(id__gt=up_to_id).exclude(sender=current_user).count()
+                )
+                cursor.save(update_fields=["last_read_message_id", "unread_count"])
+
+        return Response(
+            {
+                "thread_id": cursor.thread_id,
+                "last_read_message_id": cursor.last_read_message_id,
+                "unread_count": cursor.unread_count,
+            }
+        )
+
+
+class ChatUnreadCountView(APIView):
+    """Total unread messages across the caller's threads, for the top bar."""
+
+    def get(self, request):
+        current_user = get_user_from_token(request)
+        if not current_user:
+            return Response(
+                {"detail": "Not logged in."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        totals = ChatReadCursor.objects.filter(user=current_user, unread_count__gt=0).aggregate(
+            unread=Sum("unread_count"), threads=Count("id")
+        )
+        return Response(
+            {"unread_count": totals["unread"] or 0, "unread_threads": totals["threads"]}
+        )
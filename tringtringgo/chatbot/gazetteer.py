@@ -0,0 +1,154 @@
+# chatbot/gazetteer.py
+"""
+In-memory index of travel.Area names for "... near <area>" messages.
+
+The chatbot used to run ``area__name__icontains=<whatever the user
+typed>`` for every query. Instead the typed area is resolved to Area
+ids here, trying in order:
+
+1. exact match on the normalised name or an alias
+   (``settings.CHATBOT_AREA_ALIASES``, alias -> area name)
+2. names starting with it ("gulshan" -> Gulshan 1, Gulshan 2)
+3. the closest name by trigram similarity, to absorb typos
+   ("dhanmondy" -> Dhanmondi)
+
+The index is built lazily per process and rebuilt when an Area changes:
+chatbot.signals bumps a version stamp in the shared cache (settings.CACHES)
+once the change has committed, and every worker compares it against the
+version it built.
+"""
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = "chatbot:gazetteer:version"
+MIN_PREFIX = 3
+MIN_SIMILARITY = 0.5
+
+
+def normalise(text):
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AreaGazetteer:
+    def __init__(self, areas, aliases=None):
+        """``areas``: iterable of (id, name); ``aliases``: alias -> area name."""
+        self.exact = {}
+        self.names = []  # sorted (normalised name, id) for prefix search
+        self.grams = {}  # trigram -> ids
+        self.gram_counts = {}
+
+        by_name = {}
+        for area_id, name in areas:
+            key = normalise(name)
+            if not key:
+                continue
+            by_name[key] = area_id
+            self.exact[key] = area_id
+            self.names.append((key, area_id))
+            grams = trigrams(key)
+            self.gram_counts[area_id] = len(grams)
+            for gram in grams:
+                self.grams.setdefault(gram, set()).add(area_id)
+        self.names.sort()
+
+        for alias, name in (aliases or {}).items():
+            area_id = by_name.get(normalise(name))
+            if area_id is not None:
+                self.exact[normalise(alias)] = area_id
+
+    def lookup(self, text):
+        """Area ids matching ``text``, best first; [] if nothing is close."""
+        key = normalise(text)
+        if not key:
+            return []
+        if key in self.exact:
+            return [self.exact[key]]
+
+        if len(key) >= MIN_PREFIX:
+            start = bisect.bisect_left(self.names, (key,))
+            ids = []
+            for name, area_id in self.names[start:]:
+                if not name.startswith(key):
+                    break
+                ids.append(area_id)
+            if ids:
+                return ids
+
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            for area_id in self.grams.get(gram, ()):
+                shared[area_id] += 1
+        best, best_score = None, 0.0
+        for area_id, count in shared.items():
+            # Dice coefficient over trigram sets
+            score = 2 * count / (len(grams) + self.gram_counts[area_id])
+            if score > best_score:
+                best, best_score = area_id, score
+        return [best] if best_score >= MIN_SIMILARITY else []
+
+
+_lock = threading.Lock()
+_gazetteer = None
+_built_version = None
+
+
+def _load():
+    from travel.models import Area
+
+    return AreaGazetteer(
+        Area.objects.values_list("id", "name"),
+        getattr(settings, "CHATBOT_AREA_ALIASES", {}),
+    )
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # from the clock, like chatbot.reply_cache: after a cache flush the
+        # version can't fall back to one an older index was built at
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_gazetteer():
+    global _gazetteer, _built_version
+    version = _version()
+    if _gazetteer is None or version != _built_version:
+        with _lock:
+            if _gazetteer is None or version != _built_version:
+                _gazetteer = _load()
+                _built_version = version
+    return _gazetteer
+
+
+def resolve_area(text):
+    return get_gazetteer().lookup(text)
+
+
+def invalidate():
+    """
+    Make every process rebuild its index on next use. Call it after the
+    Area change has committed (chatbot.signals uses on_commit), or another
+    process could rebuild from the old rows under the new version.
+    """
+    global _gazetteer
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), None)
+    _gazetteer = None
@@ -0,0 +1,145 @@
+# chatbot/history.py
+"""
+Per-session chatbot history.
+
+Messages are not inserted while the request is handled: ``log()`` only
+queues them, and ``flush()`` writes everything queued with a single
+``bulk_create``. The queue is written once CHATBOT_HISTORY_BATCH_SIZE
+messages are waiting (checked by chatbot.signals on request_finished,
+after the response has gone out) or once its oldest message is
+CHATBOT_HISTORY_FLUSH_SECONDS old (a background thread, so an idle
+worker writes too), and when the process exits. So one insert covers
+many chat messages, off the request path. A failed insert keeps the
+batch queued for the next flush. ``recent()`` merges the queue with the
+table, so history read from the same process is complete even before a
+flush; other workers see it after the flush.
+
+Bot turns are queued as the handler's ``Reply``; its text is rendered
+only when the message is written or read back, so ``?format=json``
+requests never build the text blob.
+
+Old rows are removed by the purge_chatbot_history command.
+"""
+import atexit
+import logging
+import secrets
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+
+from accounts.authentication import get_identity
+from .models import ChatMessage
+
+BATCH_SIZE = getattr(settings, "CHATBOT_HISTORY_BATCH_SIZE", 50)
+FLUSH_SECONDS = getattr(settings, "CHATBOT_HISTORY_FLUSH_SECONDS", 5)
+
+logger = logging.getLogger(__name__)
+
+# (session, role, message, queued at)
+_queue = deque()
+_lock = threading.Lock()
+_flusher = None
+# set to make the flusher re-check the queue before its timeout
+_wake = threading.Event()
+
+
+def session_key(request):
+    """
+    "user:<id>" for logged-in callers, else "anon:<id>" with a random id
+    kept in the caller's server-side session. A new session is saved by
+    SessionMiddleware with the response, as any session is; nothing is
+    written here.
+    """
+    identity = get_identity(request)
+    if identity is not None:
+        return f"user:{identity.user.id}"
+    session = request.session
+    # loads the session: a cookie naming no stored session comes back
+    # empty, so clients can't pick their own id
+    history_id = session.get("chatbot_history_id")
+    if history_id is None:
+        history_id = session["chatbot_history_id"] = secrets.token_hex(16)
+    return f"anon:{history_id}"
+
+
+def log(session, role, message):
+    """Queue one turn; ``message`` is a string or a chatbot Reply."""
+    if not session:
+        return
+    _queue.append((session, role, message, time.monotonic()))
+    _start_flusher()
+
+
+def _row(session, role, message, queued_at=None):
+    if not isinstance(message, str):
+        message = message.text
+    return ChatMessage(session=session, role=role, message=message)
+
+
+def flush():
+    """Write everything queued; on a database error it stays queued."""
+    with _lock:
+        entries = []
+        while _queue:
+            entries.append(_queue.popleft())
+        if not entries:
+            return
+        try:
+            ChatMessage.objects.bulk_create([_row(*e) for e in entries], batch_size=500)
+        except DatabaseError:
+            # back in front of anything queued meanwhile, in order
+            _queue.extendleft(reversed(entries))
+            logger.exception("Could not write %d chatbot messages; kept queued.", len(entries))
+
+
+def _oldest_age():
+    try:
+        return time.monotonic() - _queue[0][3]
+    except IndexError:
+        return 0
+
+
+def flush_if_due():
+    if len(_queue) >= BATCH_SIZE or (_queue and _oldest_age() >= FLUSH_SECONDS):
+        flush()
+
+
+def _flush_periodically():
+    while True:
+        _wake.wait(max(FLUSH_SECONDS - _oldest_age(), 0.1))
+        _wake.clear()
+        if _queue and _oldest_age() >= FLUSH_SECONDS:
+            flush()
+            # this thread's own connection; don't hold it while idle
+            connection.close()
+
+
+def _start_flusher():
+    global _flusher
+    if _flusher is not None:
+        return
+    with _lock:
+        if _flusher is None:
+            _flusher = threading.Thread(
+                target=_flush_periodically, name="chatbot-history-flush", daemon=True
+            )
+            _flusher.start()
+
+
+# whatever is still queued when the worker shuts down
+atexit.register(flush)
+
+
+def recent(session, limit=50):
+    """The session's last ``limit`` messages, oldest first."""
+    if not session:
+        return []
+    stored = list(
+        ChatMessage.objects.filter(session=session).order_by("-created_at", "-id")[:limit]
+    )
+    pending = [_row(*entry) for entry in list(_queue) if entry[0] == session]
+    messages = sorted(stored, key=lambda m: m.created_at) + pending
+    return messages[-limit:]
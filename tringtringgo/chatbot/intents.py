@@ -0,0 +1,130 @@
+# chatbot/intents.py
+"""
+Message -> intent routing for the chatbot.
+
+A message is scanned once by ``TOKEN_RE``: every word is looked up in
+``KEYWORDS`` (token -> (slot, value)), and everything after "near" is
+captured as the area. ``resolve()`` turns the collected slots into a
+``Query(intent, category, area)``, and ``answer()`` dispatches it to the
+handler registered for that intent (see chatbot/replies.py).
+
+Adding a service category or a synonym is one ``KEYWORDS`` entry; a new
+command is a keyword with slot "command" plus a ``@handles`` function.
+"""
+import re
+from dataclasses import dataclass, field
+
+from . import reply_cache
+
+# "near" swallows the rest of the message as the area
+TOKEN_RE = re.compile(r"\bnear\b\s*(?P<area>.*)$|(?P<word>[a-z]+)")
+
+GREETINGS = {"hi", "hello", "hey"}
+
+KEYWORDS = {
+    # service categories (travel.Service.category)
+    "hospital": ("category", "HOSPITAL"),
+    "hospitals": ("category", "HOSPITAL"),
+    "police": ("category", "POLICE"),
+    "atm": ("category", "ATM"),
+    "atms": ("category", "ATM"),
+    "pharmacy": ("category", "PHARMACY"),
+    "pharmacies": ("category", "PHARMACY"),
+    "transport": ("category", "TRANSPORT"),
+    # places
+    "places": ("subject", "places"),
+    "top": ("modifier", "top"),
+    "all": ("modifier", "all"),
+    # commands, which win over everything else
+    "history": ("command", "history"),
+    "help": ("command", "help"),
+}
+
+# when a message holds several commands, the first listed wins
+COMMAND_PRIORITY = ["history", "help"]
+
+
+@dataclass(frozen=True)
+class Query:
+    intent: str
+    category: str | None = None
+    area: str | None = None  # None: no "near"; "": "near" without an area
+    # caller's history session; not part of equality, so cached replies
+    # are shared between sessions
+    session: str | None = field(default=None, compare=False)
+
+
+def scan(text):
+    """One pass over ``text``: (slots, area). slots maps slot -> set of values."""
+    slots = {}
+    area = None
+    for match in TOKEN_RE.finditer(text):
+        if match.group("word") is None:
+            area = match.group("area").strip()
+            break
+        hit = KEYWORDS.get(match.group("word"))
+        if hit:
+            slots.setdefault(hit[0], set()).add(hit[1])
+    return slots, area
+
+
+def resolve(message, session=None):
+    text = message.lower().strip()
+    slots, area = scan(text)
+
+    commands = slots.get("command")
+    if commands:
+        return Query(next(c for c in COMMAND_PRIORITY if c in commands), session=session)
+    if text in GREETINGS:
+        return Query("greeting")
+
+    modifiers = slots.get("modifier", set())
+    places = "places" in slots.get("subject", ())
+    if places and "top" in modifiers:
+        return Query("top_places")
+    if places and ("all" in modifiers or text == "places"):
+        return Query("all_places")
+
+    if slots.get("category"):
+        # several categories in one message: stay deterministic
+        category = min(slots["category"])
+        if area is not None:
+            return Query("services_near", category=category, area=area)
+        return Query("all_services", category=category)
+
+    if places and area is not None:
+        return Query("places_near", area=area)
+
+    return Query("fallback")
+
+
+# ---------- handler registry ----------
+
+HANDLERS = {}
+# intents whose reply depends only on the query and catalogue data
+CACHEABLE = set()
+
+
+def handles(intent, cacheable=True):
+    """
+    Register the decorated ``handler(query) -> reply`` for ``intent``.
+    Replies are cached (chatbot.reply_cache) unless ``cacheable=False``.
+    """
+
+    def register(func):
+        HANDLERS[intent] = func
+        if cacheable:
+            CACHEABLE.add(intent)
+        else:
+            CACHEABLE.discard(intent)
+        return func
+
+    return register
+
+
+def answer(query):
+    intent = query.intent if query.intent in HANDLERS else "fallback"
+    handler = HANDLERS[intent]
+    if intent in CACHEABLE:
+        return reply_cache.get_or_build(query, lambda: handler(query))
+    return handler(query)
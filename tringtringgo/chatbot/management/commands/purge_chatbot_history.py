@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from chatbot.models import ChatMessage
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete chatbot messages older than the retention period "
+        "(CHATBOT_HISTORY_RETENTION_DAYS, default 30)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=getattr(settings, "CHATBOT_HISTORY_RETENTION_DAYS", 30),
+            help="Keep this many days of history.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many messages would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        old = ChatMessage.objects.filter(created_at__lt=cutoff)
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"Found {old.count()} expired messages."))
+            return
+
+        deleted, _ = old.delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired messages."))
@@ -1,5 +1,6 @@
 # chatbot/models.py
 from django.db import models
+from django.utils import timezone
 
 
 class ChatMessage(models.Model):
@@ -8,10 +9,17 @@ class ChatMessage(models.Model):
         ("bot", "bot"),
     ]
 
+    # whose conversation this is, see chatbot.history.session_key()
+    session = models.CharField(max_length=80, blank=True, default="")
     role = models.CharField(max_length=10, choices=ROLE_CHOICES)
     message = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    # set when the message is logged, not when the batch is flushed
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["session", "created_at"], name="chatbot_msg_session_idx"),
+        ]
 
     def __str__(self):
         return f"{self.role}: {self.message[:40]}"
-    
\ No newline at end of file
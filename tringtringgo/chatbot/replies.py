@@ -0,0 +1,292 @@
+# chatbot/replies.py
+"""
+One handler per chatbot intent (see chatbot/intents.py), plus the text
+formatting they share. Service intents are driven by SERVICE_REPLIES,
+so a new category only needs a row there and a keyword.
+
+Handlers return a ``Reply``: typed result items for ``?format=json``
+clients, with the classic text blob rendered from them only when asked
+for (and then once per cached reply).
+"""
+from django.conf import settings
+
+from .gazetteer import resolve_area
+from .history import recent
+from .intents import handles
+from travel.models import Service, Place
+
+# items kept per reply; the JSON mode pages through these
+MAX_RESULTS = getattr(settings, "CHATBOT_MAX_RESULTS", 100)
+
+COMMANDS_TEXT = (
+    "- hospitals near <area>\n"
+    "- police near <area>\n"
+    "- atm near <area>\n"
+    "- pharmacy near <area>\n"
+    "- transport near <area>\n"
+    "- places near <area>\n"
+    "- top places\n"
+)
+
+# category -> (plural label, example command word)
+SERVICE_REPLIES = {
+    "HOSPITAL": ("hospitals", "hospitals"),
+    "POLICE": ("police stations", "police"),
+    "ATM": ("ATMs", "atm"),
+    "PHARMACY": ("pharmacies", "pharmacy"),
+    "TRANSPORT": ("transport hubs", "transport"),
+}
+
+
+class Reply:
+    """
+    A handler's answer.
+
+    ``title`` heads a list of ``items`` (plain dicts); ``message`` is the
+    whole answer when there is nothing to list. ``text`` renders at most
+    ``text_limit`` items with ``render(item, index)``.
+    """
+
+    def __init__(self, message="", title="", items=(), render=None, text_limit=None, separator="\n\n"):
+        self.message = message
+        self.title = title
+        self.items = list(items)
+        self.render = render
+        self.text_limit = text_limit
+        self.separator = separator
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self._render_text()
+        return self._text
+
+    def _render_text(self):
+        if not self.items:
+            return self.message
+        blocks = [
+            self.render(item, index)
+            for index, item in enumerate(self.items[:self.text_limit], start=1)
+        ]
+        body = self.separator.join(blocks)
+        return f"{self.title}\n\n{body}" if self.title else body
+
+
+def service_item(s: Service) -> dict:
+    return {
+        "type": "service",
+        "id": s.id,
+        "name": s.name,
+        "category": s.category,
+        "area": s.area.name if s.area else None,
+        "area_id": s.area_id,
+        "address": s.address,
+        "phone": s.phone,
+        "open_hours": s.open_hours,
+        "notes": s.notes,
+    }
+
+
+def place_item(p: Place) -> dict:
+    return {
+        "type": "place",
+        "id": p.id,
+        "name": p.name,
+        "category": p.category,
+        "category_label": p.get_category_display(),
+        "area": p.area.name if p.area else None,
+        "area_id": p.area_id,
+        "rating": round(p.average_rating, 2) if p.review_count else None,
+        "review_count": p.review_count,
+    }
+
+
+def format_service_detail(item: dict, index: int | None = None) -> str:
+    """
+    Return a numbered, multi-line string with full service details.
+
+    Example:
+    1. Apollo Hospital
+       Area: Dhanmondi
+       Address: ...
+       Phone: ...
+    """
+    lines = [f"{index}. {item['name']}" if index is not None else item["name"]]
+
+    if item.get("area"):
+        lines.append(f"   Area: {item['area']}")
+    if item.get("address"):
+        lines.append(f"   Address: {item['address']}")
+    if item.get("phone"):
+        lines.append(f"   Phone: {item['phone']}")
+    if item.get("open_hours"):
+        lines.append(f"   Open hours: {item['open_hours']}")
+    if item.get("notes"):
+        lines.append(f"   Notes: {item['notes']}")
+
+    return "\n".join(lines)
+
+
+def format_place_detail(item: dict, index: int | None = None, show_rating: bool = True) -> str:
+    """
+    Return a numbered, multi-line string with place details.
+
+    Example:
+    1. Dhanmondi Lake
+       Category: Park
+       Area: Dhanmondi
+       Rating: 4.5 stars ★★★★☆
+    """
+    lines = [f"{index}. {item['name']}" if index is not None else item["name"]]
+
+    lines.append(f"   Category: {item.get('category_label') or 'Place'}")
+    if item.get("area"):
+        lines.append(f"   Area: {item['area']}")
+
+    avg = item.get("rating")
+    if show_rating and avg is not None:
+        full_stars = min(max(int(round(avg)), 0), 5)
+        stars = "★" * full_stars + "☆" * (5 - full_stars)
+        lines.append(f"   Rating: {avg:.1f} stars {stars}")
+
+    return "\n".join(lines)
+
+
+def format_place_summary(item: dict, index: int | None = None) -> str:
+    return format_place_detail(item, index, show_rating=False)
+
+
+def format_history_entry(item: dict, index: int | None = None) -> str:
+    return f"{item['role']}: {item['message']}"
+
+
+# ---------- handlers ----------
+
+
+@handles("history", cacheable=False)
+def history(query):
+    msgs = recent(query.session, limit=50)
+    items = [
+        {
+            "type": "message",
+            "role": m.role,
+            "message": m.message,
+            "created_at": m.created_at.isoformat() if m.created_at else None,
+        }
+        for m in msgs
+    ]
+    return Reply("No chat history yet.", items=items, render=format_history_entry, separator="\n")
+
+
+@handles("greeting")
+def greeting(query):
+    return Reply(
+        "👋 Hello! I’m here to help you find services and locations in your area. "
+        "For a list of available commands, type help."
+    )
+
+
+@handles("help")
+def help_text(query):
+    return Reply(
+        "You can try commands like:\n"
+        + COMMANDS_TEXT
+        + "- all hospitals / all atms / all police etc.\n"
+        "- show history"
+    )
+
+
+@handles("top_places")
+def top_places(query):
+    # stored aggregates (travel.Place), ranked by the Bayesian score
+    qs = (
+        Place.objects
+        .filter(review_count__gt=0)
+        .select_related("area")
+        .order_by("-bayesian_rating", "-review_count")
+    )[:MAX_RESULTS]
+    return Reply(
+        "No places with reviews found.",
+        title="Top places by rating:",
+        items=[place_item(p) for p in qs],
+        render=format_place_detail,
+        text_limit=10,
+    )
+
+
+@handles("all_places")
+def all_places(query):
+    qs = Place.objects.select_related("area").order_by("id")[:MAX_RESULTS]
+    return Reply(
+        "No places found.",
+        title="All places:",
+        items=[place_item(p) for p in qs],
+        render=format_place_summary,
+        text_limit=50,
+    )
+
+
+@handles("all_services")
+def all_services(query):
+    label, _ = SERVICE_REPLIES[query.category]
+    qs = (
+        Service.objects
+        .filter(category=query.category)
+        .select_related("area")
+    )[:MAX_RESULTS]
+    return Reply(
+        f"No {label} found.",
+        title=f"All {label}:",
+        items=[service_item(s) for s in qs],
+        render=format_service_detail,
+        text_limit=20,
+    )
+
+
+@handles("services_near")
+def services_near(query):
+    label, example = SERVICE_REPLIES[query.category]
+    if not query.area:
+        return Reply(f"Please specify an area after 'near', e.g. '{example} near Dhanmondi'.")
+    qs = (
+        Service.objects
+        .filter(category=query.category, area_id__in=resolve_area(query.area))
+        .select_related("area")
+    )[:MAX_RESULTS]
+    return Reply(
+        f"No {label} found near {query.area}.",
+        title=f"{label[0].upper()}{label[1:]} near {query.area}:",
+        items=[service_item(s) for s in qs],
+        render=format_service_detail,
+        text_limit=10,
+    )
+
+
+@handles("places_near")
+def places_near(query):
+    if not query.area:
+        return Reply("Please specify an area after 'near', e.g. 'places near Dhanmondi'.")
+    qs = (
+        Place.objects
+        .filter(area_id__in=resolve_area(query.area))
+        .select_related("area")
+        .order_by("-bayesian_rating", "-review_count")
+    )[:MAX_RESULTS]
+    return Reply(
+        f"No places found near {query.area}.",
+        title=f"Places near {query.area}:",
+        items=[place_item(p) for p in qs],
+        render=format_place_detail,
+        text_limit=10,
+    )
+
+
+@handles("fallback")
+def fallback(query):
+    return Reply(
+        "Sorry, I didn't understand. Try commands like:\n"
+        + COMMANDS_TEXT
+        + "- all hospitals / all atms / all pharmacies / all police / all transport\n"
+        "- show history"
+    )
@@ -0,0 +1,63 @@
+# chatbot/reply_cache.py
+"""
+Cache of chatbot replies (``chatbot.replies.Reply`` objects).
+
+"top places", "all hospitals", "atm near gulshan" ... are pure functions
+of the Place / Service / Review / Area tables, so a reply is cached per
+process under its normalised ``Query`` in a bounded LRU. Entries carry
+the data version they were built at; chatbot.signals bumps that version
+(in the shared cache, so all workers see it) after every committed
+change to one of those tables, which makes every older entry a miss.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = "chatbot:replies:version"
+CACHE_SIZE = getattr(settings, "CHATBOT_REPLY_CACHE_SIZE", 256)
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+
+
+def data_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # start from the clock, not 0, so a flushed or evicted stamp can't
+        # make entries built before the flush look current again
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_or_build(key, build):
+    version = data_version()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == version:
+            _entries.move_to_end(key)
+            return entry[1]
+
+    reply = build()
+    with _lock:
+        _entries[key] = (version, reply)
+        _entries.move_to_end(key)
+        while len(_entries) > CACHE_SIZE:
+            _entries.popitem(last=False)
+    return reply
+
+
+def invalidate():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def clear():
+    """Drop this process's entries (tests)."""
+    with _lock:
+        _entries.clear()
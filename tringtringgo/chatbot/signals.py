@@ -0,0 +1,44 @@
+# chatbot/signals.py
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from travel.models import Area, Place, Review, Service
+from . import history, reply_cache
+from .gazetteer import invalidate
+
+
+# ---------- area gazetteer ----------
+
+
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+def refresh_gazetteer(sender, **kwargs):
+    # after commit, like expire_replies below
+    transaction.on_commit(invalidate)
+
+
+# ---------- cached replies (chatbot/reply_cache.py) ----------
+
+
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def expire_replies(sender, **kwargs):
+    # after commit, or a reply built from pre-commit rows in the meantime
+    # would be cached under the new version
+    transaction.on_commit(reply_cache.invalidate)
+
+
+# ---------- history logging (chatbot/history.py) ----------
+
+
+@receiver(request_finished)
+def flush_history(sender, **kwargs):
+    history.flush_if_due()
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+
+from community.models import CommunityPost, CommunityComment, CommunityReaction
+
+COUNTER_FIELDS = ["comments_count", "likes_count", "dislikes_count"]
+
+
+def _counts(queryset):
+    return {
+        row["post_id"]: row["n"]
+        for row in queryset.values("post_id").order_by().annotate(n=models.Count("id"))
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount CommunityPost comment/like/dislike counters from the comment "
+        "and reaction tables and fix any that drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted posts.",
+        )
+
+    def handle(self, *args, **options):
+        actual = {
+            "comments_count": _counts(CommunityComment.objects.all()),
+            "likes_count": _counts(CommunityReaction.objects.filter(reaction="LIKE")),
+            "dislikes_count": _counts(CommunityReaction.objects.filter(reaction="DISLIKE")),
+        }
+
+        drifted = []
+        for post in CommunityPost.objects.only("id", *COUNTER_FIELDS).iterator():
+            expected = {name: counts.get(post.id, 0) for name, counts in actual.items()}
+            if any(getattr(post, name) != value for name, value in expected.items()):
+                for name, value in expected.items():
+                    setattr(post, name, value)
+                drifted.append(post)
+
+        if drifted and not options["dry_run"]:
+            with transaction.atomic():
+                CommunityPost.objects.bulk_update(drifted, COUNTER_FIELDS, batch_size=500)
+
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drifted)} drifted posts."))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:05
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def _count(model, **filters):
+    return Coalesce(
+        models.Subquery(
+            model.objects.filter(post=models.OuterRef("pk"), **filters)
+            .order_by()
+            .values("post")
+            .annotate(n=models.Count("id"))
+            .values("n")[:1]
+        ),
+        0,
+    )
+
+
+def fill_post_counters(apps, schema_editor):
+    # the counter columns existed from 0001 but nothing maintained them
+    CommunityPost = apps.get_model("community", "CommunityPost")
+    CommunityComment = apps.get_model("community", "CommunityComment")
+    CommunityReaction = apps.get_model("community", "CommunityReaction")
+
+    CommunityPost.objects.update(
+        comments_count=_count(CommunityComment),
+        likes_count=_count(CommunityReaction, reaction="LIKE"),
+        dislikes_count=_count(CommunityReaction, reaction="DISLIKE"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_post_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_usersettings'),
+        ('community', '0002_fill_post_counters'),
+        ('travel', '0015_place_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='communitypost',
+            index=models.Index(fields=['area', 'category', '-created_at'], name='post_area_cat_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='communitypost',
+            index=models.Index(fields=['category', '-created_at'], name='post_category_created_idx'),
+        ),
+    ]
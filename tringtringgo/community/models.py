@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Greatest
 from accounts.models import UserAccount
 from travel.models import Area
 
@@ -35,10 +36,38 @@ class CommunityPost(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # community/posts/ feed filters, newest first
+            models.Index(
+                fields=["area", "category", "-created_at"],
+                name="post_area_cat_created_idx",
+            ),
+            models.Index(
+                fields=["category", "-created_at"],
+                name="post_category_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.get_category_display()})"
 
+    @classmethod
+    def bump_counters(cls, post_id, comments=0, likes=0, dislikes=0):
+        """Atomically add the given deltas to the cached counters."""
+        updates = {}
+        for field, delta in (
+            ("comments_count", comments),
+            ("likes_count", likes),
+            ("dislikes_count", dislikes),
+        ):
+            if delta > 0:
+                updates[field] = models.F(field) + delta
+            elif delta < 0:
+                # never below zero, even if the counter had drifted
+                updates[field] = Greatest(models.F(field) + delta, 0)
+        if updates:
+            cls.objects.filter(pk=post_id).update(**updates)
+
 
 class CommunityComment(models.Model):
     post = models.ForeignKey(
@@ -83,5 +112,12 @@ class CommunityReaction(models.Model):
     class Meta:
         unique_together = ("post", "user")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # what the post counters currently count for this reaction
+        instance._counted_reaction = instance.__dict__.get("reaction")
+        return instance
+
     def __str__(self):
         return f"{self.user.user.username} {self.reaction} {self.post.id}"
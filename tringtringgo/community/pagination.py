@@ -0,0 +1,16 @@
+# community/pagination.py
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class CommunityFeedCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the community feed: ?cursor=<opaque>&limit=N.
+    Newest first on (created_at, id), so posts created while a reader is
+    paging never shift or repeat items on later pages.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = getattr(settings, "COMMUNITY_FEED_PAGE_SIZE", 20)
+    page_size_query_param = "limit"
+    max_page_size = getattr(settings, "COMMUNITY_FEED_MAX_PAGE_SIZE", 50)
@@ -0,0 +1,41 @@
+# community/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CommunityPost, CommunityComment, CommunityReaction
+
+COUNTER_FOR_REACTION = {"LIKE": "likes", "DISLIKE": "dislikes"}
+
+
+# ---------- cached CommunityPost counters ----------
+
+
+@receiver(post_save, sender=CommunityComment)
+def count_comment(sender, instance, created, **kwargs):
+    if created:
+        CommunityPost.bump_counters(instance.post_id, comments=1)
+
+
+@receiver(post_delete, sender=CommunityComment)
+def uncount_comment(sender, instance, **kwargs):
+    CommunityPost.bump_counters(instance.post_id, comments=-1)
+
+
+@receiver(post_save, sender=CommunityReaction)
+def count_reaction(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, "_counted_reaction", None)
+    if not created and (previous is None or previous == instance.reaction):
+        # unchanged, or not loaded from the DB (recount_community_counters fixes that)
+        return
+
+    deltas = {COUNTER_FOR_REACTION[instance.reaction]: 1}
+    if previous is not None:
+        deltas[COUNTER_FOR_REACTION[previous]] = -1
+    CommunityPost.bump_counters(instance.post_id, **deltas)
+    instance._counted_reaction = instance.reaction
+
+
+@receiver(post_delete, sender=CommunityReaction)
+def uncount_reaction(sender, instance, **kwargs):
+    reaction = getattr(instance, "_counted_reaction", None) or instance.reaction
+    CommunityPost.bump_counters(instance.post_id, **{COUNTER_FOR_REACTION[reaction]: -1})
@@ -1,7 +1,7 @@
 from statistics import mode
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
-from django.contrib.auth.models import User
 
 from httpx import request
 from rest_framework.decorators import api_view, permission_classes
@@ -12,91 +12,84 @@ from rest_framework import status
 from accounts.models import UserAccount
 from travel.models import Area
 from .models import CommunityPost, CommunityComment, CommunityReaction
-from accounts.models import UserAccount, AdminProfile
+from .pagination import CommunityFeedCursorPagination
+from accounts.authentication import identity_from_request
+from core.replicas import read_from_replica
 from rest_framework import status
 
 
 
 
+def _post_to_dict(post):
+    """Feed representation; counters come from the cached columns."""
+    return {
+        "id": post.id,
+        "title": post.title,
+        "category": post.category,
+        "category_label": post.get_category_display(),
+        "area": post.area.name if post.area else None,
+        "area_id": post.area_id,
+        "description": post.description,
+        "created_at": post.created_at.isoformat(),
+        "author": post.author.user.username,
+        "comments_count": post.comments_count,
+        "likes_count": post.likes_count,
+        "dislikes_count": post.dislikes_count,
+    }
+
+
+def _counters(post_id):
+    return CommunityPost.objects.filter(pk=post_id).values(
+        "comments_count", "likes_count", "dislikes_count"
+    ).get()
+
+
 # Helper function to get Admin from token
 def get_admin_from_token(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return None, Response(
-            {"detail": "Not logged in."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
+    identity, error = identity_from_request(request)
+    if error:
+        return None, error
 
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return None, Response(
-            {"detail": "Invalid user token."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
-
-    try:
-        account = UserAccount.objects.get(user=user)
-    except UserAccount.DoesNotExist:
+    if identity.account is None:
         return None, Response(
             {"detail": "User account not found."},
             status=status.HTTP_401_UNAUTHORIZED,
         )
 
-    if account.role != "ADMIN":
+    if identity.role != "ADMIN":
         return None, Response(
             {"detail": "Admin access only"},
             status=status.HTTP_403_FORBIDDEN,
         )
 
-    try:
-        admin_profile = account.admin_profile
-    except AdminProfile.DoesNotExist:
+    if identity.admin_profile_id is None:
         return None, Response(
             {"detail": "Admin profile not found."},
             status=status.HTTP_403_FORBIDDEN,
         )
 
-    if not admin_profile.area:
+    if identity.admin_area_id is None:
         return None, Response(
             {"detail": "Admin has no area assigned."},
             status=status.HTTP_403_FORBIDDEN,
         )
 
-    return admin_profile, None
+    return identity, None
 
 # View to get posts for admin's area
 @csrf_exempt
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def admin_area_posts(request):
-    admin_profile, error_resp = get_admin_from_token(request)
+    admin, error_resp = get_admin_from_token(request)
     if error_resp:
         return error_resp
 
-    area = admin_profile.area
-
-    qs = CommunityPost.objects.filter(area=area).select_related(
+    qs = CommunityPost.objects.filter(area_id=admin.admin_area_id).select_related(
         "author__user", "area"
     )
 
-    data = [
-        {
-            "id": post.id,
-            "title": post.title,
-            "category": post.category,
-            "category_label": post.get_category_display(),
-            "area": post.area.name if post.area else None,
-            "area_id": post.area.id if post.area else None,
-            "description": post.description,
-            "created_at": post.created_at.isoformat(),
-            "author": post.author.user.username,
-            "comments_count": post.comments.count(),
-            "likes_count": post.reactions.filter(reaction="LIKE").count(),
-            "dislikes_count": post.reactions.filter(reaction="DISLIKE").count(),
-        }
-        for post in qs
-    ]
+    data = [_post_to_dict(post) for post in qs]
 
     return Response(data)
 
@@ -105,13 +98,11 @@ def admin_area_posts(request):
 @api_view(["DELETE"])
 @permission_classes([AllowAny])
 def admin_delete_post(request, post_id):
-    admin_profile, error_resp = get_admin_from_token(request)
+    admin, error_resp = get_admin_from_token(request)
     if error_resp:
         return error_resp
 
-    area = admin_profile.area
-
-    post = get_object_or_404(CommunityPost, id=post_id, area=area)
+    post = get_object_or_404(CommunityPost, id=post_id, area_id=admin.admin_area_id)
     post.delete()
 
     return Response(
@@ -124,18 +115,17 @@ def admin_delete_post(request, post_id):
 @api_view(["DELETE"])
 @permission_classes([AllowAny])
 def admin_delete_comment(request, comment_id):
-    admin_profile, error_resp = get_admin_from_token(request)
+    admin, error_resp = get_admin_from_token(request)
     if error_resp:
         return error_resp
 
-    area = admin_profile.area
-
     comment = get_object_or_404(
         CommunityComment,
         id=comment_id,
-        post__area=area,
+        post__area_id=admin.admin_area_id,
     )
-    comment.delete()
+    with transaction.atomic():
+        comment.delete()
 
     return Response(
         {"detail": "Comment deleted."},
@@ -145,36 +135,30 @@ def admin_delete_comment(request, comment_id):
 
 # Helper function to get UserAccount from token
 def get_account_from_token(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return None, Response(
-            {"detail": "Not logged in."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
+    identity, error = identity_from_request(request)
+    if error:
+        return None, error
 
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
-        return None, Response(
-            {"detail": "Invalid user token."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
-
-    try:
-        account = UserAccount.objects.get(user=user)
-    except UserAccount.DoesNotExist:
+    if identity.account is None:
         return None, Response(
             {"detail": "User account not found."},
             status=status.HTTP_401_UNAUTHORIZED,
         )
 
-    return account, None
+    return identity.account, None
 
 # View to handle community posts
+@read_from_replica
 @csrf_exempt
 @api_view(["GET", "POST"])
 @permission_classes([AllowAny])
 def community_posts(request):
+    """
+    GET: cursor-paginated feed, newest first.
+
+    ?category=...&area_id=... filters, ?limit=N (capped by
+    COMMUNITY_FEED_MAX_PAGE_SIZE) and ?cursor=... for the next page.
+    """
     if request.method == "GET":
         category = request.GET.get("category")
         area_id = request.GET.get("area_id")
@@ -194,29 +178,9 @@ def community_posts(request):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        data = []
-        for post in qs:
-            comments_count = post.comments.count()
-            likes_count = post.reactions.filter(reaction="LIKE").count()
-            dislikes_count = post.reactions.filter(reaction="DISLIKE").count()
-
-            data.append(
-                {
-                    "id": post.id,
-                    "title": post.title,
-                    "category": post.category,
-                    "category_label": post.get_category_display(),
-                    "area": post.area.name if post.area else None,
-                    "area_id": post.area.id if post.area else None,
-                    "description": post.description,
-                    "created_at": post.created_at.isoformat(),
-                    "author": post.author.user.username,
-                    "comments_count": comments_count,
-                    "likes_count": likes_count,
-                    "dislikes_count": dislikes_count,
-                }
-            )
-        return Response(data)
+        paginator = CommunityFeedCursorPagination()
+        page = paginator.paginate_queryset(qs, request)
+        return paginator.get_paginated_response([_post_to_dict(post) for post in page])
 
     # POST: create new post (traveler only)
     account, error_resp = get_account_from_token(request)
@@ -267,28 +231,7 @@ def community_posts(request):
         description=description,
     )
 
-    # compute counts on the fly
-    comments_count = post.comments.count()
-    likes_count = post.reactions.filter(reaction="LIKE").count()
-    dislikes_count = post.reactions.filter(reaction="DISLIKE").count()
-
-    return Response(
-        {
-            "id": post.id,
-            "title": post.title,
-            "category": post.category,
-            "category_label": post.get_category_display(),
-            "area": post.area.name if post.area else None,
-            "area_id": post.area.id if post.area else None,
-            "description": post.description,
-            "created_at": post.created_at.isoformat(),
-            "author": post.author.user.username,
-            "comments_count": comments_count,
-            "likes_count": likes_count,
-            "dislikes_count": dislikes_count,
-        },
-        status=status.HTTP_201_CREATED,
-    )
+    return Response(_post_to_dict(post), status=status.HTTP_201_CREATED)
 
 
 @csrf_exempt
@@ -311,27 +254,9 @@ def community_post_detail(request, post_id):
         for c in comments_qs
     ]
 
-    comments_count = len(comments)
-    likes_count = post.reactions.filter(reaction="LIKE").count()
-    dislikes_count = post.reactions.filter(reaction="DISLIKE").count()
-
-    return Response(
-        {
-            "id": post.id,
-            "title": post.title,
-            "category": post.category,
-            "category_label": post.get_category_display(),
-            "area": post.area.name if post.area else None,
-            "area_id": post.area.id if post.area else None,
-            "description": post.description,
-            "created_at": post.created_at.isoformat(),
-            "author": post.author.user.username,
-            "comments_count": comments_count,
-            "likes_count": likes_count,
-            "dislikes_count": dislikes_count,
-            "comments": comments,
-        }
-    )
+    data = _post_to_dict(post)
+    data["comments"] = comments
+    return Response(data)
 
 
 @csrf_exempt
@@ -356,13 +281,14 @@ def community_add_comment(request, post_id):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    comment = CommunityComment.objects.create(
-        post=post,
-        author=account,
-        text=text,
-    )
-
-    comments_count = post.comments.count()
+    # comments_count is bumped by community.signals in the same transaction
+    with transaction.atomic():
+        comment = CommunityComment.objects.create(
+            post=post,
+            author=account,
+            text=text,
+        )
+        comments_count = _counters(post.id)["comments_count"]
 
     return Response(
         {
@@ -398,28 +324,30 @@ def community_react(request, post_id):
 
     post = get_object_or_404(CommunityPost, id=post_id)
 
-    try:
-        react_obj = CommunityReaction.objects.get(post=post, user=account)
-        if react_obj.reaction == reaction_type:
-            react_obj.delete()
-        else:
-            react_obj.reaction = reaction_type
-            react_obj.save()
-    except CommunityReaction.DoesNotExist:
-        CommunityReaction.objects.create(
-            post=post,
-            user=account,
-            reaction=reaction_type,
-        )
-
-    likes = CommunityReaction.objects.filter(
-        post=post, reaction="LIKE"
-    ).count()
-    dislikes = CommunityReaction.objects.filter(
-        post=post, reaction="DISLIKE"
-    ).count()
+    # likes/dislikes counters are kept by community.signals: a new reaction
+    # adds one, repeating it removes it, switching moves it across
+    with transaction.atomic():
+        try:
+            react_obj = CommunityReaction.objects.select_for_update().get(
+                post=post, user=account
+            )
+            if react_obj.reaction == reaction_type:
+                react_obj.delete()
+            else:
+                react_obj.reaction = reaction_type
+                react_obj.save()
+        except CommunityReaction.DoesNotExist:
+            CommunityReaction.objects.create(
+                post=post,
+                user=account,
+                reaction=reaction_type,
+            )
+        counters = _counters(post.id)
 
     return Response(
-        {"likes_count": likes, "dislikes_count": dislikes},
+        {
+            "likes_count": counters["likes_count"],
+            "dislikes_count": counters["dislikes_count"],
+        },
         status=status.HTTP_200_OK,
     )
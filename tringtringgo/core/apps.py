@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
@@ -6,3 +7,7 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         from . import firebase_admin_setup  # ensures Firebase Admin is initialized
+        from . import checks, signals  # noqa: F401
+        from .db import configure_sqlite
+
+        connection_created.connect(configure_sqlite, dispatch_uid="core.configure_sqlite")
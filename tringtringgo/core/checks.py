@@ -0,0 +1,28 @@
+# core/checks.py
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+PER_PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Cache invalidation (identities, reference-data versions, chatbot
+    versions, replica pins) only reaches other workers through a shared
+    cache.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend in PER_PROCESS_CACHES:
+        return [
+            Error(
+                "The default cache is per process, so invalidations don't "
+                "reach the other workers.",
+                hint="Set CACHE_REDIS_URL or MEMCACHED_LOCATION.",
+                id="core.E001",
+            )
+        ]
+    return []
@@ -0,0 +1,19 @@
+# core/db.py
+"""
+Per-connection database tuning.
+
+``configure_sqlite`` is connected to ``connection_created`` in
+CoreConfig.ready() and applies ``settings.SQLITE_PRAGMAS`` to each new
+SQLite connection. Other backends are left alone; their pooling and
+persistent connections are configured in settings.DATABASES.
+"""
+from django.conf import settings
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,119 @@
+# core/http_cache.py
+"""
+Conditional GET for slowly changing reference data (areas, services,
+places, merchants).
+
+Every model a reference view reads from has a version stamp in the
+shared cache: the time of its last change, bumped by core.signals once
+the writing transaction has committed.
+``reference_data(*models)`` derives the ETag and Last-Modified of the
+view from those stamps only, so a client holding the current copy gets
+a 304 without a single database query. Responses also carry a public
+Cache-Control, so a CDN can serve them for REFERENCE_DATA_SHARED_MAX_AGE.
+
+The rendered 200 bodies are kept in the shared cache as well, keyed by
+that same ETag: any client without the current copy is served the bytes
+without querying or serializing. A change to one of the models changes
+the ETag, so stale bodies are never read again and just expire after
+REFERENCE_DATA_CACHE_TTL. Bodies are always rendered from ``default``,
+even under @read_from_replica: a lagging replica's rows must not be
+cached as the current version.
+
+Writes that skip signals (``update()``, ``bulk_update()``) must call
+``bump(model)`` themselves.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from . import replicas
+
+MAX_AGE = getattr(settings, "REFERENCE_DATA_MAX_AGE", 0)
+SHARED_MAX_AGE = getattr(settings, "REFERENCE_DATA_SHARED_MAX_AGE", 60)
+CACHE_TTL = getattr(settings, "REFERENCE_DATA_CACHE_TTL", 600)
+# headers replayed with a cached body
+CACHED_HEADERS = ("Content-Type", "Vary", "Allow")
+
+
+def _key(model):
+    return f"http:version:{model._meta.label_lower}"
+
+
+def bump(model):
+    """
+    Move ``model``'s stamp once the current transaction commits. Moving it
+    earlier would let a concurrent GET read the pre-commit rows and label
+    them with the new ETag, which then stays "current" indefinitely.
+    """
+    transaction.on_commit(lambda: cache.set(_key(model), time.time_ns(), None))
+
+
+def versions(models):
+    """model label -> version stamp (ns), starting any missing stamp now."""
+    keys = [_key(model) for model in models]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        # like the chatbot reply cache: a flushed stamp restarts from the
+        # clock, so it can never match a copy served before the flush
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, None)
+        found.update(cache.get_many(missing))
+    return [found[key] for key in keys]
+
+
+def reference_data(*models):
+    """
+    Decorator for GET views whose response depends only on the URL, the
+    Accept header and the rows of ``models``. Goes outside @api_view.
+    """
+
+    def etag(request, *args, **kwargs):
+        # computed once per request: condition() and the body cache both need it
+        if not hasattr(request, "_reference_etag"):
+            stamps = ".".join(str(v) for v in versions(models))
+            accept = request.headers.get("Accept", "")
+            request._reference_etag = hashlib.sha1(
+                f"{request.build_absolute_uri()}|{accept}|{stamps}".encode()
+            ).hexdigest()
+        return request._reference_etag
+
+    def last_modified(request, *args, **kwargs):
+        return datetime.fromtimestamp(max(versions(models)) / 1e9, tz=timezone.utc)
+
+    def decorator(view):
+        @wraps(view)
+        def cached_view(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            key = f"http:response:{etag(request)}"
+            hit = cache.get(key)
+            if hit is not None:
+                content, headers = hit
+                return HttpResponse(content, headers=headers)
+
+            # the body is stored under the current stamps, so it has to be
+            # built from committed rows, not from a replica that may lag
+            replicas.read_from_default(request)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                if hasattr(response, "render"):
+                    response.render()
+                headers = {h: response[h] for h in CACHED_HEADERS if response.has_header(h)}
+                cache.set(key, (response.content, headers), CACHE_TTL)
+            return response
+
+        conditional = condition(etag_func=etag, last_modified_func=last_modified)(cached_view)
+        return cache_control(public=True, max_age=MAX_AGE, s_maxage=SHARED_MAX_AGE)(conditional)
+
+    return decorator
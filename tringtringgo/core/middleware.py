@@ -0,0 +1,20 @@
+# core/middleware.py
+from . import replicas
+
+
+class ReplicaPinMiddleware:
+    """
+    Starts each request with fresh replica-routing state and, if the
+    request wrote to the database, pins the client to the primary for a
+    few seconds (see core/replicas.py).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        replicas.begin_request()
+        response = self.get_response(request)
+        if replicas.wrote() and replicas.replica_aliases():
+            replicas.pin(request)
+        return response
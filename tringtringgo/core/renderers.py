@@ -0,0 +1,27 @@
+# core/renderers.py
+"""
+JSON renderer backed by orjson, when it is installed.
+
+Output matches rest_framework.renderers.JSONRenderer (compact, UTF-8);
+values orjson can't encode natively (Decimal, lazy translations, ...)
+go through DRF's own encoder. Without orjson, or when an indented
+response is asked for, it simply is DRF's JSONRenderer.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=self.encoder.default, option=orjson.OPT_NON_STR_KEYS)
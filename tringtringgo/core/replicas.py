@@ -0,0 +1,128 @@
+# core/replicas.py
+"""
+Read-replica routing.
+
+Reads go to ``default`` unless a view opts in with ``@read_from_replica``;
+then the GET/HEAD reads of that request use one of
+``settings.DATABASE_REPLICAS``. Writes always go to ``default``.
+
+Read-your-writes: once a request writes (``ReplicaRouter.db_for_write``),
+the rest of it reads from ``default``, and ReplicaPinMiddleware pins the
+client (X-User-Token, else session, else IP) to ``default`` for
+``REPLICA_PIN_SECONDS`` so e.g. a review shows up right after
+create_review even if the replica lags.
+
+With no replicas configured every function here is a no-op.
+"""
+import hashlib
+import random
+from functools import wraps
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import cache
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_state = Local()
+
+
+def replica_aliases():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def pin_seconds():
+    return getattr(settings, "REPLICA_PIN_SECONDS", 5)
+
+
+# ---------- read-your-writes pinning ----------
+
+
+def client_key(request):
+    client = (
+        request.headers.get("X-User-Token")
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or request.META.get("REMOTE_ADDR", "")
+    )
+    return "db:pin:" + hashlib.sha1(client.encode()).hexdigest()
+
+
+def pin(request):
+    cache.set(client_key(request), True, pin_seconds())
+
+
+def is_pinned(request):
+    return bool(cache.get(client_key(request)))
+
+
+def begin_request():
+    _state.replica = None
+    _state.wrote = False
+
+
+def wrote():
+    return getattr(_state, "wrote", False)
+
+
+# ---------- view decorator ----------
+
+
+def read_from_default(request):
+    """
+    Make ``@read_from_replica`` leave this request on ``default``, e.g.
+    because its response is cached as current (core/http_cache.py).
+    """
+    request._read_from_default = True
+
+
+def read_from_replica(view):
+    """
+    Serve the safe-method reads of ``view`` from a replica, unless the
+    caller wrote recently. Goes outside @api_view / @csrf_exempt.
+    """
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        aliases = replica_aliases()
+        if (
+            request.method not in SAFE_METHODS
+            or not aliases
+            or getattr(request, "_read_from_default", False)
+            or is_pinned(request)
+        ):
+            return view(request, *args, **kwargs)
+
+        previous = getattr(_state, "replica", None)
+        _state.replica = random.choice(aliases)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _state.replica = previous
+
+    return wrapped
+
+
+# ---------- router ----------
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if wrote():
+            return "default"
+        return getattr(_state, "replica", None)
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {"default", *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replicas are copies of default, never migrated directly
+        if db in replica_aliases():
+            return False
+        return None
@@ -0,0 +1,168 @@
+# core/serializers.py
+"""
+Read-only "flat" fast path for list endpoints.
+
+A ``ModelSerializer`` builds a model instance per row and then walks its
+fields one by one for every item. For big read-only lists the
+``FlatSerializerMixin`` gives the same output from ``values()`` rows:
+
+    flat = ServiceSerializer.flat(context={"request": request})
+    data = flat.data(qs)                      # == ServiceSerializer(qs, many=True).data
+
+    rows = flat.values(qs, "name")            # extra columns, e.g. for a cursor
+    page = paginator.paginate_queryset(rows, request)
+    data = flat.to_representation(page)
+
+The plan (which column feeds which key, and how it is converted) is
+derived from the serializer's own fields when ``flat()`` is called:
+
+- ``source="area.name"`` reads the joined column ``area__name``
+- ``source="get_category_display"`` maps ``category`` through its choices
+  (and, like DRF, leaves the key out when the place has no area)
+- a nested serializer (``sender = UserShortSerializer()``) reads
+  ``sender__id``, ``sender__username`` ... into a sub-dict (None when
+  the foreign key is null)
+- plain strings, numbers, booleans and foreign keys are used as they
+  come from the database; anything else (dates, times, files) still goes
+  through the field's ``to_representation``
+
+SerializerMethodFields and ``many=True`` fields can't be flattened;
+``flat()`` raises ImproperlyConfigured for them, so trim them with
+``fields=`` (see travel.serializers.SparseFieldsMixin) or keep the
+regular serializer for those requests. tests/test_flat_serializers.py
+checks parity with the regular serializers.
+"""
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from rest_framework import serializers
+
+# DRF fields whose to_representation() doesn't change a database value
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _model_field(model, path):
+    """The model field at the end of a ``__`` lookup path, or None."""
+    field = None
+    for name in path.split("__"):
+        if model is None:
+            return None
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model
+    return field
+
+
+class FlatSerializer:
+    """Built by ``FlatSerializerMixin.flat()``; see the module docstring."""
+
+    def __init__(self, serializer, prefix="", lookups=None):
+        # nested serializers share the root's lookups: one values() row
+        self.lookups = [] if lookups is None else lookups
+        # (key, lookup, convert, guards): convert is None for a passthrough,
+        # a callable, or a nested FlatSerializer keyed on the related pk;
+        # guards are nullable relations the source goes through
+        self.plan = self._plan(serializer, prefix)
+
+    def _plan(self, serializer, prefix):
+        model = serializer.Meta.model
+        plan = []
+        for key, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, (serializers.SerializerMethodField, serializers.ListSerializer,
+                                  serializers.ManyRelatedField)):
+                raise ImproperlyConfigured(
+                    f"{type(serializer).__name__}.{key} can't be flattened."
+                )
+
+            source = field.source.replace(".", "__")
+            if isinstance(field, serializers.BaseSerializer):
+                pk_lookup = f"{prefix}{source}__{field.Meta.model._meta.pk.name}"
+                self.lookups.append(pk_lookup)
+                nested = FlatSerializer(field, prefix=f"{prefix}{source}__", lookups=self.lookups)
+                plan.append((key, pk_lookup, nested, ()))
+                continue
+
+            display = source.startswith("get_") and source.endswith("_display")
+            if display:
+                source = source[len("get_"):-len("_display")]
+            lookup = prefix + source
+            self.lookups.append(lookup)
+            guards = self._guards(field, model, source, prefix)
+            self.lookups.extend(guards)
+            convert = self._converter(field, _model_field(model, source), display)
+            plan.append((key, lookup, convert, guards))
+        return plan
+
+    @staticmethod
+    def _guards(field, model, source, prefix):
+        """
+        DRF leaves a read-only field out when its dotted source hits a
+        null relation (``area.name`` of a place without an area); these
+        are the relation columns to check for that.
+        """
+        if field.allow_null or field.default is not serializers.empty:
+            return ()
+        parts = source.split("__")
+        hops = ["__".join(parts[:i]) for i in range(1, len(parts))]
+        return tuple(
+            prefix + hop
+            for hop in hops
+            if getattr(_model_field(model, hop), "null", False)
+        )
+
+    @staticmethod
+    def _converter(field, model_field, display):
+        if display:
+            choices = dict(model_field.flatchoices)
+            return lambda value: str(choices.get(value, value))
+        if isinstance(field, serializers.FloatField):
+            return float
+        if isinstance(field, PASSTHROUGH_FIELDS):
+            return None
+        if isinstance(model_field, models.FileField):
+            # values() gives the file name; the field expects a FieldFile
+            return lambda value: field.to_representation(
+                model_field.attr_class(None, model_field, value)
+            )
+        return field.to_representation
+
+    def values(self, queryset, *extra):
+        """``queryset.values()`` with every column the plan reads, plus ``extra``."""
+        return queryset.values(*dict.fromkeys([*self.lookups, *extra]))
+
+    def _row(self, row):
+        item = {}
+        for key, lookup, convert, guards in self.plan:
+            if guards and any(row[guard] is None for guard in guards):
+                continue
+            value = row[lookup]
+            if isinstance(convert, FlatSerializer):
+                item[key] = None if value is None else convert._row(row)
+            elif value is None or convert is None:
+                item[key] = value
+            else:
+                item[key] = convert(value)
+        return item
+
+    def to_representation(self, rows):
+        return [self._row(row) for row in rows]
+
+    def data(self, queryset):
+        return self.to_representation(self.values(queryset))
+
+
+class FlatSerializerMixin:
+    """Adds ``Serializer.flat(**kwargs)``: a FlatSerializer for this serializer."""
+
+    @classmethod
+    def flat(cls, **kwargs):
+        return FlatSerializer(cls(**kwargs))
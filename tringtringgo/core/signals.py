@@ -0,0 +1,40 @@
+# core/signals.py
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import MerchantProfile
+from travel.models import Area, Place, Review, Service
+from . import http_cache
+
+User = get_user_model()
+
+
+# ---------- reference data versions (core/http_cache.py) ----------
+
+# http_cache.bump() defers the stamp to transaction.on_commit, so a body
+# cached under the new version can't hold pre-commit rows
+
+
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=MerchantProfile)
+@receiver(post_delete, sender=MerchantProfile)
+def bump_reference_version(sender, **kwargs):
+    http_cache.bump(sender)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_user_version(sender, update_fields=None, **kwargs):
+    # only usernames are shown (merchant owners, reviewers); logins save
+    # last_login alone and shouldn't expire anything
+    if update_fields is not None and "username" not in update_fields:
+        return
+    http_cache.bump(sender)
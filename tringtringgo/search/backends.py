@@ -0,0 +1,195 @@
+# search/backends.py
+"""
+Full-text search backends.
+
+All backends store rows in SearchDocument; they differ in how they
+index and query them:
+
+- SQLiteFTSBackend   FTS5 virtual table mirrored by rowid, bm25 ranking
+- PostgresSearchBackend  GIN index over a weighted tsvector, ts_rank_cd
+- LikeSearchBackend  icontains fallback for anything else
+
+``get_backend()`` picks one from ``settings.SEARCH_BACKEND`` (dotted path)
+or, if unset, from the database vendor.
+"""
+import re
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import SearchDocument
+
+MAX_TERMS = 8
+
+
+def query_terms(query):
+    """Lower-cased word tokens; everything else (quotes, operators) is dropped."""
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+class BaseSearchBackend(ABC):
+    def index(self, kind, object_id, title, body="", area_name="", area_id=None):
+        doc, _ = SearchDocument.objects.update_or_create(
+            kind=kind,
+            object_id=object_id,
+            defaults={
+                "title": title[:255],
+                "body": body,
+                "area_name": area_name,
+                "area_id": area_id,
+            },
+        )
+        return doc
+
+    def remove(self, kind, object_id):
+        SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+    def rebuild(self, documents):
+        """Replace the whole index with ``documents`` (unsaved SearchDocuments)."""
+        SearchDocument.objects.all().delete()
+        SearchDocument.objects.bulk_create(documents, batch_size=500)
+
+    @abstractmethod
+    def search(self, query, kinds=None, area_id=None, limit=20, offset=0):
+        """
+        Return SearchDocuments best match first, each with a ``score``
+        attribute (higher is better). Every term is prefix-matched.
+        """
+
+    @staticmethod
+    def _filters(kinds, area_id):
+        sql, params = [], []
+        if kinds:
+            sql.append("kind IN (%s)" % ", ".join(["%s"] * len(kinds)))
+            params.extend(kinds)
+        if area_id is not None:
+            sql.append("area_id = %s")
+            params.append(area_id)
+        return "".join(f" AND {clause}" for clause in sql), params
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    def search(self, query, kinds=None, area_id=None, limit=20, offset=0):
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        qs = SearchDocument.objects.all()
+        for term in terms:
+            qs = qs.filter(
+                Q(title__icontains=term) | Q(body__icontains=term) | Q(area_name__icontains=term)
+            )
+        if kinds:
+            qs = qs.filter(kind__in=kinds)
+        if area_id is not None:
+            qs = qs.filter(area_id=area_id)
+
+        docs = list(qs.order_by("title", "id")[offset:offset + limit])
+        for doc in docs:
+            doc.score = 1.0
+        return docs
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    table = "search_document_fts"
+    # bm25 column weights: title, body, area
+    weights = (10.0, 1.0, 4.0)
+
+    def index(self, kind, object_id, title, body="", area_name="", area_id=None):
+        with transaction.atomic():
+            doc = super().index(kind, object_id, title, body, area_name, area_id)
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [doc.id])
+                cursor.execute(
+                    f"INSERT INTO {self.table} (rowid, title, body, area) VALUES (%s, %s, %s, %s)",
+                    [doc.id, doc.title, doc.body, doc.area_name],
+                )
+        return doc
+
+    def remove(self, kind, object_id):
+        with transaction.atomic():
+            ids = list(
+                SearchDocument.objects.filter(kind=kind, object_id=object_id).values_list("id", flat=True)
+            )
+            if not ids:
+                return
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {self.table} WHERE rowid IN (%s)" % ", ".join(["%s"] * len(ids)),
+                    ids,
+                )
+            SearchDocument.objects.filter(id__in=ids).delete()
+
+    @transaction.atomic
+    def rebuild(self, documents):
+        super().rebuild(documents)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, body, area) "
+                f"SELECT id, title, body, area_name FROM {SearchDocument._meta.db_table}"
+            )
+
+    def search(self, query, kinds=None, area_id=None, limit=20, offset=0):
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        # '"dhan"* "lake"*' = every term, prefix-matched
+        match = " ".join(f'"{term}"*' for term in terms)
+        where, params = self._filters(kinds, area_id)
+        weights = ", ".join(str(w) for w in self.weights)
+        sql = (
+            f"SELECT d.*, -bm25({self.table}, {weights}) AS score "
+            f"FROM {self.table} JOIN {SearchDocument._meta.db_table} d ON d.id = {self.table}.rowid "
+            f"WHERE {self.table} MATCH %s{where} "
+            f"ORDER BY score DESC, d.id LIMIT %s OFFSET %s"
+        )
+        return list(SearchDocument.objects.raw(sql, [match, *params, limit, offset]))
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    # must match the expression of the GIN index in migration 0001
+    vector_sql = (
+        "(setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(area_name, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(body, '')), 'C'))"
+    )
+
+    def search(self, query, kinds=None, area_id=None, limit=20, offset=0):
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        where, params = self._filters(kinds, area_id)
+        sql = (
+            f"SELECT *, ts_rank_cd({self.vector_sql}, to_tsquery('simple', %s)) AS score "
+            f"FROM {SearchDocument._meta.db_table} "
+            f"WHERE {self.vector_sql} @@ to_tsquery('simple', %s){where} "
+            f"ORDER BY score DESC, id LIMIT %s OFFSET %s"
+        )
+        return list(SearchDocument.objects.raw(sql, [tsquery, tsquery, *params, limit, offset]))
+
+
+VENDOR_BACKENDS = {
+    "sqlite": SQLiteFTSBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        path = getattr(settings, "SEARCH_BACKEND", None)
+        if path:
+            backend_class = import_string(path)
+        else:
+            backend_class = VENDOR_BACKENDS.get(connection.vendor, LikeSearchBackend)
+        _backend = backend_class()
+    return _backend
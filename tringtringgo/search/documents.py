@@ -0,0 +1,75 @@
+# search/documents.py
+"""
+What gets indexed, and how each model turns into a SearchDocument.
+
+To make another model searchable, add a ``DocumentType`` to
+``DOCUMENT_TYPES``; signals and the rebuild command pick it up.
+"""
+from accounts.models import MerchantProfile
+from community.models import CommunityPost
+from travel.models import Place, Service
+
+
+class DocumentType:
+    def __init__(self, kind, model, area_field, indexed_fields, build):
+        self.kind = kind
+        self.model = model
+        # FK to travel.Area, used for area_name/area_id and area renames
+        self.area_field = area_field
+        # saves that only touch other fields (e.g. Place rating counters)
+        # don't need a reindex
+        self.indexed_fields = set(indexed_fields)
+        self._build = build
+
+    def document(self, obj):
+        """Return (title, body) for ``obj``."""
+        title, *body = self._build(obj)
+        return title, " ".join(part for part in body if part)
+
+    def area_of(self, obj):
+        return getattr(obj, self.area_field)
+
+    def queryset(self):
+        return self.model.objects.select_related(self.area_field)
+
+
+DOCUMENT_TYPES = {
+    t.kind: t
+    for t in [
+        DocumentType(
+            "place",
+            Place,
+            "area",
+            ["name", "address", "category", "area"],
+            lambda p: (p.name, p.get_category_display(), p.address),
+        ),
+        DocumentType(
+            "service",
+            Service,
+            "area",
+            ["name", "category", "address", "notes", "area"],
+            lambda s: (s.name, s.get_category_display(), s.address, s.notes),
+        ),
+        DocumentType(
+            "merchant",
+            MerchantProfile,
+            "business_area",
+            ["shop_name", "business_type", "address", "description", "business_area"],
+            lambda m: (m.shop_name, m.business_type, m.address, m.description),
+        ),
+        DocumentType(
+            "post",
+            CommunityPost,
+            "area",
+            ["title", "category", "description", "area"],
+            lambda p: (p.title, p.get_category_display(), p.description),
+        ),
+    ]
+}
+
+
+def type_for_model(model):
+    for doc_type in DOCUMENT_TYPES.values():
+        if doc_type.model is model:
+            return doc_type
+    return None
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from search.backends import get_backend
+from search.documents import DOCUMENT_TYPES
+from search.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from places, services, merchants and posts."
+
+    def handle(self, *args, **options):
+        documents = []
+        for doc_type in DOCUMENT_TYPES.values():
+            for obj in doc_type.queryset().iterator():
+                title, body = doc_type.document(obj)
+                area = doc_type.area_of(obj)
+                documents.append(
+                    SearchDocument(
+                        kind=doc_type.kind,
+                        object_id=obj.pk,
+                        title=title[:255],
+                        body=body,
+                        area_name=area.name if area else "",
+                        area_id=area.id if area else None,
+                    )
+                )
+
+        get_backend().rebuild(documents)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {len(documents)} documents."))
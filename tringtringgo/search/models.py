@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    One searchable row per indexed object (place, service, merchant,
+    community post). Kept up to date by search/signals.py; the backend
+    adds its own full-text index on top (FTS5 table / tsvector GIN index).
+    """
+
+    kind = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    area_name = models.CharField(max_length=100, blank=True)
+    area_id = models.PositiveBigIntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="search_document_unique_object"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["area_id", "kind"], name="search_doc_area_kind_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.title}"
@@ -0,0 +1,66 @@
+# search/signals.py
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from travel.models import Area
+from .backends import get_backend
+from .documents import DOCUMENT_TYPES
+
+
+def index_object(doc_type, obj):
+    title, body = doc_type.document(obj)
+    area = doc_type.area_of(obj)
+    get_backend().index(
+        doc_type.kind,
+        obj.pk,
+        title,
+        body,
+        area_name=area.name if area else "",
+        area_id=area.id if area else None,
+    )
+
+
+def _make_handlers(doc_type):
+    def on_save(sender, instance, update_fields=None, **kwargs):
+        if update_fields and not doc_type.indexed_fields.intersection(update_fields):
+            return
+        index_object(doc_type, instance)
+
+    def on_delete(sender, instance, **kwargs):
+        get_backend().remove(doc_type.kind, instance.pk)
+
+    return on_save, on_delete
+
+
+for _doc_type in DOCUMENT_TYPES.values():
+    _on_save, _on_delete = _make_handlers(_doc_type)
+    post_save.connect(
+        _on_save, sender=_doc_type.model, weak=False, dispatch_uid=f"search-index-{_doc_type.kind}"
+    )
+    post_delete.connect(
+        _on_delete, sender=_doc_type.model, weak=False, dispatch_uid=f"search-remove-{_doc_type.kind}"
+    )
+
+
+def note_area_rename(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Compare with the stored name before an existing area is saved."""
+    instance._search_renamed = False
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and "name" not in update_fields:
+        return
+    stored = sender.objects.filter(pk=instance.pk).values_list("name", flat=True).first()
+    instance._search_renamed = stored is not None and stored != instance.name
+
+
+def reindex_area(sender, instance, created, **kwargs):
+    """An area rename changes the area text of everything in it."""
+    if created or not getattr(instance, "_search_renamed", False):
+        return
+    instance._search_renamed = False
+    for doc_type in DOCUMENT_TYPES.values():
+        for obj in doc_type.queryset().filter(**{doc_type.area_field: instance}):
+            index_object(doc_type, obj)
+
+
+pre_save.connect(note_area_rename, sender=Area, dispatch_uid="search-note-area-rename")
+post_save.connect(reindex_area, sender=Area, dispatch_uid="search-reindex-area")
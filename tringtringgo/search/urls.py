@@ -0,0 +1,7 @@
+# search/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("", views.search, name="search"),  # /api/search/?q=
+]
@@ -0,0 +1,74 @@
+# search/views.py
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .backends import get_backend
+from .documents import DOCUMENT_TYPES
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def search(request):
+    """
+    Ranked, prefix-matching search over places, services, merchants and
+    community posts.
+
+    ?q=dhan lake           required; every word must match (as a prefix)
+    ?type=place,service    optional; any of DOCUMENT_TYPES
+    ?area_id=ID            optional
+    ?limit=N&offset=M      paging (limit max 50)
+    """
+    q = request.GET.get("q", "").strip()
+    if not q:
+        return Response(
+            {"detail": "q is required."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    kinds = [k.strip() for k in request.GET.get("type", "").split(",") if k.strip()]
+    if not set(kinds) <= set(DOCUMENT_TYPES):
+        return Response(
+            {"detail": "Invalid type."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        area_id = request.GET.get("area_id")
+        area_id = int(area_id) if area_id else None
+        limit = min(max(int(request.GET.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        offset = max(int(request.GET.get("offset", 0)), 0)
+    except ValueError:
+        return Response(
+            {"detail": "area_id, limit and offset must be integers."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # one extra row tells us whether there is a next page
+    hits = get_backend().search(q, kinds=kinds, area_id=area_id, limit=limit + 1, offset=offset)
+
+    results = [
+        {
+            "type": doc.kind,
+            "id": doc.object_id,
+            "title": doc.title,
+            "area": doc.area_name or None,
+            "area_id": doc.area_id,
+            "snippet": doc.body[:160],
+            "score": round(doc.score, 4),
+        }
+        for doc in hits[:limit]
+    ]
+
+    next_url = None
+    if len(hits) > limit:
+        next_url = replace_query_param(
+            request.build_absolute_uri(), "offset", offset + limit
+        )
+
+    return Response({"results": results, "next": next_url})
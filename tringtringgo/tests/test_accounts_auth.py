@@ -0,0 +1,176 @@
+# tests/test_accounts_auth.py
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from accounts.authentication import (
+    LOCAL_CACHE_TTL,
+    _cache_key,
+    clear_identity_cache,
+    resolve_identity,
+)
+from accounts.models import (
+    AdminProfile,
+    MerchantProfile,
+    MerchantVerificationRequest,
+    TravelerProfile,
+    UserAccount,
+)
+from travel.models import Area
+
+
+class TokenIdentityTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_identity_cache()
+
+        self.area = Area.objects.create(name="Dhanmondi")
+        self.user = User.objects.create_user(username="admin1", password="pass")
+        self.account = UserAccount.objects.create(user=self.user, role="ADMIN")
+        self.admin_profile = AdminProfile.objects.create(
+            user_account=self.account,
+            area=self.area,
+            years_in_area=5,
+        )
+
+    def test_identity_bundle_one_query_then_cached(self):
+        with self.assertNumQueries(1):
+            identity = resolve_identity("admin1")
+        self.assertEqual(identity.user.id, self.user.id)
+        self.assertEqual(identity.account.id, self.account.id)
+        self.assertEqual(identity.role, "ADMIN")
+        self.assertEqual(identity.admin_profile_id, self.admin_profile.id)
+        self.assertEqual(identity.admin_area_id, self.area.id)
+        self.assertIsNone(identity.merchant_profile_id)
+
+        with self.assertNumQueries(0):
+            again = resolve_identity("admin1")
+        self.assertEqual(again.account.id, self.account.id)
+
+    def test_shared_cache_serves_other_processes(self):
+        resolve_identity("admin1")
+        clear_identity_cache()  # simulate a fresh worker
+        with self.assertNumQueries(0):
+            identity = resolve_identity("admin1")
+        self.assertEqual(identity.admin_area_id, self.area.id)
+
+    def test_other_workers_drop_an_invalidated_identity_within_seconds(self):
+        resolve_identity("admin1")
+        # another worker deletes the user: the shared entry goes, this
+        # process's copy only ages out
+        User.objects.filter(pk=self.user.pk).delete()
+        cache.delete(_cache_key("admin1"))
+
+        later = time.monotonic() + LOCAL_CACHE_TTL + 0.1
+        with mock.patch("accounts.authentication.time.monotonic", return_value=later):
+            self.assertIsNone(resolve_identity("admin1"))
+        self.assertLessEqual(LOCAL_CACHE_TTL, 5)
+
+    def test_unknown_token(self):
+        url = reverse("user-settings")
+        resp = self.client.get(url, HTTP_X_USER_TOKEN="nobody")
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(resp.data["detail"], "Invalid user token.")
+
+        resp = self.client.get(url)
+        self.assertEqual(resp.data["detail"], "Not logged in.")
+
+    def test_username_change_invalidates_old_token(self):
+        resolve_identity("admin1")
+        resp = self.client.put(
+            reverse("update-profile"),
+            {"username": "admin2"},
+            format="json",
+            HTTP_X_USER_TOKEN="admin1",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIsNone(resolve_identity("admin1"))
+        self.assertEqual(resolve_identity("admin2").user.id, self.user.id)
+
+    def test_each_caller_gets_its_own_copy(self):
+        first = resolve_identity("admin1")
+        first.account.admin_profile  # fills this copy's relation cache
+        with self.assertNumQueries(0):
+            second = resolve_identity("admin1")
+        self.assertIsNot(first.account, second.account)
+        self.assertNotIn("admin_profile", second.account._state.fields_cache)
+
+    def test_merchant_verification_is_never_served_from_cache(self):
+        merchant = UserAccount.objects.create(
+            user=User.objects.create_user(username="merchant1", password="pass"),
+            role="MERCHANT",
+        )
+        profile = MerchantProfile.objects.create(
+            user_account=merchant, shop_name="Lake View Cafe", business_area=self.area
+        )
+        url = reverse("merchant-dashboard")
+
+        def dashboard():
+            resp = self.client.get(url, HTTP_X_USER_TOKEN="merchant1")
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            return resp.data["profile"]
+
+        self.assertEqual(dashboard()["status"], "Not requested")
+        verification = MerchantVerificationRequest.objects.create(merchant=profile)
+        self.assertEqual(dashboard()["status"], "Pending verification")
+
+        resp = self.client.post(
+            reverse("admin-handle-verification", args=[verification.id]),
+            {"action": "APPROVE"},
+            format="json",
+            HTTP_X_USER_TOKEN="admin1",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(dashboard()["is_verified"])
+
+    def test_delete_account_invalidates_token(self):
+        resolve_identity("admin1")
+        resp = self.client.delete(
+            reverse("delete-account"), HTTP_X_USER_TOKEN="admin1"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIsNone(resolve_identity("admin1"))
+
+
+class ProvisioningTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_identity_cache()
+        self.user = User.objects.create_user(username="legacy", password="pass")
+
+    def _writes(self, queries):
+        return [
+            q["sql"] for q in queries
+            if q["sql"].split()[0].upper() in ("INSERT", "UPDATE", "DELETE")
+        ]
+
+    def test_read_endpoints_never_write(self):
+        call_command("provision_accounts", stdout=StringIO())
+
+        for name in ("saved-place-list", "my-reviews", "traveler-dashboard", "user-settings"):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(reverse(name), HTTP_X_USER_TOKEN="legacy")
+            self.assertEqual(resp.status_code, status.HTTP_200_OK, name)
+            self.assertEqual(self._writes(ctx.captured_queries), [], name)
+
+    def test_unprovisioned_user_is_not_created_on_read(self):
+        resp = self.client.get(reverse("saved-place-list"), HTTP_X_USER_TOKEN="legacy")
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(UserAccount.objects.filter(user=self.user).exists())
+
+    def test_backfill_command_is_idempotent(self):
+        call_command("provision_accounts", stdout=StringIO())
+        call_command("provision_accounts", stdout=StringIO())
+
+        account = UserAccount.objects.get(user=self.user)
+        self.assertEqual(account.role, "TRAVELER")
+        self.assertEqual(TravelerProfile.objects.filter(user_account=account).count(), 1)
@@ -0,0 +1,239 @@
+# tests/test_chat_messages.py
+from importlib import import_module
+
+from django.apps import apps
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from accounts.authentication import clear_identity_cache
+from chat.models import ChatThread, ChatMessage
+
+User = get_user_model()
+
+
+class ChatMessageCursorTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_identity_cache()
+
+        self.user1 = User.objects.create_user(username="u1", password="pass")
+        self.user2 = User.objects.create_user(username="u2", password="pass")
+        self.thread = ChatThread.objects.create(requested_by=self.user1, status=ChatThread.ACTIVE)
+        self.thread.participants.add(self.user1, self.user2)
+        self.messages = [
+            ChatMessage.objects.create(
+                thread=self.thread, sender=self.user1 if i % 2 else self.user2, text=f"m{i}"
+            )
+            for i in range(10)
+        ]
+        self.url = reverse("chat:message-list-create", args=[self.thread.id])
+
+    def _texts(self, **params):
+        resp = self.client.get(self.url, params, HTTP_X_USER_TOKEN="u1")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [m["text"] for m in resp.data]
+
+    def test_latest_page_then_deltas(self):
+        self.assertEqual(self._texts(limit=3), ["m7", "m8", "m9"])
+        self.assertEqual(self._texts(after_id=self.messages[7].id), ["m8", "m9"])
+        self.assertEqual(self._texts(after_id=self.messages[9].id), [])
+
+    def test_before_id_walks_back(self):
+        self.assertEqual(
+            self._texts(before_id=self.messages[5].id, limit=2), ["m3", "m4"]
+        )
+        self.assertEqual(self._texts(before_id=self.messages[1].id, limit=5), ["m0"])
+
+    def test_constant_queries(self):
+        # identity, thread with membership, then one message query with
+        # the sender joined in, not one per message
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {"limit": 10}, HTTP_X_USER_TOKEN="u1")
+
+    def test_send_checks_membership_in_one_query(self):
+        User.objects.create_user(username="u3", password="pass")
+        self.client.get(self.url, HTTP_X_USER_TOKEN="u3")  # warm identity cache
+
+        # thread + EXISTS membership in a single query, no participant load
+        with self.assertNumQueries(1):
+            resp = self.client.post(
+                self.url, {"text": "let me in"}, format="json", HTTP_X_USER_TOKEN="u3"
+            )
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+        resp = self.client.post(self.url, {"text": "hi"}, format="json", HTTP_X_USER_TOKEN="u2")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    def test_bad_cursor(self):
+        for value in ("x", "-1", str(10**20)):
+            resp = self.client.get(self.url, {"after_id": value}, HTTP_X_USER_TOKEN="u1")
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ChatInboxTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_identity_cache()
+
+        self.me = User.objects.create_user(username="me", password="pass")
+        self.others = [
+            User.objects.create_user(username=f"u{i}", password="pass") for i in range(4)
+        ]
+        self.threads = []
+        for other in self.others:
+            thread = ChatThread.objects.create(requested_by=other, status=ChatThread.ACTIVE)
+            thread.participants.add(self.me, other)
+            ChatMessage.objects.create(thread=thread, sender=other, text=f"hi from {other}")
+            ChatMessage.objects.create(thread=thread, sender=self.me, text="hello")
+            self.threads.append(thread)
+        self.url = reverse("chat:thread-list")
+
+    def test_inbox_constant_queries_and_ordering(self):
+        ChatMessage.objects.create(thread=self.threads[0], sender=self.others[0], text="again")
+
+        # identity, threads (+ last message, unread count), participants
+        with self.assertNumQueries(3):
+            resp = self.client.get(self.url, HTTP_X_USER_TOKEN="me")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        first = resp.data[0]
+        self.assertEqual(first["id"], self.threads[0].id)
+        self.assertEqual(first["last_message"]["text"], "again")
+        self.assertEqual(first["last_message"]["sender"]["username"], "u0")
+        # replying marked the earlier messages read
+        self.assertEqual(first["unread_count"], 1)
+        self.assertEqual(len(first["participants"]), 2)
+        self.assertEqual([t["unread_count"] for t in resp.data[1:]], [0, 0, 0])
+
+
+class ChatReadCursorTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_identity_cache()
+
+        self.me = User.objects.create_user(username="me", password="pass")
+        self.friend = User.objects.create_user(username="friend", password="pass")
+        self.threads = []
+        for _ in range(2):
+            thread = ChatThread.objects.create(requested_by=self.friend, status=ChatThread.ACTIVE)
+            thread.participants.add(self.me, self.friend)
+            self.threads.append(thread)
+        self.incoming = [
+            ChatMessage.objects.create(thread=self.threads[i % 2], sender=self.friend, text=f"m{i}")
+            for i in range(5)
+        ]
+
+    def _badge(self, token="me"):
+        resp = self.client.get(reverse("chat:unread-count"), HTTP_X_USER_TOKEN=token)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.data["unread_count"], resp.data["unread_threads"]
+
+    def _mark_read(self, thread, **data):
+        return self.client.post(
+            reverse("chat:thread-read", args=[thread.id]), data, format="json",
+            HTTP_X_USER_TOKEN="me",
+        )
+
+    def test_badge_counts_all_threads_in_one_query(self):
+        self._badge()  # warm the identity cache
+        with self.assertNumQueries(1):
+            self.assertEqual(self._badge(), (5, 2))
+        self.assertEqual(self._badge("friend"), (0, 0))
+
+    def test_mark_read_up_to_id(self):
+        # thread 0 holds m0, m2, m4
+        resp = self._mark_read(self.threads[0], up_to_id=self.incoming[2].id)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["unread_count"], 1)
+        self.assertEqual(self._badge(), (3, 2))
+
+        # cursors never move backwards
+        resp = self._mark_read(self.threads[0], up_to_id=self.incoming[0].id)
+        self.assertEqual(resp.data["last_read_message_id"], self.incoming[2].id)
+
+        resp = self._mark_read(self.threads[0])
+        self.assertEqual(resp.data["unread_count"], 0)
+        self.assertEqual(self._badge(), (2, 1))
+
+    def test_mark_read_stops_at_the_latest_message(self):
+        resp = self._mark_read(self.threads[0], up_to_id=10**9)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["last_read_message_id"], self.incoming[4].id)
+
+        # a message sent after the call is still unread
+        ChatMessage.objects.create(thread=self.threads[0], sender=self.friend, text="later")
+        self.assertEqual(self._badge(), (3, 2))
+
+    def test_mark_read_rejects_bad_ids(self):
+        for value in (0, -3, 10**20, "x"):
+            resp = self._mark_read(self.threads[0], up_to_id=value)
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST, value)
+        self.assertEqual(self._badge(), (5, 2))
+
+    def test_new_messages_after_read_are_counted(self):
+        self._mark_read(self.threads[1])
+        ChatMessage.objects.create(thread=self.threads[1], sender=self.friend, text="again")
+        self.assertEqual(self._badge(), (4, 2))
+
+    def test_outsider_cannot_mark_read(self):
+        User.objects.create_user(username="outsider", password="pass")
+        resp = self.client.post(
+            reverse("chat:thread-read", args=[self.threads[0].id]), {}, format="json",
+            HTTP_X_USER_TOKEN="outsider",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ChatPairKeyTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_identity_cache()
+
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        self.bob = User.objects.create_user(username="bob", password="pass")
+        self.url = reverse("chat:thread-request")
+
+    def _request(self, token, user):
+        resp = self.client.post(self.url, {"user_id": user.id}, format="json", HTTP_X_USER_TOKEN=token)
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        return resp.data["id"]
+
+    def test_request_reuses_the_pair_thread_from_either_side(self):
+        first = self._request("alice", self.bob)
+        self.assertEqual(self._request("bob", self.alice), first)
+        self.assertEqual(
+            ChatThread.objects.get(pk=first).pair_key,
+            ChatThread.pair_key_for(self.bob.id, self.alice.id),
+        )
+
+    def test_lost_insert_race_reuses_the_winner(self):
+        # another request already created the pair's thread; the unique
+        # pair_key makes a second create fail instead of duplicating it
+        winner = ChatThread.objects.create(
+            requested_by=self.bob, pair_key=ChatThread.pair_key_for(self.alice.id, self.bob.id)
+        )
+        winner.participants.add(self.alice, self.bob)
+        self.assertEqual(self._request("alice", self.bob), winner.id)
+        self.assertEqual(ChatThread.objects.count(), 1)
+
+    def test_migration_merges_duplicate_pair_threads(self):
+        fill_pair_keys = import_module("chat.migrations.0005_thread_pair_key").fill_pair_keys
+
+        threads = []
+        for text in ("first", "second"):
+            thread = ChatThread.objects.create(requested_by=self.alice)
+            thread.participants.add(self.alice, self.bob)
+            ChatMessage.objects.create(thread=thread, sender=self.alice, text=text)
+            threads.append(thread)
+
+        fill_pair_keys(apps, None)
+
+        merged = ChatThread.objects.get()
+        self.assertEqual(merged.id, threads[0].id)
+        self.assertEqual(merged.pair_key, ChatThread.pair_key_for(self.alice.id, self.bob.id))
+        self.assertEqual([m.text for m in merged.messages.order_by("id")], ["first", "second"])
+        self.assertEqual(merged.last_message.text, "second")
+        self.assertEqual(merged.read_cursors.get(user=self.bob).unread_count, 2)
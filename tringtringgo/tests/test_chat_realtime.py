@@ -0,0 +1,68 @@
+# tests/test_chat_realtime.py
+from asgiref.sync import sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient, APITestCase
+
+from accounts.authentication import clear_identity_cache
+from chat.models import ChatThread
+from chat.routing import websocket_urlpatterns
+
+User = get_user_model()
+
+
+class ChatWebSocketTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_identity_cache()
+
+        self.user1 = User.objects.create_user(username="u1", password="pass")
+        self.user2 = User.objects.create_user(username="u2", password="pass")
+        self.outsider = User.objects.create_user(username="u3", password="pass")
+        self.thread = ChatThread.objects.create(requested_by=self.user1)
+        self.thread.participants.add(self.user1, self.user2)
+        self.app = URLRouter(websocket_urlpatterns)
+
+    def _socket(self, token):
+        return WebsocketCommunicator(
+            self.app, f"/ws/chat/threads/{self.thread.id}/?token={token}"
+        )
+
+    def _post(self, url, data, token):
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = APIClient().post(url, data, format="json", HTTP_X_USER_TOKEN=token)
+        return resp
+
+    async def test_status_change_and_new_message_are_pushed(self):
+        socket = self._socket("u1")
+        connected, _ = await socket.connect()
+        self.assertTrue(connected)
+
+        await sync_to_async(self._post)(
+            reverse("chat:thread-accept", args=[self.thread.id]), {"action": "accept"}, "u2"
+        )
+        event = await socket.receive_json_from()
+        self.assertEqual(
+            event, {"type": "status", "thread_id": self.thread.id, "status": "active"}
+        )
+
+        resp = await sync_to_async(self._post)(
+            reverse("chat:message-list-create", args=[self.thread.id]), {"text": "hi"}, "u2"
+        )
+        event = await socket.receive_json_from()
+        self.assertEqual(event["type"], "message")
+        self.assertEqual(event["message"]["id"], resp.data["id"])
+        self.assertEqual(event["message"]["sender"]["username"], "u2")
+
+        self.assertTrue(await socket.receive_nothing())
+        await socket.disconnect()
+
+    async def test_non_participants_are_rejected(self):
+        for token in ("u3", "nobody", ""):
+            socket = self._socket(token)
+            connected, code = await socket.connect()
+            self.assertFalse(connected, token)
+            self.assertEqual(code, 4403)
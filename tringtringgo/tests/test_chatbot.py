@@ -1,11 +1,32 @@
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.test import SimpleTestCase, TransactionTestCase
 from django.urls import reverse
-from rest_framework.test import APITestCase
+from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
-from travel.models import Service, Place, Area  
+from django.contrib.auth.models import User
+from travel.models import Service, Place, Area, Review
+from accounts.authentication import clear_identity_cache
+from accounts.models import UserAccount
+from chatbot.models import ChatMessage
+from chatbot import gazetteer, history, reply_cache
+from chatbot.gazetteer import AreaGazetteer
+from chatbot.intents import Query, resolve
 
 
 class ChatbotApiTests(APITestCase):
     def setUp(self):
+        # queued history goes into this test's (rolled back) transaction
+        self.addCleanup(history.flush)
         # minimal data
         self.area = Area.objects.create(name="Dhanmondi")
         self.service = Service.objects.create(
@@ -46,3 +67,372 @@ class ChatbotApiTests(APITestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertIn("Places near dhanmondi", resp.data["reply"])
         self.assertIn("Test Place", resp.data["reply"])
+
+    def test_service_intents(self):
+        for message, expected in [
+            ("all hospitals", "All hospitals:"),
+            ("police near Dhanmondi", "No police stations found near dhanmondi."),
+            ("atm near", "Please specify an area after 'near', e.g. 'atm near Dhanmondi'."),
+            ("what is this", "Sorry, I didn't understand."),
+        ]:
+            resp = self.client.post(self.url, {"message": message}, format="json")
+            self.assertIn(expected, resp.data["reply"], message)
+
+
+class IntentRouterTests(SimpleTestCase):
+    def test_resolve(self):
+        cases = {
+            "show history": Query("history"),
+            "Hello": Query("greeting"),
+            "help me find a hospital": Query("help"),
+            "top places near Gulshan": Query("top_places"),
+            "all places": Query("all_places"),
+            "Pharmacies near  Banani ": Query("services_near", category="PHARMACY", area="banani"),
+            "atms": Query("all_services", category="ATM"),
+            "places near": Query("places_near", area=""),
+            "places": Query("all_places"),
+            "nearby places": Query("fallback"),
+        }
+        for message, expected in cases.items():
+            self.assertEqual(resolve(message), expected, message)
+
+
+class AreaGazetteerTests(SimpleTestCase):
+    def setUp(self):
+        self.gazetteer = AreaGazetteer(
+            [(1, "Dhanmondi"), (2, "Gulshan 1"), (3, "Gulshan 2"), (4, "Mirpur"), (5, "Motijheel")],
+            {"old town": "Motijheel"},
+        )
+
+    def test_lookup(self):
+        cases = {
+            "  DHANMONDI ": [1],
+            "old town": [5],
+            "gulshan": [2, 3],
+            "gulshan-2": [3],
+            "dhanmondy": [1],
+            "mirpurr": [4],
+            "banani": [],
+            "": [],
+        }
+        for text, expected in cases.items():
+            self.assertEqual(self.gazetteer.lookup(text), expected, text)
+
+
+class ChatbotAreaResolutionTests(APITestCase):
+    def setUp(self):
+        # queued history goes into this test's (rolled back) transaction
+        self.addCleanup(history.flush)
+        cache.clear()
+        self.area = Area.objects.create(name="Dhanmondi")
+        Service.objects.create(name="Lab Aid", category="HOSPITAL", area=self.area)
+        self.url = reverse("chatbot-chat")
+
+    def _reply(self, message):
+        return self.client.post(self.url, {"message": message}, format="json").data["reply"]
+
+    def test_misspelt_area_resolves(self):
+        self.assertIn("Lab Aid", self._reply("hospitals near dhanmondy"))
+
+    def test_new_and_renamed_areas_are_picked_up(self):
+        self._reply("hospitals near dhanmondi")  # build the index
+        with self.captureOnCommitCallbacks(execute=True):
+            gulshan = Area.objects.create(name="Gulshan")
+            Service.objects.create(name="United", category="HOSPITAL", area=gulshan)
+        self.assertIn("United", self._reply("hospitals near gulshan"))
+
+        gulshan.name = "Banani"
+        with self.captureOnCommitCallbacks(execute=True):
+            gulshan.save()
+        self.assertIn("United", self._reply("hospitals near banani"))
+
+    def test_index_version_moves_only_after_commit(self):
+        version = gazetteer._version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            Area.objects.create(name="Gulshan")
+            self.assertEqual(gazetteer._version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(gazetteer._version(), version)
+
+    def test_flushed_version_restarts_from_the_clock(self):
+        self._reply("hospitals near dhanmondi")  # build the index
+        built = gazetteer._version()
+        cache.clear()
+        self.assertNotEqual(gazetteer._version(), built)
+
+
+class ChatbotReplyCacheTests(APITestCase):
+    def setUp(self):
+        # queued history goes into this test's (rolled back) transaction
+        self.addCleanup(history.flush)
+        cache.clear()
+        reply_cache.clear()
+        self.area = Area.objects.create(name="Gulshan")
+        Service.objects.create(name="City ATM", category="ATM", area=self.area)
+        self.url = reverse("chatbot-chat")
+
+    def _reply(self, message):
+        return self.client.post(
+            self.url, {"message": message}, format="json"
+        ).data["reply"]
+
+    def test_repeated_query_is_served_from_cache(self):
+        first = self._reply("atm near Gulshan")
+        # only the session lookup, no catalogue queries
+        with mock.patch.object(history, "FLUSH_SECONDS", 3600), self.assertNumQueries(1):
+            self.assertEqual(self._reply("  ATM near gulshan"), first)
+
+    def test_data_changes_expire_replies(self):
+        self.assertNotIn("Bank ATM", self._reply("all atms"))
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.create(name="Bank ATM", category="ATM", area=self.area)
+        self.assertIn("Bank ATM", self._reply("all atms"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            place = Place.objects.create(name="Gulshan Lake", area=self.area, category="LAKE")
+        self._reply("top places")
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(
+                traveler=UserAccount.objects.create(
+                    user=User.objects.create_user(username="t1", password="pass")
+                ),
+                place=place,
+                rating=4,
+            )
+        self.assertIn("Rating: 4.0", self._reply("top places"))
+
+    def test_replies_expire_only_after_commit(self):
+        version = reply_cache.data_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            Service.objects.create(name="Bank ATM", category="ATM", area=self.area)
+            self.assertEqual(reply_cache.data_version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(reply_cache.data_version(), version)
+
+    def test_history_is_never_cached(self):
+        self._reply("hi")
+        self.assertIn("user: show history", self._reply("show history"))
+        self.assertIn("bot: user: hi", self._reply("show history"))
+
+
+class ChatbotHistoryTests(APITestCase):
+    def setUp(self):
+        # queued history goes into this test's (rolled back) transaction
+        self.addCleanup(history.flush)
+        cache.clear()
+        clear_identity_cache()
+        self.url = reverse("chatbot-chat")
+
+    def _reply(self, message, client=None, **extra):
+        client = client or self.client
+        return client.post(self.url, {"message": message}, format="json", **extra).data["reply"]
+
+    def test_history_is_scoped_to_the_session(self):
+        other = APIClient()
+        self._reply("hi")
+        self._reply("help", client=other)
+
+        history = self._reply("history").splitlines()
+        self.assertIn("user: hi", history)
+        self.assertNotIn("user: help", history)
+        # a new session only holds the question itself
+        self.assertEqual(self._reply("history", client=APIClient()), "user: history")
+
+    def test_client_supplied_session_ids_are_ignored(self):
+        self.client.post(self.url, {"message": "hi", "session_id": "shared"}, format="json")
+        other = APIClient()
+        other.post(self.url, {"message": "history", "session_id": "shared"}, format="json")
+        self.assertNotIn("user: hi", self._reply("history", client=other).splitlines())
+
+    def test_unknown_session_cookies_get_a_new_session(self):
+        self._reply("hi")
+        cookie = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+
+        forged = APIClient()
+        forged.cookies[settings.SESSION_COOKIE_NAME] = "made-up-session-key"
+        self.assertEqual(self._reply("history", client=forged), "user: history")
+        new_cookie = forged.cookies[settings.SESSION_COOKIE_NAME].value
+        self.assertNotIn(new_cookie, ("", "made-up-session-key", cookie))
+
+    def test_new_session_is_only_saved_once_by_the_middleware(self):
+        with mock.patch.object(history, "FLUSH_SECONDS", 3600), \
+                CaptureQueriesContext(connection) as ctx:
+            self._reply("hi")
+        writes = [q["sql"] for q in ctx.captured_queries
+                  if "django_session" in q["sql"] and not q["sql"].startswith("SELECT")]
+        self.assertEqual(len(writes), 1)
+        self.assertIn(settings.SESSION_COOKIE_NAME, self.client.cookies)
+
+    def test_logged_in_users_share_history_across_devices(self):
+        User.objects.create_user(username="traveler1", password="pass")
+        self._reply("hi", HTTP_X_USER_TOKEN="traveler1")
+        history = self._reply("history", client=APIClient(), HTTP_X_USER_TOKEN="traveler1")
+        self.assertIn("user: hi", history)
+
+    def test_messages_are_written_in_batches_after_the_response(self):
+        with mock.patch.object(history, "BATCH_SIZE", 4), \
+                mock.patch.object(history, "FLUSH_SECONDS", 3600):
+            self._reply("hi")
+            self.assertFalse(ChatMessage.objects.exists())
+            self._reply("help")
+        self.assertEqual(
+            list(ChatMessage.objects.values_list("role", flat=True)),
+            ["user", "bot", "user", "bot"],
+        )
+        self.assertEqual(len(set(ChatMessage.objects.values_list("session", flat=True))), 1)
+
+    def test_queue_is_flushed_after_the_interval(self):
+        with mock.patch.object(history, "FLUSH_SECONDS", 3600):
+            self._reply("hi")
+        self.assertFalse(ChatMessage.objects.exists())
+        with mock.patch.object(history, "FLUSH_SECONDS", 0):
+            self._reply("help")
+        self.assertEqual(ChatMessage.objects.count(), 4)
+
+    def test_failed_writes_stay_queued(self):
+        with mock.patch.object(history, "FLUSH_SECONDS", 3600):
+            self._reply("hi")
+        with mock.patch.object(ChatMessage.objects, "bulk_create", side_effect=DatabaseError), \
+                self.assertLogs("chatbot.history", "ERROR"):
+            history.flush()
+        self.assertEqual(len(history._queue), 2)
+
+        history.flush()
+        self.assertEqual(list(ChatMessage.objects.values_list("role", flat=True)), ["user", "bot"])
+
+    def test_purge_command(self):
+        self._reply("hi")
+        history.flush()
+        ChatMessage.objects.filter(role="user").update(
+            created_at=timezone.now() - timedelta(days=31)
+        )
+        call_command("purge_chatbot_history", stdout=StringIO())
+        self.assertEqual(list(ChatMessage.objects.values_list("role", flat=True)), ["bot"])
+
+
+class ChatbotPlaceRankingTests(APITestCase):
+    def setUp(self):
+        # queued history goes into this test's (rolled back) transaction
+        self.addCleanup(history.flush)
+        cache.clear()
+        reply_cache.clear()
+        area = Area.objects.create(name="Dhanmondi")
+        self.one_hit = Place.objects.create(name="One Hit Cafe", area=area, category="CAFE")
+        self.steady = Place.objects.create(name="Steady Park", area=area, category="PARK")
+        Place.objects.create(name="Unrated Museum", area=area, category="MUSEUM")
+
+        reviewers = [
+            UserAccount.objects.create(user=User.objects.create_user(username=f"t{i}", password="pass"))
+            for i in range(8)
+        ]
+        Review.objects.create(traveler=reviewers[0], place=self.one_hit, rating=5)
+        for reviewer in reviewers:
+            Review.objects.create(traveler=reviewer, place=self.steady, rating=4)
+        self.url = reverse("chatbot-chat")
+
+    def test_top_places_use_bayesian_score_without_aggregating_reviews(self):
+        with CaptureQueriesContext(connection) as ctx:
+            reply = self.client.post(self.url, {"message": "top places"}, format="json").data["reply"]
+        self.assertLess(reply.index("Steady Park"), reply.index("One Hit Cafe"))
+        self.assertNotIn("Unrated Museum", reply)
+        self.assertIn("Rating: 4.0", reply)
+        self.assertFalse(any("travel_review" in q["sql"] for q in ctx.captured_queries))
+
+
+class ChatbotStructuredReplyTests(APITestCase):
+    def setUp(self):
+        # queued history goes into this test's (rolled back) transaction
+        self.addCleanup(history.flush)
+        cache.clear()
+        reply_cache.clear()
+        self.area = Area.objects.create(name="Gulshan")
+        self.atms = [
+            Service.objects.create(
+                name=f"ATM {i:02d}", category="ATM", area=self.area, phone=f"01{i:02d}"
+            )
+            for i in range(25)
+        ]
+        self.url = reverse("chatbot-chat")
+
+    def _post(self, message, **params):
+        query = "&".join(f"{k}={v}" for k, v in {"format": "json", **params}.items())
+        resp = self.client.post(
+            f"{self.url}?{query}", {"message": message}, format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.data
+
+    def test_items_are_paged_by_cursor(self):
+        first = self._post("all atms", limit=10)
+        self.assertEqual(first["intent"], "all_services")
+        self.assertEqual(first["count"], 25)
+        self.assertNotIn("reply", first)
+        self.assertEqual(
+            {k: first["results"][0][k] for k in ("type", "id", "name", "area", "phone")},
+            {"type": "service", "id": self.atms[0].id, "name": "ATM 00",
+             "area": "Gulshan", "phone": "0100"},
+        )
+
+        names = [row["name"] for row in first["results"]]
+        cursor = first["next_cursor"]
+        while cursor:
+            page = self._post("all atms", limit=10, cursor=cursor)
+            names.extend(row["name"] for row in page["results"])
+            cursor = page["next_cursor"]
+        self.assertEqual(names, [a.name for a in self.atms])
+        # later pages don't add conversation turns
+        history.flush()
+        self.assertEqual(ChatMessage.objects.count(), 2)
+
+    def test_text_is_opt_in_and_matches_classic_reply(self):
+        classic = self.client.post(self.url, {"message": "all atms"}, format="json").data["reply"]
+        data = self._post("all atms", text=1)
+        self.assertEqual(data["reply"], classic)
+        # the classic text keeps its 20-entry cap
+        self.assertIn("20. ATM 19", classic)
+        self.assertNotIn("ATM 20", classic)
+
+    def test_json_mode_renders_text_only_when_history_is_written(self):
+        with mock.patch("chatbot.history.flush"):
+            self._post("all atms")
+        _, role, reply, _ = history._queue[-1]
+        self.assertEqual(role, "bot")
+        self.assertIsNone(reply._text)
+
+        history.flush()
+        logged = ChatMessage.objects.get(role="bot").message
+        classic = self.client.post(self.url, {"message": "all atms"}, format="json").data["reply"]
+        self.assertEqual(logged, classic)
+
+    def test_plain_replies_use_message(self):
+        data = self._post("hi")
+        self.assertEqual(data["results"], [])
+        self.assertIsNone(data["next_cursor"])
+        self.assertIn("Hello", data["message"])
+
+    def test_invalid_cursor(self):
+        resp = self.client.post(
+            f"{self.url}?format=json&cursor=abc", {"message": "all atms"}, format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ChatbotHistoryFlusherTests(TransactionTestCase):
+    """The background flush writes through its own connection, hence no TestCase."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(history.flush)
+
+    def test_idle_worker_writes_old_messages(self):
+        with mock.patch.object(history, "FLUSH_SECONDS", 0.05):
+            history.log("anon:idle", "user", "hi")
+            history._wake.set()
+            deadline = time.monotonic() + 5
+            while not ChatMessage.objects.exists() and time.monotonic() < deadline:
+                time.sleep(0.05)
+        self.assertEqual(
+            list(ChatMessage.objects.values_list("session", "message")), [("anon:idle", "hi")]
+        )
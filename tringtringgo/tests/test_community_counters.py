@@ -0,0 +1,90 @@
+# tests/test_community_counters.py
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from accounts.authentication import clear_identity_cache
+from accounts.models import UserAccount
+from community.models import CommunityPost, CommunityComment
+from travel.models import Area
+
+
+class CommunityCounterTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_identity_cache()
+
+        self.area = Area.objects.create(name="Dhanmondi")
+        self.accounts = []
+        for i in range(2):
+            user = User.objects.create_user(username=f"t{i}", password="pass")
+            self.accounts.append(UserAccount.objects.create(user=user, role="TRAVELER"))
+        self.post = CommunityPost.objects.create(
+            author=self.accounts[0], title="Traffic on Road 27", category="TRAFFIC",
+            area=self.area, description="Blocked",
+        )
+
+    def _react(self, username, reaction):
+        resp = self.client.post(
+            reverse("community-react", args=[self.post.id]),
+            {"reaction": reaction},
+            format="json",
+            HTTP_X_USER_TOKEN=username,
+            HTTP_X_USER_MODE="TRAVELER",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.data["likes_count"], resp.data["dislikes_count"]
+
+    def _counters(self):
+        self.post.refresh_from_db()
+        return self.post.comments_count, self.post.likes_count, self.post.dislikes_count
+
+    def test_reaction_toggle_and_switch(self):
+        self.assertEqual(self._react("t0", "LIKE"), (1, 0))
+        self.assertEqual(self._react("t1", "LIKE"), (2, 0))
+        self.assertEqual(self._react("t0", "DISLIKE"), (1, 1))
+        self.assertEqual(self._react("t0", "DISLIKE"), (1, 0))
+        self.assertEqual(self._counters(), (0, 1, 0))
+
+    def test_comment_add_and_delete(self):
+        resp = self.client.post(
+            reverse("community-add-comment", args=[self.post.id]),
+            {"text": "Still blocked"},
+            format="json",
+            HTTP_X_USER_TOKEN="t1",
+            HTTP_X_USER_MODE="TRAVELER",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["comments_count"], 1)
+
+        CommunityComment.objects.get(pk=resp.data["id"]).delete()
+        self.assertEqual(self._counters(), (0, 0, 0))
+
+    def test_feed_reads_counters_without_per_post_queries(self):
+        for i in range(5):
+            post = CommunityPost.objects.create(
+                author=self.accounts[1], title=f"Post {i}", category="FOOD_TIPS",
+                area=self.area, description="...",
+            )
+            CommunityComment.objects.create(post=post, author=self.accounts[0], text="hi")
+
+        with self.assertNumQueries(1):
+            resp = self.client.get(reverse("community-posts"))
+        rows = resp.data["results"]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(sum(row["comments_count"] for row in rows), 5)
+
+    def test_recount_command_fixes_drift(self):
+        self._react("t0", "LIKE")
+        CommunityComment.objects.create(post=self.post, author=self.accounts[1], text="hi")
+        CommunityPost.objects.filter(pk=self.post.pk).update(
+            comments_count=9, likes_count=0, dislikes_count=4
+        )
+
+        call_command("recount_community_counters", stdout=StringIO())
+        self.assertEqual(self._counters(), (1, 1, 0))
@@ -0,0 +1,68 @@
+# tests/test_community_feed.py
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from accounts.models import UserAccount
+from community.models import CommunityPost
+from community.pagination import CommunityFeedCursorPagination
+from travel.models import Area
+
+
+class CommunityFeedPaginationTests(APITestCase):
+    def setUp(self):
+        self.dhanmondi = Area.objects.create(name="Dhanmondi")
+        self.gulshan = Area.objects.create(name="Gulshan")
+        user = User.objects.create_user(username="t0", password="pass")
+        self.account = UserAccount.objects.create(user=user, role="TRAVELER")
+
+        self.posts = [
+            CommunityPost.objects.create(
+                author=self.account, title=f"Post {i}",
+                category="TRAFFIC" if i % 2 else "FOOD_TIPS",
+                area=self.dhanmondi if i < 4 else self.gulshan,
+                description="...",
+            )
+            for i in range(7)
+        ]
+        self.url = reverse("community-posts")
+
+    def _all_pages(self, params):
+        url, rows = self.url, []
+        while url:
+            resp = self.client.get(url, params)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            rows.extend(resp.data["results"])
+            url, params = resp.data["next"], None
+        return rows
+
+    def test_keyset_pages_newest_first(self):
+        rows = self._all_pages({"limit": 3})
+        self.assertEqual([r["id"] for r in rows], [p.id for p in reversed(self.posts)])
+
+    def test_posts_created_while_paging_do_not_repeat(self):
+        resp = self.client.get(self.url, {"limit": 3})
+        first = [r["id"] for r in resp.data["results"]]
+        CommunityPost.objects.create(
+            author=self.account, title="Late", category="TRAFFIC", description="..."
+        )
+        rest, url = [], resp.data["next"]
+        while url:
+            page = self.client.get(url)
+            rest.extend(r["id"] for r in page.data["results"])
+            url = page.data["next"]
+        self.assertEqual(first + rest, [p.id for p in reversed(self.posts)])
+
+    def test_filters_and_page_size_cap(self):
+        rows = self._all_pages({"category": "TRAFFIC", "area_id": self.dhanmondi.id})
+        self.assertEqual([r["title"] for r in rows], ["Post 3", "Post 1"])
+
+        CommunityPost.objects.bulk_create(
+            CommunityPost(author=self.account, title="Bulk", category="TRAFFIC", description="...")
+            for _ in range(60)
+        )
+        resp = self.client.get(self.url, {"limit": 1000})
+        self.assertEqual(
+            len(resp.data["results"]), CommunityFeedCursorPagination.max_page_size
+        )
@@ -0,0 +1,18 @@
+# tests/test_database_settings.py
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite tuning")
+class SQLitePragmaTests(TestCase):
+    def _pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_connection_created_applies_pragmas(self):
+        self.assertEqual(self._pragma("busy_timeout"), 20000)
+        self.assertEqual(self._pragma("synchronous"), 1)  # NORMAL
+        self.assertEqual(self._pragma("temp_store"), 2)  # MEMORY
@@ -0,0 +1,84 @@
+# tests/test_flat_serializers.py
+import json
+from datetime import time
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, TestCase
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import MerchantProfile, UserAccount
+from chat.models import ChatMessage, ChatThread
+from chat.serializers import ChatMessageSerializer
+from core.renderers import ORJSONRenderer
+from travel.models import Area, Place, Review, Service
+from travel.serializers import (
+    MerchantProfileSerializer,
+    PlaceSerializer,
+    ReviewSerializer,
+    ServiceSerializer,
+)
+
+
+class FlatSerializerParityTests(TestCase):
+    """The flat path must produce exactly what the ModelSerializers do."""
+
+    def setUp(self):
+        self.area = Area.objects.create(name="Dhanmondi")
+        self.user = User.objects.create_user(username="traveler1", password="pass", email="t@x.com")
+        self.account = UserAccount.objects.create(user=self.user, role="TRAVELER")
+
+        self.lake = Place.objects.create(
+            name="Dhanmondi Lake", area=self.area, category="LAKE", image="places/lake.jpg",
+            opening_time=time(6, 0), closing_time=time(22, 30),
+        )
+        Place.objects.create(name="Nowhere", category="OTHER")  # no area, no image
+        Review.objects.create(traveler=self.account, place=self.lake, rating=4, title="Nice")
+
+        Service.objects.create(
+            name="Lab Aid", category="HOSPITAL", area=self.area, phone="0123",
+            latitude=23.74, longitude=90.37,
+        )
+        merchant = UserAccount.objects.create(
+            user=User.objects.create_user(username="merchant1", password="pass"), role="MERCHANT"
+        )
+        MerchantProfile.objects.create(
+            user_account=merchant, shop_name="Lake View Cafe", business_area=self.area
+        )
+
+        other = User.objects.create_user(username="traveler2", password="pass")
+        thread = ChatThread.objects.create(requested_by=self.user)
+        thread.participants.add(self.user, other)
+        ChatMessage.objects.create(thread=thread, sender=self.user, text="hi")
+
+    def _assert_parity(self, serializer_class, qs, **kwargs):
+        expected = serializer_class(qs, many=True, **kwargs).data
+        flat = serializer_class.flat(**kwargs).data(qs)
+        self.assertEqual(json.loads(json.dumps(flat)), json.loads(json.dumps(expected)))
+        self.assertTrue(flat)
+
+    def test_travel_serializers(self):
+        request = RequestFactory().get("/")
+        fields = [f for f in PlaceSerializer.Meta.fields if f != "latest_reviews"]
+        places = Place.objects.order_by("id")
+        self._assert_parity(PlaceSerializer, places, fields=fields)
+        self._assert_parity(PlaceSerializer, places, fields=fields, context={"request": request})
+        self._assert_parity(ServiceSerializer, Service.objects.all())
+        self._assert_parity(ReviewSerializer, Review.objects.all())
+        self._assert_parity(MerchantProfileSerializer, MerchantProfile.objects.all())
+
+    def test_nested_serializer(self):
+        self._assert_parity(ChatMessageSerializer, ChatMessage.objects.order_by("id"))
+
+    def test_method_fields_are_refused(self):
+        with self.assertRaises(ImproperlyConfigured):
+            PlaceSerializer.flat()
+
+
+class ORJSONRendererTests(TestCase):
+    def test_matches_drf_json_renderer(self):
+        data = {"name": "Dhaka ঢাকা", "rating": 4.5, "price": Decimal("1.50"), "ids": [1, 2], "none": None}
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(data)), json.loads(JSONRenderer().render(data))
+        )
@@ -0,0 +1,136 @@
+# tests/test_http_cache.py
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from accounts.models import UserAccount
+from core.checks import check_shared_cache
+from travel.models import Area, Place, Review, Service
+
+
+class ReferenceDataCachingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.area = Area.objects.create(name="Dhanmondi")
+        self.place = Place.objects.create(name="Dhanmondi Lake", area=self.area, category="LAKE")
+
+    def _get(self, name, **headers):
+        return self.client.get(reverse(name), **headers)
+
+    def test_unchanged_data_is_a_304_without_queries(self):
+        first = self._get("area-list")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn("public", first["Cache-Control"])
+        self.assertIn("Last-Modified", first)
+
+        with self.assertNumQueries(0):
+            again = self._get("area-list", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_change_the_etag(self):
+        areas = self._get("area-list")["ETag"]
+        services = self._get("service-list")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.create(name="City ATM", category="ATM", area=self.area)
+        self.assertEqual(self._get("area-list", HTTP_IF_NONE_MATCH=areas).status_code, 304)
+        resp = self._get("service-list", HTTP_IF_NONE_MATCH=services)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data), 1)
+
+    def test_rating_changes_expire_places(self):
+        places = self._get("place-list")["ETag"]
+        account = UserAccount.objects.create(
+            user=User.objects.create_user(username="t1", password="pass"), role="TRAVELER"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(traveler=account, place=self.place, rating=4)
+        resp = self._get("place-list", HTTP_IF_NONE_MATCH=places)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        places = resp["ETag"]
+
+        # logins only touch last_login
+        with self.captureOnCommitCallbacks(execute=True):
+            account.user.save(update_fields=["last_login"])
+        self.assertEqual(self._get("place-list", HTTP_IF_NONE_MATCH=places).status_code, 304)
+
+        Place.objects.filter(pk=self.place.pk).update(review_count=9)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("reconcile_ratings", stdout=StringIO())
+        self.assertEqual(self._get("place-list", HTTP_IF_NONE_MATCH=places).status_code, 200)
+
+    def test_validators_move_only_after_commit(self):
+        areas = self._get("area-list")["ETag"]
+        with self.captureOnCommitCallbacks() as callbacks:
+            Area.objects.create(name="Gulshan")
+            # not committed yet: the old copy is still the current one
+            self.assertEqual(self._get("area-list", HTTP_IF_NONE_MATCH=areas).status_code, 304)
+        self.assertTrue(callbacks)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self._get("area-list", HTTP_IF_NONE_MATCH=areas).status_code, 200)
+
+
+class ReferenceDataResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.dhanmondi = Area.objects.create(name="Dhanmondi")
+        self.gulshan = Area.objects.create(name="Gulshan")
+        Service.objects.create(name="Lab Aid", category="HOSPITAL", area=self.dhanmondi)
+        self.url = reverse("service-list")
+
+    def _names(self, **params):
+        resp = self.client.get(self.url, params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], "application/json")
+        return [row["name"] for row in resp.json()]
+
+    def test_repeat_requests_are_served_from_cache(self):
+        self.assertEqual(self._names(area_id=self.dhanmondi.id), ["Lab Aid"])
+        with self.assertNumQueries(0):
+            self.assertEqual(self._names(area_id=self.dhanmondi.id), ["Lab Aid"])
+        # keyed by query string
+        self.assertEqual(self._names(area_id=self.gulshan.id), [])
+
+    def test_changes_invalidate_cached_bodies(self):
+        self._names(area_id=self.gulshan.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.create(name="United", category="HOSPITAL", area=self.gulshan)
+        self.assertEqual(self._names(area_id=self.gulshan.id), ["United"])
+
+        self.gulshan.name = "Gulshan 1"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.gulshan.save()
+        resp = self.client.get(self.url, {"area_id": self.gulshan.id})
+        self.assertEqual(resp.json()[0]["area_name"], "Gulshan 1")
+
+    def test_bodies_built_before_commit_are_not_served_after_it(self):
+        self._names(area_id=self.gulshan.id)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Service.objects.create(name="United", category="HOSPITAL", area=self.gulshan)
+            # a GET racing the write can only fill the pre-commit version's key
+            before = self.client.get(self.url, {"area_id": self.gulshan.id})["ETag"]
+        for callback in callbacks:
+            callback()
+
+        resp = self.client.get(self.url, {"area_id": self.gulshan.id})
+        self.assertNotEqual(resp["ETag"], before)
+        self.assertEqual([row["name"] for row in resp.json()], ["United"])
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_per_process_cache_fails_the_deploy_check(self):
+        locmem = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        with override_settings(CACHES=locmem):
+            self.assertEqual([e.id for e in check_shared_cache(None)], ["core.E001"])
+
+        redis = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache",
+                             "LOCATION": "redis://localhost:6379/0"}}
+        with override_settings(CACHES=redis):
+            self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,130 @@
+# tests/test_replica_routing.py
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.http_cache import reference_data
+from core.middleware import ReplicaPinMiddleware
+from core.replicas import read_from_replica
+from travel.models import Area, Place
+
+# A second database that never receives default's writes, i.e. a lagging
+# replica. It is added to the connections here, at import time, so the
+# test runner creates it for ReplicaDatabaseTests; the shipped settings
+# don't know about it.
+REPLICA_ALIAS = "replica_test"
+if REPLICA_ALIAS not in connections:
+    _default = connections.settings["default"]
+    _test = {}
+    if _default["ENGINE"].endswith("postgresql"):
+        _test["NAME"] = f"test_{_default['NAME']}_replica"
+    connections.settings[REPLICA_ALIAS] = connections.configure_settings(
+        {"default": {}, REPLICA_ALIAS: {**_default, "TEST": _test}}
+    )[REPLICA_ALIAS]
+
+
+def _reads_from(request):
+    if request.method == "POST":
+        Area.objects.create(name="Gulshan")
+    return HttpResponse(Place.objects.all().db)
+
+
+@read_from_replica
+def replica_view(request):
+    return _reads_from(request)
+
+
+@read_from_replica
+def write_then_read_view(request):
+    Area.objects.create(name="Banani")
+    return HttpResponse(Place.objects.all().db)
+
+
+def _place_names(request):
+    if request.method == "POST":
+        Place.objects.create(name=request.POST["name"])
+    return HttpResponse(",".join(Place.objects.order_by("name").values_list("name", flat=True)))
+
+
+@read_from_replica
+def place_names_view(request):
+    return _place_names(request)
+
+
+@reference_data(Place)
+@read_from_replica
+def cached_place_names_view(request):
+    return _place_names(request)
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def _db(self, view, method="get", token="t1"):
+        request = getattr(self.factory, method)("/", HTTP_X_USER_TOKEN=token)
+        return ReplicaPinMiddleware(view)(request).content.decode()
+
+    def test_only_marked_safe_reads_use_the_replica(self):
+        self.assertEqual(self._db(replica_view), "replica1")
+        self.assertEqual(self._db(_reads_from), "default")
+        self.assertEqual(self._db(replica_view, "post"), "default")
+
+    def test_reads_after_a_write_stay_on_default(self):
+        self.assertEqual(self._db(write_then_read_view), "default")
+
+    def test_writer_is_pinned_to_default(self):
+        self._db(_reads_from, "post", token="t1")
+        self.assertEqual(self._db(replica_view, token="t1"), "default")
+        self.assertEqual(self._db(replica_view, token="t2"), "replica1")
+
+        cache.clear()  # pin expired
+        self.assertEqual(self._db(replica_view, token="t1"), "replica1")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_default(self):
+        self.assertEqual(self._db(replica_view), "default")
+
+
+class ReplicaDatabaseTests(TransactionTestCase):
+    """Real queries against a second database that never gets default's writes."""
+
+    databases = {"default", REPLICA_ALIAS}
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        # bulk_create: no signals, so nothing about it lands in default
+        Place.objects.using(REPLICA_ALIAS).bulk_create([Place(name="Replica Lake")])
+        Place.objects.bulk_create([Place(name="Primary Lake")])
+
+    def _names(self, method="get", token="t1", view=place_names_view, **data):
+        """(response body, queries on replica_test, queries on default)"""
+        request = getattr(self.factory, method)("/", data, HTTP_X_USER_TOKEN=token)
+        # only around the request: the routers also keep replicas out of
+        # the flush that empties both databases after each test
+        with self.settings(DATABASE_REPLICAS=[REPLICA_ALIAS]), \
+                CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica, \
+                CaptureQueriesContext(connections["default"]) as primary:
+            body = ReplicaPinMiddleware(view)(request).content.decode()
+        return body, len(replica), len(primary)
+
+    def test_reads_run_on_the_replica_connection(self):
+        self.assertEqual(self._names(), ("Replica Lake", 1, 0))
+
+    def test_pinned_reads_return_just_written_rows(self):
+        body, replica_queries, _ = self._names("post", name="Banani Lake")
+        self.assertEqual((body, replica_queries), ("Banani Lake,Primary Lake", 0))
+
+        # the writer reads default; the replica hasn't seen the row yet
+        self.assertEqual(self._names(token="t1"), ("Banani Lake,Primary Lake", 0, 1))
+        self.assertEqual(self._names(token="t2"), ("Replica Lake", 1, 0))
+
+    def test_cached_reference_bodies_are_built_from_default(self):
+        # the lagging replica's rows would otherwise be cached as current
+        self.assertEqual(self._names(view=cached_place_names_view), ("Primary Lake", 0, 1))
+        self.assertEqual(self._names(view=cached_place_names_view), ("Primary Lake", 0, 0))
@@ -0,0 +1,107 @@
+# tests/test_search_api.py
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from accounts.models import UserAccount, MerchantProfile
+from community.models import CommunityPost
+from search.models import SearchDocument
+from travel.models import Area, Place, Service
+
+
+class SearchApiTests(APITestCase):
+    def setUp(self):
+        self.dhanmondi = Area.objects.create(name="Dhanmondi")
+        self.gulshan = Area.objects.create(name="Gulshan")
+
+        self.lake = Place.objects.create(name="Dhanmondi Lake", area=self.dhanmondi, category="LAKE")
+        self.hospital = Service.objects.create(
+            name="Lakeside Hospital", category="HOSPITAL", area=self.gulshan, address="Road 1"
+        )
+        user = User.objects.create_user(username="merchant1", password="pass")
+        account = UserAccount.objects.create(user=user, role="MERCHANT")
+        self.merchant = MerchantProfile.objects.create(
+            user_account=account, shop_name="Lake View Cafe", business_area=self.dhanmondi
+        )
+        self.post = CommunityPost.objects.create(
+            author=account, title="Traffic near the lake", category="TRAFFIC",
+            area=self.dhanmondi, description="Road 27 is blocked",
+        )
+        self.url = reverse("search")
+
+    def _hits(self, **params):
+        resp = self.client.get(self.url, params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [(r["type"], r["id"]) for r in resp.data["results"]]
+
+    def test_signals_index_every_type_with_prefix_match(self):
+        hits = self._hits(q="lak")
+        self.assertEqual(
+            set(hits),
+            {
+                ("place", self.lake.id),
+                ("service", self.hospital.id),
+                ("merchant", self.merchant.id),
+                ("post", self.post.id),
+            },
+        )
+
+    def test_filters_and_ranking(self):
+        self.assertEqual(self._hits(q="lake", type="service"), [("service", self.hospital.id)])
+        self.assertEqual(self._hits(q="road", area_id=self.dhanmondi.id), [("post", self.post.id)])
+        # title matches outrank area / body matches
+        self.assertEqual(self._hits(q="dhanmondi lake")[0], ("place", self.lake.id))
+
+    def test_updates_and_deletes_are_reflected(self):
+        self.lake.name = "Crescent Lake"
+        self.lake.save()
+        self.assertIn(("place", self.lake.id), self._hits(q="crescent"))
+
+        self.hospital.delete()
+        self.assertNotIn("service", [kind for kind, _ in self._hits(q="lake")])
+
+    def test_only_area_renames_reindex_its_contents(self):
+        area = Area.objects.get(pk=self.dhanmondi.pk)
+        area.description = "Lakes and cafes"
+        with CaptureQueriesContext(connection) as ctx:
+            area.save()
+        self.assertFalse(any("search_searchdocument" in q["sql"] for q in ctx.captured_queries))
+
+        area.name = "Dhanmondi R/A"
+        area.save()
+        self.assertIn(("place", self.lake.id), self._hits(q="r/a dhanmondi lake"))
+        self.assertEqual(
+            SearchDocument.objects.get(kind="place", object_id=self.lake.id).area_name,
+            "Dhanmondi R/A",
+        )
+
+        # instances that weren't loaded from the database work the same way
+        self.gulshan.name = "Gulshan 1"
+        self.gulshan.save()
+        self.assertEqual(
+            SearchDocument.objects.get(kind="service", object_id=self.hospital.id).area_name,
+            "Gulshan 1",
+        )
+
+    def test_pagination(self):
+        resp = self.client.get(self.url, {"q": "lake", "limit": 2})
+        self.assertEqual(len(resp.data["results"]), 2)
+        self.assertIsNotNone(resp.data["next"])
+        rest = self.client.get(resp.data["next"])
+        self.assertEqual(len(rest.data["results"]), 2)
+        self.assertIsNone(rest.data["next"])
+
+    def test_rebuild_command(self):
+        SearchDocument.objects.all().delete()
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(len(self._hits(q="lake")), 4)
+
+    def test_q_required(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
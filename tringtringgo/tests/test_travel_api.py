@@ -0,0 +1,182 @@
+# tests/test_travel_api.py
+from datetime import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from accounts.authentication import clear_identity_cache
+from accounts.models import UserAccount
+from travel.models import Area, Place, Review, initial_bayesian_rating
+
+
+class PlaceCatalogueTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_identity_cache()
+
+        self.area = Area.objects.create(name="Dhanmondi")
+        self.user = User.objects.create_user(username="traveler1", password="pass")
+        self.account = UserAccount.objects.create(user=self.user, role="TRAVELER")
+
+        self.places = [
+            Place.objects.create(name=f"Place {i:02d}", area=self.area, category="PARK")
+            for i in range(5)
+        ]
+        for place in self.places:
+            for rating in range(1, 6):
+                Review.objects.create(
+                    traveler=self.account, place=place, rating=rating, title=f"r{rating}"
+                )
+        self.url = reverse("place-list")
+
+    def _all_pages(self, params):
+        url, rows = self.url, []
+        while url:
+            resp = self.client.get(url, params)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            rows.extend(resp.data["results"])
+            url, params = resp.data["next"], None
+        return rows
+
+    def test_cursor_pagination_walks_whole_catalogue(self):
+        rows = self._all_pages({"limit": 2})
+        self.assertEqual([r["name"] for r in rows], [p.name for p in self.places])
+
+    def test_sparse_fieldset(self):
+        resp = self.client.get(self.url, {"fields": "id,name"})
+        self.assertEqual(set(resp.data["results"][0]), {"id", "name"})
+
+    def test_latest_reviews_are_opt_in(self):
+        resp = self.client.get(self.url)
+        self.assertNotIn("latest_reviews", resp.data["results"][0])
+        self.assertEqual(resp.data["results"][0]["area_name"], "Dhanmondi")
+
+    def test_latest_reviews_constant_queries(self):
+        # page query + one window-function prefetch, regardless of page size
+        with self.assertNumQueries(2):
+            resp = self.client.get(self.url, {"include": "latest_reviews"})
+        for row in resp.data["results"]:
+            self.assertEqual(len(row["latest_reviews"]), 3)
+            self.assertEqual(
+                [r["title"] for r in row["latest_reviews"]], ["r5", "r4", "r3"]
+            )
+
+
+class PlaceFilterTests(APITestCase):
+    def setUp(self):
+        self.dhanmondi = Area.objects.create(name="Dhanmondi")
+        self.gulshan = Area.objects.create(name="Gulshan")
+        self.lake = Place.objects.create(
+            name="Dhanmondi Lake", area=self.dhanmondi, category="LAKE",
+            is_popular=True, average_rating=4.6,
+            opening_time=time(0, 0), closing_time=time(23, 59, 59),
+        )
+        self.cafe = Place.objects.create(
+            name="North End", area=self.gulshan, category="CAFE",
+            address="Road 90", average_rating=3.9,
+        )
+        self.url = reverse("place-list")
+
+    def _names(self, **params):
+        resp = self.client.get(self.url, params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [row["name"] for row in resp.data["results"]]
+
+    def test_filters(self):
+        self.assertEqual(self._names(area_id=self.gulshan.id), ["North End"])
+        self.assertEqual(self._names(category="LAKE,PARK"), ["Dhanmondi Lake"])
+        self.assertEqual(self._names(is_popular="true"), ["Dhanmondi Lake"])
+        self.assertEqual(self._names(min_rating=4.5), ["Dhanmondi Lake"])
+        self.assertEqual(self._names(open_now="true"), ["Dhanmondi Lake"])
+        self.assertEqual(self._names(q="road 90"), ["North End"])
+        self.assertEqual(self._names(q="gulshan"), ["North End"])
+
+    def test_invalid_filter(self):
+        resp = self.client.get(self.url, {"min_rating": "lots"})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RatingAggregateTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_identity_cache()
+
+        self.area = Area.objects.create(name="Dhanmondi")
+        self.place = Place.objects.create(name="Dhanmondi Lake", area=self.area, category="LAKE")
+        self.accounts = []
+        for i in range(3):
+            user = User.objects.create_user(username=f"t{i}", password="pass")
+            self.accounts.append(UserAccount.objects.create(user=user, role="TRAVELER"))
+
+    def _review(self, username, rating):
+        resp = self.client.post(
+            reverse("review-create"),
+            {"place": self.place.id, "rating": rating},
+            format="json",
+            HTTP_X_USER_TOKEN=username,
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        return resp.data["id"]
+
+    def _assert_stats(self, count, total, histogram):
+        self.place.refresh_from_db()
+        self.assertEqual(self.place.review_count, count)
+        self.assertEqual(self.place.rating_sum, total)
+        self.assertAlmostEqual(self.place.average_rating, total / count if count else 0.0)
+        self.assertAlmostEqual(self.place.bayesian_rating, Place.bayesian_score(total, count))
+        self.assertEqual(self.place.rating_histogram, histogram)
+
+    def test_create_update_delete(self):
+        first = self._review("t0", 5)
+        self._review("t1", 3)
+        self._assert_stats(2, 8, {1: 0, 2: 0, 3: 1, 4: 0, 5: 1})
+
+        resp = self.client.patch(
+            reverse("review-update", args=[first]),
+            {"rating": 2},
+            format="json",
+            HTTP_X_USER_TOKEN="t0",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self._assert_stats(2, 5, {1: 0, 2: 1, 3: 1, 4: 0, 5: 0})
+
+        resp = self.client.delete(reverse("review-delete", args=[first]), HTTP_X_USER_TOKEN="t0")
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self._assert_stats(1, 3, {1: 0, 2: 0, 3: 1, 4: 0, 5: 0})
+
+    def test_cascade_delete_is_counted(self):
+        self._review("t0", 4)
+        self._review("t1", 2)
+        self.accounts[0].delete()
+        self._assert_stats(1, 2, {1: 0, 2: 1, 3: 0, 4: 0, 5: 0})
+
+    def test_drifted_totals_never_go_negative(self):
+        first = self._review("t0", 4)
+        Place.objects.filter(pk=self.place.pk).update(review_count=0, rating_sum=0)
+
+        resp = self.client.delete(reverse("review-delete", args=[first]), HTTP_X_USER_TOKEN="t0")
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self._assert_stats(0, 0, {1: 0, 2: 0, 3: 0, 4: 0, 5: 0})
+
+    @override_settings(PLACE_RATING_PRIOR_MEAN=4.0, PLACE_RATING_PRIOR_WEIGHT=2)
+    def test_prior_settings_apply_without_a_migration(self):
+        place = Place.objects.create(name="Banani Lake", area=self.area)
+        self.assertEqual(place.bayesian_rating, 4.0)
+        # migrations record the callable, never the prior itself
+        _, _, _, kwargs = Place._meta.get_field("bayesian_rating").deconstruct()
+        self.assertIs(kwargs["default"], initial_bayesian_rating)
+
+    def test_reconcile_command_fixes_drift(self):
+        self._review("t0", 4)
+        Place.objects.filter(pk=self.place.pk).update(
+            review_count=7, rating_sum=1, average_rating=0.1, bayesian_rating=0.2
+        )
+
+        call_command("reconcile_ratings", stdout=StringIO())
+        self._assert_stats(1, 4, {1: 0, 2: 0, 3: 0, 4: 1, 5: 0})
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+
+from core import http_cache
+from travel.models import Place, Review, RATING_FIELDS
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Place rating aggregates (sum, count, average, Bayesian "
+        "score, 1-5 star histogram) from the review table and fix any that "
+        "drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted places.",
+        )
+
+    def handle(self, *args, **options):
+        actual = {
+            row["place_id"]: row
+            for row in Review.objects.values("place_id")
+            .order_by()
+            .annotate(
+                cnt=models.Count("id"),
+                total=models.Sum("rating"),
+                **{
+                    f"stars_{stars}": models.Count("id", filter=models.Q(rating=stars))
+                    for stars in range(1, 6)
+                },
+            )
+        }
+
+        drifted = []
+        for place in Place.objects.only("id", *RATING_FIELDS).iterator():
+            row = actual.get(place.id, {})
+            expected = {
+                "review_count": row.get("cnt", 0),
+                "rating_sum": row.get("total") or 0,
+                **{
+                    f"rating_{stars}_count": row.get(f"stars_{stars}", 0)
+                    for stars in range(1, 6)
+                },
+            }
+            count = expected["review_count"]
+            expected["average_rating"] = expected["rating_sum"] / count if count else 0.0
+            expected["bayesian_rating"] = Place.bayesian_score(expected["rating_sum"], count)
+
+            if any(
+                abs(getattr(place, name) - value) > 1e-9
+                for name, value in expected.items()
+            ):
+                for name, value in expected.items():
+                    setattr(place, name, value)
+                drifted.append(place)
+
+        if drifted and not options["dry_run"]:
+            with transaction.atomic():
+                Place.objects.bulk_update(drifted, RATING_FIELDS, batch_size=500)
+            # bulk_update sends no signals
+            http_cache.bump(Place)
+
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drifted)} drifted places."))
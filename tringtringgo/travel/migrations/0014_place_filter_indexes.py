@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_usersettings'),
+        ('travel', '0013_remove_place_image_url_place_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='place',
+            index=models.Index(fields=['area', 'category'], name='place_area_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='place',
+            index=models.Index(fields=['average_rating'], name='place_avg_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='place',
+            index=models.Index(fields=['is_popular'], name='place_is_popular_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:36
+
+from django.db import migrations, models
+
+
+def fill_rating_aggregates(apps, schema_editor):
+    Place = apps.get_model("travel", "Place")
+    Review = apps.get_model("travel", "Review")
+
+    rows = (
+        Review.objects.values("place_id")
+        .order_by()
+        .annotate(
+            total=models.Sum("rating"),
+            **{
+                f"stars_{stars}": models.Count("id", filter=models.Q(rating=stars))
+                for stars in range(1, 6)
+            },
+        )
+    )
+    for row in rows:
+        Place.objects.filter(pk=row["place_id"]).update(
+            rating_sum=row["total"] or 0,
+            **{f"rating_{stars}_count": row[f"stars_{stars}"] for stars in range(1, 6)},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travel', '0014_place_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_rating_aggregates, migrations.RunPython.noop),
+    ]
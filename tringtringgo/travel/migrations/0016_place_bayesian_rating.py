@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:01
+
+from django.db import migrations, models
+from django.db.models.functions import Cast
+
+# the priors as they were when this migration was written, so replaying it
+# never depends on current settings; later changes to
+# PLACE_RATING_PRIOR_* are applied by the reconcile_ratings command
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5
+
+
+def fill_bayesian_rating(apps, schema_editor):
+    Place = apps.get_model("travel", "Place")
+    mean, weight = PRIOR_MEAN, PRIOR_WEIGHT
+    Place.objects.update(
+        bayesian_rating=models.ExpressionWrapper(
+            (weight * mean + Cast("rating_sum", models.FloatField()))
+            / (weight + Cast("review_count", models.FloatField())),
+            output_field=models.FloatField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_usersettings'),
+        ('travel', '0015_place_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='place',
+            name='place_avg_rating_idx',
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='bayesian_rating',
+            field=models.FloatField(default=3.0),
+        ),
+        migrations.AddIndex(
+            model_name='place',
+            index=models.Index(fields=['-average_rating', '-review_count'], name='place_rating_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='place',
+            index=models.Index(fields=['-bayesian_rating', '-review_count'], name='place_bayesian_rank_idx'),
+        ),
+        migrations.RunPython(fill_bayesian_rating, migrations.RunPython.noop),
+    ]
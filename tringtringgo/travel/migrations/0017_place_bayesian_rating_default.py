@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:04
+
+import travel.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travel', '0016_place_bayesian_rating'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='place',
+            name='bayesian_rating',
+            field=models.FloatField(default=travel.models.initial_bayesian_rating),
+        ),
+    ]
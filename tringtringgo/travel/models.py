@@ -1,7 +1,27 @@
+from django.conf import settings
 from django.db import models
+from django.db.models.functions import Cast, Greatest
 from accounts.models import MerchantProfile
 
 
+def initial_bayesian_rating():
+    """Place.bayesian_rating of a place without reviews: the prior mean."""
+    return Place.bayesian_score(0, 0)
+
+
+RATING_FIELDS = [
+    "average_rating",
+    "bayesian_rating",
+    "review_count",
+    "rating_sum",
+    "rating_1_count",
+    "rating_2_count",
+    "rating_3_count",
+    "rating_4_count",
+    "rating_5_count",
+]
+
+
 class Area(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
@@ -65,6 +85,17 @@ class Place(models.Model):
     average_rating = models.FloatField(default=0.0)
     review_count = models.PositiveIntegerField(default=0)
 
+    # running totals kept by apply_rating_change(); average = sum / count
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    # ranking score, see bayesian_score(); kept with the counters above
+    # a callable, so the prior stays in settings and out of the migrations
+    bayesian_rating = models.FloatField(default=initial_bayesian_rating)
+
     owner = models.ForeignKey(
         MerchantProfile,
         on_delete=models.SET_NULL,
@@ -73,18 +104,82 @@ class Place(models.Model):
         related_name="places",
     )
 
+    class Meta:
+        indexes = [
+            # places/ filters (see travel.views.filter_places)
+            models.Index(fields=["area", "category"], name="place_area_category_idx"),
+            # also serves min_rating; rankings read the stored columns
+            models.Index(
+                fields=["-average_rating", "-review_count"], name="place_rating_rank_idx"
+            ),
+            models.Index(
+                fields=["-bayesian_rating", "-review_count"], name="place_bayesian_rank_idx"
+            ),
+            models.Index(fields=["is_popular"], name="place_is_popular_idx"),
+        ]
+
     def __str__(self):
         area_name = self.area.name if self.area else "No area"
         return f"{self.name} ({area_name})"
 
-    def recompute_rating(self):
-        agg = self.reviews.aggregate(
-            avg=models.Avg("rating"),
-            cnt=models.Count("id"),
+    @property
+    def rating_histogram(self):
+        return {
+            stars: getattr(self, f"rating_{stars}_count") for stars in range(1, 6)
+        }
+
+    @staticmethod
+    def bayesian_score(rating_sum, review_count):
+        """
+        Mean rating shrunk towards the prior; works on numbers or F()s.
+        Every place counts as if it also had PLACE_RATING_PRIOR_WEIGHT
+        reviews of PLACE_RATING_PRIOR_MEAN stars, so one 5-star review
+        can't top the list.
+        """
+        mean = getattr(settings, "PLACE_RATING_PRIOR_MEAN", 3.0)
+        weight = getattr(settings, "PLACE_RATING_PRIOR_WEIGHT", 5)
+        return (weight * mean + rating_sum) / (weight + review_count)
+
+    @classmethod
+    def apply_rating_change(cls, place_id, added=None, removed=None):
+        """
+        O(1) rating update for one review write: ``added`` / ``removed``
+        are the star values entering / leaving the place (an edit passes
+        both). Done as a single UPDATE with F() expressions, so call it in
+        the same transaction as the review write.
+        """
+        delta_sum = (added or 0) - (removed or 0)
+        delta_count = (added is not None) - (removed is not None)
+
+        updates = {}
+        if added is not None:
+            updates[f"rating_{added}_count"] = models.F(f"rating_{added}_count") + 1
+        if removed is not None:
+            field = f"rating_{removed}_count"
+            # never below zero, even if the histogram had drifted
+            updates[field] = Greatest(updates.get(field, models.F(field)) - 1, 0)
+
+        # clamped like the histogram, so a drifted row can't go negative
+        new_sum = Greatest(models.F("rating_sum") + delta_sum, 0)
+        new_count = Greatest(models.F("review_count") + delta_count, 0)
+        updates["rating_sum"] = new_sum
+        updates["review_count"] = new_count
+        # SET expressions all see the pre-update row, so use new_* here
+        updates["average_rating"] = models.Case(
+            models.When(review_count__lte=-delta_count, then=models.Value(0.0)),
+            default=models.ExpressionWrapper(
+                Cast(new_sum, models.FloatField()) / new_count,
+                output_field=models.FloatField(),
+            ),
+            output_field=models.FloatField(),
+        )
+        updates["bayesian_rating"] = models.ExpressionWrapper(
+            cls.bayesian_score(
+                Cast(new_sum, models.FloatField()), Cast(new_count, models.FloatField())
+            ),
+            output_field=models.FloatField(),
         )
-        self.average_rating = agg["avg"] or 0.0
-        self.review_count = agg["cnt"] or 0
-        self.save(update_fields=["average_rating", "review_count"])
+        cls.objects.filter(pk=place_id).update(**updates)
 
 
 class SavedPlace(models.Model):
@@ -130,6 +225,13 @@ class Review(models.Model):
     class Meta:
         ordering = ["-created_at"]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # what Place aggregates currently count for this review
+        instance._counted_rating = instance.__dict__.get("rating")
+        return instance
+
     def __str__(self):
         return f"{self.traveler.user.username} → {self.place.name} ({self.rating})"
 
@@ -0,0 +1,14 @@
+# travel/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class PlaceCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the place catalogue: ?cursor=<opaque>&limit=N.
+    Ordered by name with id as a tie-breaker so pages are stable.
+    """
+
+    ordering = ("name", "id")
+    page_size = 24
+    page_size_query_param = "limit"
+    max_page_size = 100
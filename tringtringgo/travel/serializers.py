@@ -1,9 +1,25 @@
 # travel/serializers.py
 from rest_framework import serializers
 from accounts.models import MerchantProfile
+from core.serializers import FlatSerializerMixin
 from .models import Place, SavedPlace, Review, Service
 
 
+class SparseFieldsMixin:
+    """
+    Let callers trim a serializer down to a subset of its fields:
+    ``PlaceSerializer(qs, many=True, fields=["id", "name"])``.
+    Unknown names are ignored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
 class ReviewSummarySerializer(serializers.ModelSerializer):
     traveler_username = serializers.CharField(
         source="traveler.user.username", read_only=True
@@ -14,7 +30,7 @@ class ReviewSummarySerializer(serializers.ModelSerializer):
         fields = ["id", "traveler_username", "rating", "title", "text", "created_at"]
 
 
-class PlaceSerializer(serializers.ModelSerializer):
+class PlaceSerializer(FlatSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     area_name = serializers.CharField(source="area.name", read_only=True)
     review_count = serializers.IntegerField(read_only=True)
     latest_reviews = serializers.SerializerMethodField()
@@ -39,7 +55,10 @@ class PlaceSerializer(serializers.ModelSerializer):
         ]
 
     def get_latest_reviews(self, obj):
-        qs = obj.reviews.order_by("-created_at")[:3]
+        # list_places prefetches these in one query (see latest_reviews_prefetch)
+        qs = getattr(obj, "latest_review_list", None)
+        if qs is None:
+            qs = obj.reviews.select_related("traveler__user").order_by("-created_at")[:3]
         return ReviewSummarySerializer(qs, many=True).data
 
 
@@ -51,7 +70,7 @@ class SavedPlaceSerializer(serializers.ModelSerializer):
         fields = ["id", "place", "saved_at"]
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(FlatSerializerMixin, serializers.ModelSerializer):
     place_name = serializers.CharField(source="place.name", read_only=True)
     place_area = serializers.CharField(source="place.area.name", read_only=True)
     traveler_username = serializers.CharField(
@@ -74,7 +93,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ["created_at"]
 
 
-class MerchantProfileSerializer(serializers.ModelSerializer):
+class MerchantProfileSerializer(FlatSerializerMixin, serializers.ModelSerializer):
     area_name = serializers.CharField(source="business_area.name", read_only=True)
     owner_username = serializers.CharField(
         source="user_account.user.username", read_only=True
@@ -95,7 +114,7 @@ class MerchantProfileSerializer(serializers.ModelSerializer):
         ]
 
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(FlatSerializerMixin, serializers.ModelSerializer):
     area_name = serializers.CharField(source="area.name", read_only=True)
     category_label = serializers.CharField(
         source="get_category_display", read_only=True
@@ -0,0 +1,31 @@
+# travel/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Place, Review
+
+
+# ---------- incremental Place rating aggregates ----------
+
+
+@receiver(post_save, sender=Review)
+def count_review_rating(sender, instance, created, **kwargs):
+    rating = int(instance.rating)
+    if created:
+        previous = None
+    else:
+        previous = getattr(instance, "_counted_rating", None)
+        # unchanged, or not loaded from the DB (reconcile_ratings fixes that)
+        if previous is None or int(previous) == rating:
+            return
+        previous = int(previous)
+    Place.apply_rating_change(instance.place_id, added=rating, removed=previous)
+    instance._counted_rating = rating
+
+
+@receiver(post_delete, sender=Review)
+def uncount_review_rating(sender, instance, **kwargs):
+    rating = getattr(instance, "_counted_rating", None)
+    if rating is None:
+        rating = instance.rating
+    Place.apply_rating_change(instance.place_id, removed=int(rating))
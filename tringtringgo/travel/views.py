@@ -1,5 +1,9 @@
 # travel/api/views.py
-from django.contrib.auth.models import User
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Prefetch, Q, Window, prefetch_related_objects
+from django.db.models.functions import RowNumber
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 
 from rest_framework import status
@@ -12,9 +16,12 @@ from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 
-from accounts.models import UserAccount, MerchantProfile
-from accounts.views import get_or_create_traveler_profile
+from accounts.authentication import identity_from_request
+from accounts.models import MerchantProfile
+from core.http_cache import reference_data
+from core.replicas import read_from_replica
 from travel.models import Place, SavedPlace, Review, Area, Service
+from travel.pagination import PlaceCursorPagination
 from travel.serializers import (
     SavedPlaceSerializer,
     PlaceSerializer,
@@ -23,31 +30,22 @@ from travel.serializers import (
     ServiceSerializer,
 )
 
+User = get_user_model()
+
 
 def _get_traveler_from_token(request):
-    token = request.headers.get("X-User-Token")
-    if not token:
-        return None, Response(
-            {"detail": "Not logged in."},
-            status=status.HTTP_401_UNAUTHORIZED,
-        )
+    identity, error = identity_from_request(request)
+    if error:
+        return None, error
 
-    try:
-        user = User.objects.get(username=token)
-    except User.DoesNotExist:
+    # read-only: accounts/profiles are provisioned at signup/login
+    # (or by `manage.py provision_accounts`), never on the request path
+    if identity.account is None:
         return None, Response(
-            {"detail": "Invalid user token."},
+            {"detail": "User account not found."},
             status=status.HTTP_401_UNAUTHORIZED,
         )
-
-    account, _ = UserAccount.objects.get_or_create(
-        user=user,
-        defaults={"role": "TRAVELER"},
-    )
-
-    # ensure traveler profile exists (even if user is merchant/admin)
-    get_or_create_traveler_profile(account)
-    return account, None
+    return identity.account, None
 
 
 # ---------- Saved places ----------
@@ -63,7 +61,8 @@ def list_saved_places(request):
 
     saved_qs = (
         SavedPlace.objects.filter(traveler=traveler)
-        .select_related("place")
+        .select_related("place__area")
+        .prefetch_related(latest_reviews_prefetch("place__reviews"))
         .order_by("-saved_at")
     )
     serializer = SavedPlaceSerializer(saved_qs, many=True)
@@ -137,11 +136,11 @@ def my_reviews(request):
     if error:
         return error
 
-    qs = Review.objects.filter(traveler=traveler).select_related("place")
-    serializer = ReviewSerializer(qs, many=True)
-    return Response(serializer.data)
+    qs = Review.objects.filter(traveler=traveler)
+    return Response(ReviewSerializer.flat().data(qs))
 
 
+@read_from_replica
 @csrf_exempt
 @api_view(["GET"])
 @permission_classes([AllowAny])
@@ -150,11 +149,8 @@ def place_reviews(request, pk):
     List all reviews for a given place (used by ExplorePage Reviews modal).
     Public read: no auth required.
     """
-    qs = Review.objects.filter(place_id=pk).select_related(
-        "traveler", "place"
-    ).order_by("-created_at")
-    serializer = ReviewSerializer(qs, many=True)
-    return Response(serializer.data)
+    qs = Review.objects.filter(place_id=pk).order_by("-created_at")
+    return Response(ReviewSerializer.flat().data(qs))
 
 
 @csrf_exempt
@@ -187,16 +183,15 @@ def create_review(request):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    review = Review.objects.create(
-        traveler=traveler,
-        place=place,
-        rating=serializer.validated_data["rating"],
-        title=serializer.validated_data.get("title", ""),
-        text=serializer.validated_data.get("text", ""),
-    )
-
-    # update rating stats
-    place.recompute_rating()
+    # rating stats are updated by travel.signals in the same transaction
+    with transaction.atomic():
+        review = Review.objects.create(
+            traveler=traveler,
+            place=place,
+            rating=serializer.validated_data["rating"],
+            title=serializer.validated_data.get("title", ""),
+            text=serializer.validated_data.get("text", ""),
+        )
 
     out = ReviewSerializer(review)
     return Response(out.data, status=status.HTTP_201_CREATED)
@@ -210,17 +205,16 @@ def delete_review(request, pk):
     if error:
         return error
 
-    try:
-        review = Review.objects.get(id=pk, traveler=traveler)
-    except Review.DoesNotExist:
-        return Response(
-            {"detail": "Review not found."},
-            status=status.HTTP_404_NOT_FOUND,
-        )
+    with transaction.atomic():
+        try:
+            review = Review.objects.select_for_update().get(id=pk, traveler=traveler)
+        except Review.DoesNotExist:
+            return Response(
+                {"detail": "Review not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
 
-    place = review.place
-    review.delete()
-    place.recompute_rating()
+        review.delete()
 
     return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -259,12 +253,13 @@ def update_review(request, pk):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    review.rating = rating
-    review.title = title
-    review.text = text
-    review.save()
-
-    review.place.recompute_rating()
+    with transaction.atomic():
+        # re-read under lock so the rating delta is taken from the stored row
+        review = Review.objects.select_for_update().get(id=review.id)
+        review.rating = int(rating)
+        review.title = title
+        review.text = text
+        review.save()
 
     serializer = ReviewSerializer(review)
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -273,14 +268,174 @@ def update_review(request, pk):
 # ---------- Places / Areas ----------
 
 
+# latest_reviews is opt-in (?include=latest_reviews); everything else is default
+PLACE_LIST_FIELDS = [
+    "id",
+    "name",
+    "area_name",
+    "category",
+    "image",
+    "address",
+    "average_rating",
+    "review_count",
+    "is_popular",
+    "opening_time",
+    "closing_time",
+]
+
+
+def latest_reviews_prefetch(lookup="reviews", limit=3):
+    """
+    Prefetch the newest ``limit`` reviews of every place in ONE query,
+    using ROW_NUMBER() OVER (PARTITION BY place ORDER BY created_at DESC).
+    Results land on ``place.latest_review_list``.
+    """
+    reviews = (
+        Review.objects.annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=F("place_id"),
+                order_by=F("created_at").desc(),
+            )
+        )
+        .filter(row_number__lte=limit)
+        .select_related("traveler__user")
+        .order_by("place_id", "-created_at")
+    )
+    return Prefetch(lookup, queryset=reviews, to_attr="latest_review_list")
+
+
+def _csv_param(request, name):
+    raw = request.GET.get(name, "")
+    return [part.strip() for part in raw.split(",") if part.strip()]
+
+
+def _bool_param(value):
+    value = value.strip().lower()
+    if value in ("1", "true", "yes"):
+        return True
+    if value in ("0", "false", "no"):
+        return False
+    raise ValueError(value)
+
+
+def filter_places(qs, params):
+    """
+    Apply the places/ query filters. Returns (queryset, error_response).
+
+    area_id, category (comma-separated), is_popular, min_rating,
+    open_now and a free-text q over name / address / area name.
+    """
+    area_id = params.get("area_id")
+    if area_id:
+        try:
+            qs = qs.filter(area_id=int(area_id))
+        except ValueError:
+            return None, Response(
+                {"detail": "Invalid area_id."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    categories = [c.strip() for c in params.get("category", "").split(",") if c.strip()]
+    if categories:
+        valid = {code for code, _ in Place.CATEGORY_CHOICES}
+        if not set(categories) <= valid:
+            return None, Response(
+                {"detail": "Invalid category."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        qs = qs.filter(category__in=categories)
+
+    is_popular = params.get("is_popular")
+    if is_popular:
+        try:
+            qs = qs.filter(is_popular=_bool_param(is_popular))
+        except ValueError:
+            return None, Response(
+                {"detail": "is_popular must be true or false."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    min_rating = params.get("min_rating")
+    if min_rating:
+        try:
+            qs = qs.filter(average_rating__gte=float(min_rating))
+        except ValueError:
+            return None, Response(
+                {"detail": "min_rating must be a number."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    open_now = params.get("open_now")
+    if open_now:
+        try:
+            wanted = _bool_param(open_now)
+        except ValueError:
+            return None, Response(
+                {"detail": "open_now must be true or false."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if wanted:
+            now = timezone.localtime().time()
+            same_day = Q(opening_time__lte=F("closing_time")) & Q(
+                opening_time__lte=now,
+                closing_time__gte=now,
+            )
+            # e.g. 18:00 - 02:00
+            overnight = Q(opening_time__gt=F("closing_time")) & (
+                Q(opening_time__lte=now) | Q(closing_time__gte=now)
+            )
+            qs = qs.filter(same_day | overnight)
+
+    q = params.get("q", "").strip()
+    if q:
+        qs = qs.filter(
+            Q(name__icontains=q) | Q(address__icontains=q) | Q(area__name__icontains=q)
+        )
+
+    return qs, None
+
+
+@reference_data(Place, Area, Review, User)
+@read_from_replica
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def list_places(request):
-    qs = Place.objects.all().order_by("name")
-    serializer = PlaceSerializer(qs, many=True)
-    return Response(serializer.data)
+    """
+    Cursor-paginated place catalogue.
+
+    ?limit=N&cursor=...       page size (max 100) / next page
+    ?fields=id,name,...       only return these fields
+    ?include=latest_reviews   add the three newest reviews per place
+    plus the filters documented on filter_places().
+    """
+    fields = _csv_param(request, "fields") or list(PLACE_LIST_FIELDS)
+    with_reviews = "latest_reviews" in _csv_param(request, "include")
+    if with_reviews and "latest_reviews" not in fields:
+        fields.append("latest_reviews")
+    elif not with_reviews and "latest_reviews" in fields:
+        fields.remove("latest_reviews")
+
+    qs, error = filter_places(Place.objects.select_related("area"), request.GET)
+    if error:
+        return error
+
+    paginator = PlaceCursorPagination()
+    if with_reviews:
+        page = paginator.paginate_queryset(qs, request)
+        prefetch_related_objects(page, latest_reviews_prefetch())
+        serializer = PlaceSerializer(page, many=True, fields=fields)
+        return paginator.get_paginated_response(serializer.data)
+
+    # flat rows (core/serializers.py), plus the cursor's ordering columns
+    flat = PlaceSerializer.flat(fields=fields)
+    rows = flat.values(qs, *(name.lstrip("-") for name in paginator.ordering))
+    page = paginator.paginate_queryset(rows, request)
+    return paginator.get_paginated_response(flat.to_representation(page))
 
 
+@reference_data(Area)
+@read_from_replica
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def list_areas(request):
@@ -341,22 +496,21 @@ def upload_place_image(request, pk):
 #----------- Service by area --------------
 
 
+@reference_data(Service, Area)
+@read_from_replica
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def list_services(request):
     """
     Return services, optionally filtered by ?area_id=.
     """
-    qs = Service.objects.select_related("area").order_by(
-        "area__name", "category", "name"
-    )
+    qs = Service.objects.order_by("area__name", "category", "name")
 
     area_id = request.GET.get("area_id")
     if area_id:
         qs = qs.filter(area_id=area_id)
 
-    serializer = ServiceSerializer(qs, many=True)
-    return Response(serializer.data)
+    return Response(ServiceSerializer.flat().data(qs))
 
 
 @api_view(["POST"])
@@ -424,6 +578,8 @@ def modify_service(request, pk):
 # ---------- Explore merchants by area ----------
 
 
+@reference_data(MerchantProfile, Area, User)
+@read_from_replica
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def explore_merchants(request):
@@ -432,12 +588,9 @@ def explore_merchants(request):
     Optional query param: ?area_id=ID to filter by Area.
     """
     area_id = request.GET.get("area_id")
-    qs = MerchantProfile.objects.select_related(
-        "business_area", "user_account__user"
-    )
+    qs = MerchantProfile.objects.all()
 
     if area_id:
         qs = qs.filter(business_area_id=area_id)
 
-    serializer = MerchantProfileSerializer(qs, many=True)
-    return Response(serializer.data)
+    return Response(MerchantProfileSerializer.flat().data(qs))
@@ -2,6 +2,8 @@
 ASGI config for tringtringgo project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django as before; WebSocket connections are routed to the
+chat consumers (chat/routing.py).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +15,18 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tringtringgo.settings')
 
-application = get_asgi_application()
+# initialise Django (apps, settings) before importing consumers
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+
+from chat.routing import websocket_urlpatterns  # noqa: E402
+
+# no origin check: like the HTTP API (CORS_ALLOW_ALL_ORIGINS) sockets are
+# authorised by token and thread membership in ChatThreadConsumer
+application = ProtocolTypeRouter(
+    {
+        "http": django_asgi_app,
+        "websocket": URLRouter(websocket_urlpatterns),
+    }
+)
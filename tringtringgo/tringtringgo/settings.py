@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -7,6 +8,7 @@ DEBUG = True
 ALLOWED_HOSTS = []
 
 INSTALLED_APPS = [
+    "daphne",  # ASGI runserver, so chat WebSockets work in development
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -16,6 +18,7 @@ INSTALLED_APPS = [
 
     "rest_framework",
     "corsheaders",
+    "channels",
 
     "core.apps.CoreConfig",
     "accounts",
@@ -23,12 +26,14 @@ INSTALLED_APPS = [
     "community",
     "chat",
     "chatbot",
+    "search",
 ]
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "core.middleware.ReplicaPinMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -54,12 +59,126 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "tringtringgo.wsgi.application"
+ASGI_APPLICATION = "tringtringgo.asgi.application"
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# chat WebSocket push (chat/realtime.py). In-memory works for a single
+# process and tests; set CHANNEL_REDIS_URL to fan out across workers.
+if os.environ.get("CHANNEL_REDIS_URL"):
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [os.environ["CHANNEL_REDIS_URL"]]},
+        }
     }
+else:
+    CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"},
+    }
+
+# Shared cache: identity lookups, reference-data versions and bodies,
+# chatbot data versions and replica pins all live here, so every worker
+# must see the same one. CACHE_REDIS_URL selects Redis (pip install redis),
+# else MEMCACHED_LOCATION (comma-separated host:port, pip install pymemcache)
+# Memcached. Without either each process has its own in-memory cache,
+# which is only correct for tests and a single runserver process;
+# `manage.py check --deploy` reports it (core/checks.py).
+if os.environ.get("CACHE_REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["CACHE_REDIS_URL"],
+        }
+    }
+elif os.environ.get("MEMCACHED_LOCATION"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": [
+                host.strip()
+                for host in os.environ["MEMCACHED_LOCATION"].split(",")
+                if host.strip()
+            ],
+        }
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+
+# DATABASE_ENGINE=postgres selects PostgreSQL (POSTGRES_* variables);
+# otherwise the local SQLite file, tuned on connect by core/db.py.
+DATABASE_ENGINE = os.environ.get("DATABASE_ENGINE", "sqlite")
+
+if DATABASE_ENGINE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("POSTGRES_DB", "tringtringgo"),
+            "USER": os.environ.get("POSTGRES_USER", "tringtringgo"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+            "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+            "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+            # persistent connections, checked before reuse
+            "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+    if os.environ.get("DB_POOL"):
+        # psycopg 3 pool per process (pip install "psycopg[pool]"); Django
+        # refuses pooling together with persistent connections
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"] = {
+            "pool": {
+                "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+                "timeout": int(os.environ.get("DB_POOL_TIMEOUT", "10")),
+            },
+        }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                # seconds a writer waits for the lock before "database is locked"
+                "timeout": 20,
+                # take the write lock when a transaction starts, so two
+                # transactions can't both read and then deadlock upgrading
+                "transaction_mode": "IMMEDIATE",
+            },
+        }
+    }
+
+# Read replicas, used by views marked @read_from_replica (core/replicas.py).
+# SQLITE_REPLICA_PATH adds a second SQLite file (a copy of db.sqlite3) for
+# trying this locally; POSTGRES_REPLICA_HOSTS is a comma-separated list.
+# Tests mirror every replica onto default.
+DATABASE_REPLICAS = []
+if DATABASE_ENGINE == "postgres":
+    _replica_hosts = os.environ.get("POSTGRES_REPLICA_HOSTS", "")
+    _replicas = [{"HOST": host.strip()} for host in _replica_hosts.split(",") if host.strip()]
+elif os.environ.get("SQLITE_REPLICA_PATH"):
+    _replicas = [{"NAME": os.environ["SQLITE_REPLICA_PATH"]}]
+else:
+    _replicas = []
+for _index, _override in enumerate(_replicas, start=1):
+    _alias = f"replica{_index}"
+    DATABASES[_alias] = {**DATABASES["default"], **_override, "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS = ["core.replicas.ReplicaRouter"]
+# seconds a client reads from default after its own write
+REPLICA_PIN_SECONDS = 5
+
+# PRAGMAs run on every new SQLite connection (core/db.py), in this order.
+# WAL lets readers carry on while one writer commits; NORMAL syncs at
+# checkpoints only, which is safe in WAL mode.
+SQLITE_PRAGMAS = {
+    "busy_timeout": 20000,        # ms
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 128 * 1024 * 1024,
+    "temp_store": "MEMORY",
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -101,9 +220,57 @@ CORS_ALLOW_HEADERS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "accounts.authentication.UserTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    # orjson when installed, DRF's encoder otherwise (core/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
+
+# X-User-Token identity cache (see accounts/authentication.py). Invalidation
+# reaches other workers through the shared cache (CACHES above) only, so
+# the per-process copy is kept just long enough to absorb request bursts.
+AUTH_IDENTITY_LOCAL_CACHE_SIZE = 1024  # entries per process
+AUTH_IDENTITY_LOCAL_CACHE_TTL = 2      # seconds
+AUTH_IDENTITY_CACHE_TTL = 300          # seconds, shared cache
+
+# Cache-Control for reference data views (see core/http_cache.py): browsers
+# revalidate every time (cheap 304s), shared caches/CDNs keep it this long
+REFERENCE_DATA_MAX_AGE = 0           # seconds
+REFERENCE_DATA_SHARED_MAX_AGE = 60   # seconds
+# rendered bodies kept server-side; a data change makes them unreachable
+# long before this
+REFERENCE_DATA_CACHE_TTL = 600       # seconds
+
+# community/posts/ cursor pages (see community/pagination.py)
+COMMUNITY_FEED_PAGE_SIZE = 20
+COMMUNITY_FEED_MAX_PAGE_SIZE = 50
+
+# chatbot "near <area>" aliases, alias -> Area.name (see chatbot/gazetteer.py),
+# e.g. {"old dhaka": "Puran Dhaka"}
+CHATBOT_AREA_ALIASES = {}
+
+# per-process LRU of rendered chatbot replies (see chatbot/reply_cache.py)
+CHATBOT_REPLY_CACHE_SIZE = 256
+# items kept per reply, and ?format=json page sizes (see chatbot/views.py)
+CHATBOT_MAX_RESULTS = 100
+CHATBOT_PAGE_SIZE = 10
+CHATBOT_MAX_PAGE_SIZE = 50
+
+# purge_chatbot_history keeps this much chatbot history
+CHATBOT_HISTORY_RETENTION_DAYS = 30
+# queued history is written once this many messages are waiting, or this
+# many seconds after the last write (chatbot/history.py)
+CHATBOT_HISTORY_BATCH_SIZE = 50
+CHATBOT_HISTORY_FLUSH_SECONDS = 5
+
+# Place.bayesian_rating prior (see travel/models.py); changing these
+# needs a reconcile_ratings run
+PLACE_RATING_PRIOR_MEAN = 3.0
+PLACE_RATING_PRIOR_WEIGHT = 5
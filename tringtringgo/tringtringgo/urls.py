@@ -11,6 +11,7 @@ urlpatterns = [
     path("api/community/", include("community.urls")),
     path("api/chat/", include("chat.urls")),
     path("api/chatbot/", include("chatbot.urls")),
+    path("api/search/", include("search.urls")),
 ]
 
 if settings.DEBUG: